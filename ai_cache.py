@@ -0,0 +1,75 @@
+# Persistent cache of AI triage verdicts.
+#
+# Verdicts are keyed by a hash of the normalized excerpt sent to the model, the
+# context type and the model name, so identical bodies (shared templates, debug
+# pages, vendored bundles) are only ever triaged once - within a scan and
+# across scans. Entries expire after a TTL and the least recently used entries
+# are evicted once the cache grows past its size limit.
+import hashlib
+import sqlite3
+import time
+from typing import Optional
+
+
+def normalize_excerpt(content: str, excerpt_chars: int = 1500) -> str:
+    # Same excerpt the model sees, with whitespace differences ignored
+    return " ".join(content[:excerpt_chars].split())
+
+
+class VerdictCache:
+    def __init__(self, path: str, ttl_seconds: float = 30 * 24 * 3600, max_entries: int = 10000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path)
+        # WAL + NORMAL keeps lookups and LRU touches cheap (no fsync per statement)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY, verdict TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS verdicts_last_used ON verdicts (last_used)")
+        self.db.execute("DELETE FROM verdicts WHERE created < ?", (time.time() - self.ttl_seconds,))
+        self.db.commit()
+
+    @staticmethod
+    def make_key(content: str, context_type: str, model: str) -> str:
+        digest = hashlib.sha256()
+        for part in (model, context_type, normalize_excerpt(content)):
+            digest.update(part.encode("utf-8", errors="ignore"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        row = self.db.execute("SELECT verdict, created FROM verdicts WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < now - self.ttl_seconds:
+            if row is not None:
+                self.db.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                self.db.commit()
+            self.misses += 1
+            return None
+        self.db.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (now, key))
+        self.db.commit()
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, verdict: str):
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO verdicts (key, verdict, created, last_used) VALUES (?, ?, ?, ?)",
+            (key, verdict, now, now),
+        )
+        # Size-bounded LRU: drop everything past the newest max_entries
+        self.db.execute(
+            "DELETE FROM verdicts WHERE key IN ("
+            " SELECT key FROM verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,102 @@
+# Asynchronous AI triage for medium-risk findings.
+#
+# Findings are pushed onto a bounded queue and drained by a small pool of worker
+# tasks, so scanning carries on while the (slow) completions calls catch up.
+# Workers share request-per-minute and token-per-minute budgets.
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Token bucket with a per-minute budget, refilled continuously"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(1.0, float(per_minute))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self, amount: float = 1.0):
+        # Requests larger than the whole budget would never fit; let them through at full capacity
+        amount = min(float(amount), self.capacity)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+def estimate_tokens(text: str, max_output_tokens: int = 0) -> int:
+    # Rough rule of thumb: ~4 characters per token for English/code
+    return len(text) // 4 + 1 + max_output_tokens
+
+
+class TriagePipeline:
+    """Bounded queue of findings drained by async triage workers.
+
+    `analyze` is a coroutine function `(url, content, context_type) -> str`; its
+    result is written into the finding's "notes".
+    """
+
+    def __init__(self, analyze, workers: int = 2, queue_size: int = 100,
+                 requests_per_minute: float = 60, tokens_per_minute: float = 40000,
+                 max_output_tokens: int = 250, excerpt_chars: int = 1500):
+        self.analyze = analyze
+        self.worker_count = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.request_limiter = RateLimiter(requests_per_minute)
+        self.token_limiter = RateLimiter(tokens_per_minute)
+        self.max_output_tokens = max_output_tokens
+        self.excerpt_chars = excerpt_chars
+        self.queue = None
+        self.workers = []
+        self.completed = 0
+
+    def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def submit(self, finding: dict, url: str, content: str, context_type: str = "general") -> asyncio.Future:
+        """Queue a finding for triage; waits while the queue is full. The future resolves with the verdict."""
+        done = asyncio.get_running_loop().create_future()
+        # Only the excerpt that is sent to the model is kept, not the whole body
+        await self.queue.put((finding, url, content[:self.excerpt_chars], context_type, done))
+        return done
+
+    async def _worker(self):
+        while True:
+            finding, url, excerpt, context_type, done = await self.queue.get()
+            try:
+                await self.request_limiter.acquire(1)
+                await self.token_limiter.acquire(estimate_tokens(excerpt, self.max_output_tokens))
+                try:
+                    verdict = await self.analyze(url, excerpt, context_type)
+                except Exception as e:
+                    verdict = f"AI analysis failed: {e}"
+                finding["notes"] = verdict
+                self.completed += 1
+                if not done.done():
+                    done.set_result(verdict)
+            except asyncio.CancelledError:
+                if not done.done():
+                    done.cancel()
+                raise
+            finally:
+                self.queue.task_done()
+
+    async def close(self):
+        """Wait for queued findings to be triaged, then stop the workers"""
+        if self.queue is None:
+            return
+        await self.queue.join()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
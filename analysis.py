@@ -0,0 +1,132 @@
+# CPU-bound response analysis, run off the event loop.
+#
+# Keyword scoring already happens chunk by chunk while a body streams in (and
+# can end the read early), but the soft-404 check tokenizes the page, builds
+# a MinHash sketch of its text and compares it with the target's baseline:
+# pure-Python work that used to stall every other socket while it ran. The
+# check lives here as plain top-level functions, so it can be handed to a
+# worker pool:
+#
+#   process  a ProcessPoolExecutor; analysis runs on every core
+#   thread   a ThreadPoolExecutor; keeps the loop responsive, one core (GIL)
+#   inline   on the loop, as before
+#
+# auto picks threads on multi-core machines: the pages a scan checks are
+# small enough that pickling them to another process and back costs more
+# than the parallelism saves. The process pool is there for targets that
+# serve very large pages.
+#
+# A semaphore bounds how many bodies are submitted or waiting at once. A
+# probe that cannot get a slot holds its scheduler worker, so fetching slows
+# down to the pace of analysis instead of buffering bodies without limit.
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from fingerprint import fingerprint, similarity, SOFT_404_MIN_SIMILARITY
+from html_extract import visible_text
+
+SOFT_404_MARKERS = [
+    "404", "not found", "page not found", "doesn't exist", "does not exist",
+    "can't find", "cannot find", "oops", "we're sorry", "return to home"
+]
+
+# Soft-404 checks need the start of the page, so a keyword hit only ends the read after this many chars
+SOFT_404_MIN_CHARS = 64 * 1024
+
+# Only the start of the page text is compared against the baseline
+SOFT_404_WINDOW_CHARS = 4000
+
+# Handing a body to a worker costs more than analyzing one this small
+INLINE_MAX_CHARS = 4 * 1024
+
+POOL_MODES = ("auto", "process", "thread", "inline")
+
+
+def _normalize_html_text(content: str) -> str:
+    try:
+        # Visible text without building a DOM; only the start of the page matters (see SOFT_404_MIN_CHARS)
+        text = visible_text(content, SOFT_404_MIN_CHARS)
+    except Exception:
+        text = content
+    # normalize whitespace and lowercase
+    return " ".join(text.split()).lower()
+
+
+def soft_404_fingerprint(text: str) -> tuple:
+    """Fingerprint of already-normalized page text, as compared by looks_like_soft_404()"""
+    return fingerprint(text[:SOFT_404_WINDOW_CHARS])
+
+
+def page_fingerprint(content: str) -> tuple:
+    """Fingerprint of an HTML page, for use as the soft-404 baseline"""
+    return soft_404_fingerprint(_normalize_html_text(content))
+
+
+def looks_like_soft_404(status: int, content: str, baseline_fingerprint: tuple = None) -> bool:
+    if status != 200 or not content:
+        return False
+    text = _normalize_html_text(content)
+    # keyword markers
+    if any(marker in text for marker in SOFT_404_MARKERS):
+        return True
+    # similarity to baseline soft-404
+    if baseline_fingerprint:
+        if similarity(soft_404_fingerprint(text), baseline_fingerprint) >= SOFT_404_MIN_SIMILARITY:
+            return True
+    return False
+
+
+def _process_context():
+    # Workers start from a clean forkserver process rather than a fork of the (threaded) scanner,
+    # and only this module is preloaded, not the CLI script; spawn where forkserver is missing
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class AnalysisPool:
+    def __init__(self, mode: str = "auto", workers: int = 0, max_pending: int = 0):
+        """`workers` 0 = one per core; `max_pending` 0 = two bodies per worker"""
+        cores = os.cpu_count() or 1
+        if mode == "auto":
+            mode = "thread" if cores > 1 else "inline"
+        self.mode = mode
+        self.workers = workers or cores
+        self.max_pending = max_pending or 2 * self.workers
+        self.executor = None
+        if mode == "process":
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=_process_context())
+        elif mode == "thread":
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="analysis")
+        self._slots = None
+        self.submitted = 0
+
+    def describe(self) -> str:
+        if self.executor is None:
+            return "inline"
+        return f"{self.mode} pool, {self.workers} workers, up to {self.max_pending} bodies pending"
+
+    def inline(self, size: int) -> bool:
+        """Whether a body of `size` chars is analyzed on the caller's thread"""
+        return self.executor is None or size < INLINE_MAX_CHARS
+
+    async def run(self, fn, *args, size: int = 0):
+        """`fn(*args)` on the pool; waits for a free slot first. `size` (chars) below
+        INLINE_MAX_CHARS runs it inline"""
+        if self.inline(size):
+            return fn(*args)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            self.submitted += 1
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def close(self):
+        """Waits for running analysis; call it through asyncio.to_thread() from the event loop"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
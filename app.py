@@ -1,36 +1,33 @@
-import re
 import asyncio
-import aiohttp
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from fpdf import FPDF
-from fpdf.enums import XPos, YPos
-from datetime import datetime
+import csv
+import json
+from urllib.parse import urlparse
 import os
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI
 except ImportError:
-    OpenAI = None
+    AsyncOpenAI = None
 import argparse
-import random
+from datetime import datetime
 from dotenv import load_dotenv  # <-- added for .env support
 import sys
-import difflib
 
 # Load environment variables from .env file
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Point at a compatible local stand-in (e.g. http://127.0.0.1:8900/v1) for testing
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 client = None
 AI_ENABLED = False
 AI_DISABLED_REASON = ""
 
-if OpenAI is None:
+if AsyncOpenAI is None:
     AI_DISABLED_REASON = "OpenAI package not installed"
 elif OPENAI_API_KEY:
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
         AI_ENABLED = True
         AI_DISABLED_REASON = ""
     except Exception as e:
@@ -38,107 +35,41 @@ elif OPENAI_API_KEY:
 else:
     AI_DISABLED_REASON = "OPENAI_API_KEY not set"
 
-# Import paths to scan from separate file
-from paths_to_scan import paths_to_scan
-
-# ANSI color codes for console output
-class Colors:
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    PURPLE = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
-
-# Global counter for vulnerabilities
-vuln_count = 0
-
-# Global log of all scanned URLs
-scanned_urls_log = []
-
-# Global scan details
-scan_details = {
-    "company_name": "",
-    "target_url": "",
-    "scan_date": "",
-    "include_full_log": True
+# The scan engine lives in scanner.py; this module is its command-line front end
+from scanner import (
+    Scanner, ScanSession, Colors, normalize_target_url, KEYWORD_TIERS, BODY_CAPS, FILE_PROBE_METHODS,
+    AI_CACHE_SETTINGS, ANALYSIS_SETTINGS, AI_TRIAGE_SETTINGS, RATE_SETTINGS, RESILIENCE_SETTINGS,
+    REPORT_SETTINGS, RECURSION_SETTINGS, METRICS_SETTINGS, TRANSPORT_SETTINGS,
+)
+from analysis import POOL_MODES
+from wordlists import Wordlist, BUILTIN, SeenKeys
+from checkpoint import Checkpoint, new_scan_id
+from response_store import ResponseStore
+from rate_control import SPEED_PRESETS
+from scheduler import install_interrupt_handler
+from reporting import REPORT_EXTENSIONS
+from metrics import PHASES, format_seconds
+from profiling import Profiler, PROFILE_MODES
+from transport import BACKENDS, backend_unavailable
+
+# Checkpoint of the running scan (see checkpoint.py); None with --no-checkpoint
+checkpoint = None
+CHECKPOINT_SETTINGS = {
+    "path": "scan_checkpoints.sqlite",
+    "batch_size": 500,      # records per checkpoint transaction
+    "interval": 5.0,        # ... or at least this often, in seconds
 }
 
-# Global semaphore to control request concurrency
-request_semaphore = None
-
-# Sensitive directories that should not be publicly accessible
-SENSITIVE_DIRECTORIES = [
-    "admin", "administrator", "admin1", "admin2", "admin_area", "admin_panel",
-    "admin/login", "adminconsole", "admincontrol", "cpanel", "backend", "admincp",
-    "admin-console", "cmsadmin", "root", "superuser", "system_admin", "dashboard",
-    "backup", "backups", "db_backup", "site-backup", "website_backup",
-    "uploads", "upload", "tmp", "temp", "files", "public_files", "private_files",
-    "secret", "private", "old_site", "bk", "old", "archive",
-    "logs", "log", "debug", "error", "access", "server",
-    "config", "configuration", "settings", "env", "environment",
-    "database", "db", "mysql", "sql", "dump", "data",
-    "git", "svn", "hg", "bzr", "cvs",
-    "test", "tests", "testing", "dev", "development", "staging", "sandbox", "demo",
-    "example", "examples", "docs", "documentation", "doc",
-    "wp-admin", "wp-content", "joomla", "drupal", "magento", "prestashop",
-    "img", "images", "img/", "images/","bk", "bk/", "backup", "backup/", "backups", "backups/",
-    # Modern frameworks and package dirs
-    "storage", "storage/logs", "storage/app", "storage/framework", "bootstrap/cache",
-    "var", "var/log",
-    "vendor", "node_modules",
-    # Admin tools
-    "phpmyadmin", "phppgadmin", "_debugbar",
-    # Well-known endpoints folder
-    ".well-known"
-]
-
-def is_sensitive_directory(path: str) -> bool:
-    """Check if a path represents a sensitive directory that should not be publicly accessible"""
-    # Remove leading/trailing slashes and get the directory name
-    clean_path = path.strip('/')
-    
-    # Check if it's in our sensitive directories list
-    if clean_path in SENSITIVE_DIRECTORIES:
-        return True
-    
-    # Also check if it starts with any sensitive directory (for nested paths)
-    for sensitive_dir in SENSITIVE_DIRECTORIES:
-        if clean_path.startswith(sensitive_dir + '/') or clean_path == sensitive_dir:
-            return True
-    
-    return False
-
-# Suspicious file names/extensions that should not be publicly downloadable
-SUSPICIOUS_FILE_EXTENSIONS = {
-    "zip", "7z", "rar", "tar", "gz", "bz2",
-    "sql", "sqlite", "db", "bak", "backup",
-    "env", "pem", "key", "pfx", "cer",
+# Validators, content hashes and verdicts from earlier scans (see response_store.py); None when disabled
+response_store = None
+RESPONSE_STORE_SETTINGS = {
+    "path": "response_store.sqlite",
+    "batch_size": 500,      # entries per write
+    "interval": 5.0,        # ... or at least this often, in seconds
 }
 
-def is_suspicious_file(path: str) -> bool:
-    name = path.strip("/").split("/")[-1].lower()
-    if "." not in name:
-        # No file extension → treat as directory or unknown; do not flag as file
-        return False
-    ext = name.rsplit(".", 1)[-1]
-    return ext in SUSPICIOUS_FILE_EXTENSIONS
-
-def path_looks_like_directory(path: str) -> bool:
-    """Heuristic: consider it a directory if it ends with '/', or the last segment has no dot and matches sensitive dir names."""
-    if path.endswith("/"):
-        return True
-    last = path.strip("/").split("/")[-1].lower()
-    if not last:
-        return False
-    if "." not in last and last in SENSITIVE_DIRECTORIES:
-        return True
-    return False
 # Function to get user input for company name and URL
-def get_scan_details():
+def get_scan_details() -> ScanSession:
     print(f"{Colors.BOLD}{Colors.BLUE}🔍 Website Security Scanner{Colors.END}")
     print(f"{Colors.CYAN}{'=' * 50}{Colors.END}")
     
@@ -146,7 +77,6 @@ def get_scan_details():
     while True:
         company_name = input(f"{Colors.YELLOW}Enter company name: {Colors.END}").strip()
         if company_name:
-            scan_details["company_name"] = company_name
             break
         else:
             print(f"{Colors.RED}Company name cannot be empty. Please try again.{Colors.END}")
@@ -156,899 +86,375 @@ def get_scan_details():
         target_url = input(f"{Colors.YELLOW}Enter target URL (e.g., https://example.com): {Colors.END}").strip()
         if target_url:
             # Ensure URL has protocol
-            if not target_url.startswith(('http://', 'https://')):
-                target_url = 'https://' + target_url
-            scan_details["target_url"] = target_url
+            target_url = normalize_target_url(target_url)
             break
         else:
             print(f"{Colors.RED}URL cannot be empty. Please try again.{Colors.END}")
     
-    # Set scan date (UK format)
-    scan_details["scan_date"] = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+    scan = ScanSession(company_name, target_url)
     
     print(f"{Colors.GREEN}✅ Scan details captured:{Colors.END}")
     print(f"   Company: {Colors.BOLD}{company_name}{Colors.END}")
     print(f"   URL: {Colors.BOLD}{target_url}{Colors.END}")
-    print(f"   Date: {Colors.BOLD}{scan_details['scan_date']}{Colors.END}")
+    print(f"   Date: {Colors.BOLD}{scan.scan_details['scan_date']}{Colors.END}")
 
     # Ask whether to include full scan log
     while True:
-        resp = input(f"{Colors.YELLOW}Include full scan log in the PDF report? (Y/N): {Colors.END}").strip().lower()
+        resp = input(f"{Colors.YELLOW}Include full scan log in the PDF report (N = summary only)? (Y/N): {Colors.END}").strip().lower()
         if resp in ("y", "yes", ""):
-            scan_details["include_full_log"] = True
+            scan.scan_details["include_full_log"] = True
             break
         if resp in ("n", "no"):
-            scan_details["include_full_log"] = False
+            scan.scan_details["include_full_log"] = False
             break
         print(f"{Colors.RED}Please enter Y or N.{Colors.END}")
     print()
-
-# Content sensitivity scoring (simple keyword check)
-def score_content_sensitivity(content: str) -> str:
-    high_risk_keywords = ["password", "secret", "api_key", "aws_access_key", "private_key", "credentials"]
-    medium_risk_keywords = ["token", "auth", "key", "user", "email"]
-    content_lower = content.lower()
-    if any(k in content_lower for k in high_risk_keywords):
-        return "high"
-    if any(k in content_lower for k in medium_risk_keywords):
-        return "medium"
-    return "low"
-
-# AI analysis for uncertain content
-def ai_analyze_content(url: str, content: str, context_type="general") -> str:
-    if not AI_ENABLED or client is None:
-        reason = AI_DISABLED_REASON or "disabled"
-        return f"AI analysis skipped: {reason}"
-    prompt = (
-        f"You are an AI security auditor. Analyze the following {context_type} content from {url} "
-        f"and determine if it poses a security risk. Respond concisely with your confidence and explanation.\n\n"
-        f"Content:\n{content[:1500]}"
-    )
-    try:
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0,
-            max_tokens=250,
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        return f"AI analysis failed: {e}"
-
-# Randomized throttle function
-async def throttle(speed: str):
-    if speed == "slow":
-        delay = random.uniform(2.0, 4.0)
-    elif speed == "medium":
-        delay = random.uniform(0.3, 0.75)
-    else:  # fast
-        delay = 0
-    if delay > 0:
-        await asyncio.sleep(delay)
-
-# Async fetch with timeout (robust for binary content) with UA and localhost http fallback
-async def fetch(session, url):
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
-        )
-    }
-    try:
-        async with session.get(url, timeout=20, headers=headers) as resp:
-            raw = await resp.read()  # works for text or binary
-            try:
-                text = raw.decode("utf-8", errors="ignore")
-            except Exception:
-                text = ""
-            return resp.status, text
-    except Exception:
-        # If HTTPS to localhost/127.0.0.1 fails, retry with HTTP
-        try:
-            if url.startswith("https://localhost") or url.startswith("https://127.0.0.1"):
-                http_url = "http://" + url.split("://", 1)[1]
-                async with session.get(http_url, timeout=20, headers=headers) as resp2:
-                    raw2 = await resp2.read()
-                    try:
-                        text2 = raw2.decode("utf-8", errors="ignore")
-                    except Exception:
-                        text2 = ""
-                    return resp2.status, text2
-        except Exception:
-            pass
-        return None, ""
-
-# Soft-404 detection helpers
-SOFT_404_MARKERS = [
-    "404", "not found", "page not found", "doesn't exist", "does not exist",
-    "can't find", "cannot find", "oops", "we're sorry", "return to home"
-]
-
-soft_404_baseline_text = None
-
-def _normalize_html_text(content: str) -> str:
-    try:
-        soup = BeautifulSoup(content, "html.parser")
-        text = soup.get_text(" ")
-    except Exception:
-        text = content
-    # normalize whitespace and lowercase
-    return " ".join(text.split()).lower()
-
-def looks_like_soft_404(status: int, content: str) -> bool:
-    if status != 200 or not content:
-        return False
-    text = _normalize_html_text(content)
-    # keyword markers
-    if any(marker in text for marker in SOFT_404_MARKERS):
-        return True
-    # similarity to baseline soft-404
-    if soft_404_baseline_text:
-        try:
-            ratio = difflib.SequenceMatcher(None, text[:4000], soft_404_baseline_text[:4000]).ratio()
-            if ratio >= 0.92:
-                return True
-        except Exception:
-            pass
-    return False
-
-def ensure_trailing_slash(url: str) -> str:
-    return url if url.endswith('/') else url + '/'
-
-async def init_soft_404_baseline(session, base_url: str, speed: str):
-    global soft_404_baseline_text, request_semaphore
-    base = ensure_trailing_slash(base_url)
-    random_slug = f"__scanner_missing__{random.randint(100000, 999999)}/"  # no leading slash
-    test_url = urljoin(base, random_slug)
-    async with request_semaphore:
-        await throttle(speed)
-        status, content = await fetch(session, test_url)
-    if status == 200 and content:
-        soft_404_baseline_text = _normalize_html_text(content)
-
-# Analyze a file or directory path
-async def analyze_path(session, base_url: str, path: str, findings: list, counters: dict, speed: str):
-    global vuln_count, scanned_urls_log, request_semaphore
-    base = ensure_trailing_slash(base_url)
-    # Always treat paths as relative to base; remove any leading slash
-    rel_path = path.lstrip('/')
-    full_url = urljoin(base, rel_path)
-    
-    # Print scanning status
-    print(f"{Colors.CYAN}[SCANNING]{Colors.END} {path}")
-    
-    async with request_semaphore:
-        await throttle(speed)
-        status, content = await fetch(session, full_url)
-
-    is_dir = path_looks_like_directory(path)
-    if is_dir:
-        counters["directories"] += 1
-    else:
-        counters["files"] += 1
-
-    # Log the URL scan
-    scan_result = {
-        "url": full_url,
-        "path": path,
-        "status": status,
-        # Consider 200 as has_content even if response is binary (content may be empty string after decode)
-        "has_content": bool(status == 200),
-        "vulnerability": None,
-        "type": "directory" if is_dir else "file"
-    }
-
-    if status == 200:
-        # If a suspicious downloadable file is publicly accessible, flag immediately
-        if not is_dir and is_suspicious_file(path):
-            vuln_count += 1
-            scan_result["vulnerability"] = "high"
-            print(f"{Colors.GREEN}✅{Colors.END} {Colors.RED}[HIGH]{Colors.END} {Colors.BOLD}{path}{Colors.END} - Publicly downloadable sensitive file")
-            findings.append({"level": "high", "url": full_url, "notes": "Publicly downloadable sensitive file", "type": "file"})
-        # Soft-404 guard: treat as clean if body matches site's not-found template
-        elif looks_like_soft_404(status, content):
-            scan_result["vulnerability"] = "clean"
-            print(f"{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} {path} (soft 404)")
-        # Check if this is a sensitive directory that shouldn't be publicly accessible
-        elif is_sensitive_directory(path):
-            vuln_count += 1
-            scan_result["vulnerability"] = "high"
-            print(f"{Colors.GREEN}✅{Colors.END} {Colors.RED}[HIGH]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {Colors.YELLOW}Vulns: {vuln_count}{Colors.END}")
-            findings.append({"level": "high", "url": full_url, "notes": "Sensitive directory publicly accessible", "type": "directory" if is_dir else "file"})
-        elif content.strip():
-            # Check content sensitivity for files or directories with content
-            score = score_content_sensitivity(content)
-            typ = "directory" if is_dir else "file"
-
-            if score == "high":
-                vuln_count += 1
-                scan_result["vulnerability"] = "high"
-                print(f"{Colors.GREEN}✅{Colors.END} {Colors.RED}[HIGH]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {Colors.YELLOW}Vulns: {vuln_count}{Colors.END}")
-                findings.append({"level": "high", "url": full_url, "notes": "Auto-detected sensitive content", "type": typ})
-            elif score == "medium":
-                result = ai_analyze_content(full_url, content)
-                vuln_count += 1
-                scan_result["vulnerability"] = "medium"
-                print(f"{Colors.GREEN}✅{Colors.END} {Colors.YELLOW}[MEDIUM]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {Colors.YELLOW}Vulns: {vuln_count}{Colors.END}")
-                findings.append({"level": "medium", "url": full_url, "notes": result, "type": typ})
-            else:
-                scan_result["vulnerability"] = "clean"
-                print(f"{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} {path}")
-        else:
-            scan_result["vulnerability"] = "clean"
-            print(f"{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} {path}")
-    else:
-        # Treat 401/403 on sensitive paths as medium (exists but restricted)
-        if status in (401, 403) and is_sensitive_directory(path):
-            vuln_count += 1
-            scan_result["vulnerability"] = "medium"
-            print(f"{Colors.GREEN}✅{Colors.END} {Colors.YELLOW}[MEDIUM]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {Colors.YELLOW}Vulns: {vuln_count}{Colors.END}")
-            findings.append({"level": "medium", "url": full_url, "notes": f"Restricted access ({status}) on sensitive path", "type": "directory" if is_dir else "file"})
+    return scan
+
+def _parse_bool(value, default: bool = True) -> bool:
+    if value is None or str(value).strip() == "":
+        return default
+    return str(value).strip().lower() in ("1", "y", "yes", "true")
+
+# Load company/URL pairs for batch mode from a CSV (with header row) or JSONL file
+def load_targets(path: str, include_full_log: bool = True) -> list:
+    """Return a list of ScanSession objects; accepted keys are company/company_name and url/target_url"""
+    rows = []
+    with open(path, newline="", encoding="utf-8") as fh:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    # Skipped below, under its target number
+                    rows.append(e)
         else:
-            scan_result["vulnerability"] = "clean"
-            print(f"{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} {path}")
-    
-    scanned_urls_log.append(scan_result)
-
-# Common CDN libraries to skip (unlikely to contain sensitive data)
-CDN_LIBRARIES = [
-    "bootstrap", "jquery", "react", "vue", "angular", "lodash", "moment", "axios",
-    "fontawesome", "googleapis", "gstatic", "cloudflare", "jsdelivr", "unpkg",
-    "cdnjs", "bootcdn", "staticfile", "cdn.bootcss", "cdn.jsdelivr.net",
-    "code.jquery.com", "cdn.jsdelivr.net", "unpkg.com", "cdnjs.cloudflare.com"
-]
-
-def should_skip_js_file(js_path: str) -> bool:
-    """Check if JS file should be skipped (CDN library)"""
-    js_path_lower = js_path.lower()
-    return any(lib in js_path_lower for lib in CDN_LIBRARIES)
+            rows.extend(csv.DictReader(fh))
 
-# Analyze JS files found in main page
-async def analyze_js(session, base_url: str, findings: list, counters: dict, speed: str):
-    global vuln_count, scanned_urls_log, request_semaphore
-    print(f"{Colors.CYAN}[SCANNING]{Colors.END} Main page for JS files")
-    
-    base = ensure_trailing_slash(base_url)
-    async with request_semaphore:
-        await throttle(speed)
-        status, content = await fetch(session, base)
-    counters["files"] += 1  # counting homepage as scanned file
-
-    if status != 200:
-        print(f"{Colors.RED}[ERROR]{Colors.END} Could not access main page (status={status})")
-        return
-
-    soup = BeautifulSoup(content, "html.parser")
-    scripts = soup.find_all("script", src=True)
-    
-    if not scripts:
-        print(f"{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} No external JS files found")
-        return
-
-    for script in scripts:
-        js_url = urljoin(base_url, script["src"])
-        js_path = script["src"]
-        
-        # Skip CDN libraries
-        if should_skip_js_file(js_path):
-            print(f"{Colors.PURPLE}⏭️{Colors.END} {Colors.WHITE}[SKIPPED]{Colors.END} CDN library: {js_path}")
-            # Log skipped files too
-            scan_result = {
-                "url": js_url,
-                "path": js_path,
-                "status": "skipped",
-                "has_content": False,
-                "vulnerability": "skipped",
-                "type": "file"
-            }
-            scanned_urls_log.append(scan_result)
+    targets = []
+    for i, row in enumerate(rows, start=1):
+        if isinstance(row, json.JSONDecodeError):
+            print(f"{Colors.RED}Skipping target #{i} in {path}: invalid JSON ({row.msg}){Colors.END}")
             continue
-            
-        print(f"{Colors.CYAN}[SCANNING]{Colors.END} JS: {js_path}")
-        
-        async with request_semaphore:
-            await throttle(speed)
-            status, js_content = await fetch(session, js_url)
-        counters["files"] += 1
-
-        # Log the JS file scan
-        scan_result = {
-            "url": js_url,
-            "path": js_path,
-            "status": status,
-            "has_content": bool(status == 200 and js_content.strip()),
-            "vulnerability": None,
-            "type": "file"
-        }
-
-        if status == 200 and js_content.strip():
-            score = score_content_sensitivity(js_content)
-            if score == "high":
-                vuln_count += 1
-                scan_result["vulnerability"] = "high"
-                print(f"{Colors.GREEN}✅{Colors.END} {Colors.RED}[HIGH]{Colors.END} {Colors.BOLD}JS: {js_path}{Colors.END} - {Colors.YELLOW}Vulns: {vuln_count}{Colors.END}")
-                findings.append({"level": "high", "url": js_url, "notes": "Sensitive key/secret in JS", "type": "file"})
-            elif score == "medium":
-                result = ai_analyze_content(js_url, js_content, context_type="js")
-                vuln_count += 1
-                scan_result["vulnerability"] = "medium"
-                print(f"{Colors.GREEN}✅{Colors.END} {Colors.YELLOW}[MEDIUM]{Colors.END} {Colors.BOLD}JS: {js_path}{Colors.END} - {Colors.YELLOW}Vulns: {vuln_count}{Colors.END}")
-                findings.append({"level": "medium", "url": js_url, "notes": result, "type": "file"})
-            else:
-                scan_result["vulnerability"] = "clean"
-                print(f"{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} JS: {js_path}")
-        else:
-            scan_result["vulnerability"] = "clean"
-            print(f"{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} JS: {js_path} (no content)")
-        
-        scanned_urls_log.append(scan_result)
-
-# PDF report generator (styled with logo, modern fonts, and improved tables)
-class PDFReport(FPDF):
-    def header(self):
-        try:
-            logo_path = os.path.join(os.path.dirname(__file__), "images", "logo.png")
-            if os.path.isfile(logo_path):
-                # Place logo at top-left (width ~28mm), keep aspect ratio
-                self.image(logo_path, x=15, y=10, w=28)
-        except Exception:
-            # If logo fails, continue without it
-            pass
-
-        self.set_xy(15, 12)
-        self.set_font("Helvetica", "B", 16)
-        self.set_text_color(20, 40, 80)
-        self.cell(
-            0,
-            10,
-            "Website Security Scan Report",
-            border=0,
-            align="R",
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-
-        self.set_font("Helvetica", "B", 12)
-        self.set_text_color(0, 0, 0)
-        self.cell(
-            0,
-            8,
-            f"Company: {scan_details['company_name']}",
-            border=0,
-            align="R",
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-        self.set_font("Helvetica", "", 10)
-        self.cell(
-            0,
-            6,
-            f"Target URL: {scan_details['target_url']}",
-            border=0,
-            align="R",
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-        self.cell(
-            0,
-            6,
-            f"Scan Date: {scan_details['scan_date']}",
-            border=0,
-            align="R",
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-
-        # Separator line
-        self.ln(2)
-        self.set_draw_color(220, 223, 230)
-        self.set_line_width(0.4)
-        self.line(15, self.get_y(), 195, self.get_y())
-        self.ln(5)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font("Helvetica", "I", 8)
-        self.set_text_color(120, 120, 120)
-        self.cell(
-            0,
-            10,
-            f"Page {self.page_no()}",
-            border=0,
-            align="C",
-            new_x=XPos.RIGHT,
-            new_y=YPos.TOP,
-        )
-
-def save_report_to_pdf(findings: list, counters: dict) -> str:
-    pdf = PDFReport()
-    # Margins and auto page break
-    pdf.set_margins(15, 18, 15)
-    pdf.set_auto_page_break(auto=True, margin=18)
-    pdf.add_page()
-
-    # Summary card
-    pdf.set_fill_color(245, 247, 250)  # light gray-blue
-    pdf.set_draw_color(222, 226, 233)
-    pdf.set_text_color(20, 20, 20)
-    pdf.set_line_width(0.3)
-
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(
-        0,
-        10,
-        "Scan Summary",
-        border=0,
-        new_x=XPos.LMARGIN,
-        new_y=YPos.NEXT,
-    )
-    pdf.set_font("Helvetica", "", 11)
-
-    pdf.set_x(15)
-    pdf.multi_cell(
-        0,
-        8,
-        f"Files scanned: {counters.get('files',0)}",
-        border=0,
-        align="L",
-        fill=False,
-    )
-    pdf.set_x(15)
-    pdf.multi_cell(
-        0,
-        8,
-        f"Directories scanned: {counters.get('directories',0)}",
-        border=0,
-        align="L",
-        fill=False,
-    )
-    pdf.set_x(15)
-    pdf.multi_cell(
-        0,
-        8,
-        f"Potential issues found: {len(findings)}",
-        border=0,
-        align="L",
-        fill=False,
-    )
-    pdf.ln(5)
-
-    # Findings details as styled table
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(
-        0,
-        10,
-        "Details",
-        border=0,
-        new_x=XPos.LMARGIN,
-        new_y=YPos.NEXT,
-    )
-    if not findings:
-        pdf.set_font("Helvetica", "I", 11)
-        pdf.cell(
-            0,
-            8,
-            "No security issues detected.",
-            border=1,
-            align="C",
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-    else:
-        header_fill = (240, 244, 248)
-        row_alt_fill = (249, 251, 253)
-        pdf.set_font("Helvetica", "B", 10)
-        pdf.set_fill_color(*header_fill)
-        pdf.set_draw_color(220, 223, 230)
-        pdf.set_text_color(20, 40, 80)
-        # Columns: Level (22) | Type (22) | URL (80) | Notes (56) = 180
-        pdf.cell(
-            22,
-            8,
-            "Level",
-            border=1,
-            align="C",
-            fill=True,
-            new_x=XPos.RIGHT,
-            new_y=YPos.TOP,
-        )
-        pdf.cell(
-            22,
-            8,
-            "Type",
-            border=1,
-            align="C",
-            fill=True,
-            new_x=XPos.RIGHT,
-            new_y=YPos.TOP,
-        )
-        pdf.cell(
-            80,
-            8,
-            "URL",
-            border=1,
-            align="L",
-            fill=True,
-            new_x=XPos.RIGHT,
-            new_y=YPos.TOP,
-        )
-        pdf.cell(
-            56,
-            8,
-            "Notes",
-            border=1,
-            align="L",
-            fill=True,
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-
-        pdf.set_font("Helvetica", "", 9)
-        pdf.set_text_color(15, 15, 15)
-        fill_toggle = False
-        for f in findings:
-            if fill_toggle:
-                pdf.set_fill_color(*row_alt_fill)
-            else:
-                pdf.set_fill_color(255, 255, 255)
-            fill_toggle = not fill_toggle
-
-            level = (f.get("level") or "").upper()
-            typ = (f.get("type") or "").capitalize()
-            url = f.get("url") or ""
-            notes = f.get("notes") or ""
-            # Truncate to keep row heights clean
-            url_disp = (url[:76] + "...") if len(url) > 79 else url
-            notes_disp = (notes[:53] + "...") if len(notes) > 56 else notes
-
-            # Color-code level text
-            if level == "HIGH":
-                level_color = (200, 30, 30)
-            elif level == "MEDIUM":
-                level_color = (200, 120, 20)
-            else:
-                level_color = (30, 140, 50)
-
-            # Level
-            pdf.set_text_color(*level_color)
-            pdf.cell(
-                22,
-                7,
-                level,
-                border=1,
-                align="C",
-                fill=True,
-                new_x=XPos.RIGHT,
-                new_y=YPos.TOP,
-            )
-            # Type
-            pdf.set_text_color(15, 15, 15)
-            pdf.cell(
-                22,
-                7,
-                typ,
-                border=1,
-                align="C",
-                fill=True,
-                new_x=XPos.RIGHT,
-                new_y=YPos.TOP,
-            )
-            # URL
-            pdf.cell(
-                80,
-                7,
-                url_disp,
-                border=1,
-                align="L",
-                fill=True,
-                new_x=XPos.RIGHT,
-                new_y=YPos.TOP,
-            )
-            # Notes
-            pdf.cell(
-                56,
-                7,
-                notes_disp,
-                border=1,
-                align="L",
-                fill=True,
-                new_x=XPos.LMARGIN,
-                new_y=YPos.NEXT,
-            )
-
-    # Complete scan log (styled table) - optional
-    if scan_details.get("include_full_log", True):
-        pdf.add_page()
-        pdf.set_font("Helvetica", "B", 14)
-        pdf.cell(
-            0,
-            10,
-            "Complete Scan Log",
-            border=0,
-            align="C",
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-        pdf.ln(2)
-
-        # Table header
-        header_fill = (240, 244, 248)
-        row_alt_fill = (249, 251, 253)
-        pdf.set_font("Helvetica", "B", 10)
-        pdf.set_fill_color(*header_fill)
-        pdf.set_draw_color(220, 223, 230)
-        pdf.set_text_color(20, 40, 80)
-        pdf.cell(
-            100,
-            8,
-            "Path",
-            border=1,
-            align="L",
-            fill=True,
-            new_x=XPos.RIGHT,
-            new_y=YPos.TOP,
-        )
-        pdf.cell(
-            25,
-            8,
-            "Status",
-            border=1,
-            align="C",
-            fill=True,
-            new_x=XPos.RIGHT,
-            new_y=YPos.TOP,
-        )
-        pdf.cell(
-            25,
-            8,
-            "Result",
-            border=1,
-            align="C",
-            fill=True,
-            new_x=XPos.RIGHT,
-            new_y=YPos.TOP,
-        )
-        pdf.cell(
-            25,
-            8,
-            "Type",
-            border=1,
-            align="C",
-            fill=True,
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-
-        # Table rows
-        pdf.set_font("Helvetica", "", 9)
-        pdf.set_text_color(15, 15, 15)
-        fill_toggle = False
-        # Also deduplicate any duplicates that slipped through by path key
-        seen_paths = set()
-        for scan in scanned_urls_log:
-            path_key = (scan.get("path") or "").strip("/")
-            if path_key in seen_paths:
-                continue
-            seen_paths.add(path_key)
-
-            if fill_toggle:
-                pdf.set_fill_color(*row_alt_fill)
-            else:
-                pdf.set_fill_color(255, 255, 255)
-            fill_toggle = not fill_toggle
-
-            display_path = scan["path"][:95] + "..." if len(scan["path"]) > 98 else scan["path"]
-
-            if scan["vulnerability"] == "high":
-                pdf.set_text_color(200, 30, 30)  # red-ish
-                result_symbol = "HIGH"
-            elif scan["vulnerability"] == "medium":
-                pdf.set_text_color(200, 120, 20)  # orange-ish
-                result_symbol = "MED"
-            elif scan["vulnerability"] == "skipped":
-                pdf.set_text_color(120, 120, 120)  # gray
-                result_symbol = "SKIP"
-            else:
-                pdf.set_text_color(30, 140, 50)  # green-ish
-                result_symbol = "CLEAN"
-
-            pdf.cell(
-                100,
-                7,
-                display_path,
-                border=1,
-                align="L",
-                fill=True,
-                new_x=XPos.RIGHT,
-                new_y=YPos.TOP,
-            )
-            pdf.cell(
-                25,
-                7,
-                str(scan["status"]),
-                border=1,
-                align="C",
-                fill=True,
-                new_x=XPos.RIGHT,
-                new_y=YPos.TOP,
-            )
-            pdf.cell(
-                25,
-                7,
-                result_symbol,
-                border=1,
-                align="C",
-                fill=True,
-                new_x=XPos.RIGHT,
-                new_y=YPos.TOP,
-            )
-            pdf.cell(
-                25,
-                7,
-                scan["type"],
-                border=1,
-                align="C",
-                fill=True,
-                new_x=XPos.LMARGIN,
-                new_y=YPos.NEXT,
-            )
-
-            # Reset text color for next row
-            pdf.set_text_color(15, 15, 15)
-
-    # Summary statistics as table
-    pdf.ln(6)
-    pdf.set_font("Helvetica", "B", 11)
-    pdf.set_text_color(20, 40, 80)
-    pdf.cell(
-        0,
-        8,
-        "Scan Statistics",
-        border=0,
-        new_x=XPos.LMARGIN,
-        new_y=YPos.NEXT,
-    )
-
-    header_fill = (240, 244, 248)
-    row_alt_fill = (249, 251, 253)
-
-    # Table header
-    pdf.set_font("Helvetica", "B", 10)
-    pdf.set_fill_color(*header_fill)
-    pdf.set_draw_color(220, 223, 230)
-    pdf.set_text_color(20, 40, 80)
-    pdf.cell(
-        120,
-        8,
-        "Metric",
-        border=1,
-        align="L",
-        fill=True,
-        new_x=XPos.RIGHT,
-        new_y=YPos.TOP,
-    )
-    pdf.cell(
-        60,
-        8,
-        "Value",
-        border=1,
-        align="C",
-        fill=True,
-        new_x=XPos.LMARGIN,
-        new_y=YPos.NEXT,
-    )
-
-    # Table rows
-    pdf.set_font("Helvetica", "", 10)
-    pdf.set_text_color(20, 20, 20)
-    total_scanned = len(scanned_urls_log)
-    high_vulns = sum(1 for scan in scanned_urls_log if scan["vulnerability"] == "high")
-    medium_vulns = sum(1 for scan in scanned_urls_log if scan["vulnerability"] == "medium")
-    clean_scans = sum(1 for scan in scanned_urls_log if scan["vulnerability"] == "clean")
-    skipped_scans = sum(1 for scan in scanned_urls_log if scan["vulnerability"] == "skipped")
-
-    stats_rows = [
-        ("Total URLs scanned", str(total_scanned)),
-        ("High risk vulnerabilities", str(high_vulns)),
-        ("Medium risk vulnerabilities", str(medium_vulns)),
-        ("Clean scans", str(clean_scans)),
-        ("Skipped (CDN libraries)", str(skipped_scans)),
-    ]
-    fill_toggle = False
-    for metric, value in stats_rows:
-        if fill_toggle:
-            pdf.set_fill_color(*row_alt_fill)
-        else:
-            pdf.set_fill_color(255, 255, 255)
-        fill_toggle = not fill_toggle
-        pdf.cell(
-            120,
-            7,
-            metric,
-            border=1,
-            align="L",
-            fill=True,
-            new_x=XPos.RIGHT,
-            new_y=YPos.TOP,
-        )
-        pdf.cell(
-            60,
-            7,
-            value,
-            border=1,
-            align="C",
-            fill=True,
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
-
-    # Generate filename with company name
-    company_safe = "".join(c for c in scan_details['company_name'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-    filename = f"security_scan_{company_safe}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    pdf.output(filename)
-    return filename
-
-async def run_full_scan(base_url: str, speed: str):
-    global vuln_count, scanned_urls_log, request_semaphore
-    vuln_count = 0  # Reset counter for new scan
-    scanned_urls_log = []  # Reset log for new scan
-    findings = []
-    counters = {"files": 0, "directories": 0}
-
-    # Deduplicate paths to avoid scanning /backup and /backup/ separately
-    def normalize_path_key(p: str) -> str:
-        return p.strip("/")
-
-    unique_paths = []
-    seen_keys = set()
-    for p in paths_to_scan:
-        key = normalize_path_key(p)
-        if key not in seen_keys:
-            seen_keys.add(key)
-            unique_paths.append(p)
+        if not isinstance(row, dict):
+            print(f"{Colors.RED}Skipping target #{i} in {path}: expected a JSON object{Colors.END}")
+            continue
+        row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+        company = str(row.get("company") or row.get("company_name") or "").strip()
+        url = str(row.get("url") or row.get("target_url") or "").strip()
+        if not company or not url:
+            print(f"{Colors.RED}Skipping target #{i} in {path}: company and url are required{Colors.END}")
+            continue
+        url = normalize_target_url(url)
+        full_log = _parse_bool(row.get("include_full_log"), include_full_log)
+        targets.append(ScanSession(company, url, include_full_log=full_log, label=urlparse(url).netloc))
+    return targets
+
+# Register a new scan in the checkpoint and print how to resume it
+def start_checkpoint(checkpoint: Checkpoint, targets: list, argv: list):
+    checkpoint.start(argv, [scan.scan_details for scan in targets])
+    for target_id, scan in enumerate(targets):
+        scan.target_id = target_id
+    print(f"{Colors.CYAN}💾 Checkpointing to {checkpoint.path}; resume with --resume {checkpoint.scan_id}{Colors.END}")
+
+# Targets of a checkpointed scan that still have work left, with their progress and output names
+def resume_targets(checkpoint: Checkpoint, batch: bool) -> list:
+    targets = []
+    for row in checkpoint.targets():
+        details = row["details"]
+        url = details["target_url"]
+        if row["phase"] == "done":
+            print(f"{Colors.CYAN}⏭️ Already complete: {url}{Colors.END}")
+            continue
+        scan = ScanSession(details["company_name"], url, details.get("include_full_log", True),
+                          label=urlparse(url).netloc if batch else "")
+        scan.scan_details = details
+        scan.target_id = row["target_id"]
+        if row["results_path"]:
+            scan.report_base = row["report_base"]
+            scan.results_path = row["results_path"]
+            scan.completed = SeenKeys()
+        if row["baseline"] is not None:
+            baseline = json.loads(row["baseline"])
+            scan.soft_404_fingerprint = tuple(baseline) if baseline else None
+            scan.baseline_checked = True
+        targets.append(scan)
+    return targets
+
+# Keyword tiers from the command line (--keywords FILE); tiers left out keep the built-in list
+def load_keyword_tiers(path: str) -> dict:
+    """Read keyword tiers from a JSON file like {"high": [...], "medium": [...]}"""
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    if not isinstance(data, dict) or not set(data) <= set(KEYWORD_TIERS):
+        raise ValueError(f"expected a JSON object with keys {', '.join(KEYWORD_TIERS)}")
+    tiers = {}
+    for tier in KEYWORD_TIERS:
+        keywords = data.get(tier, KEYWORD_TIERS[tier])
+        if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+            raise ValueError(f"'{tier}' must be a list of strings")
+        tiers[tier] = keywords
+    return tiers
+
+# First Ctrl-C: running scans finish their in-flight requests and report what they have
+def interrupt_scans(scanner: Scanner):
+    print(f"\n{Colors.YELLOW}⚠️ Interrupted: finishing in-flight requests and writing partial reports (Ctrl-C again to abort){Colors.END}")
+    scanner.interrupt()
+
+async def run_full_scan(scanner: Scanner, scan: ScanSession) -> str:
+    base_url = scan.scan_details["target_url"]
 
     print(f"{Colors.BOLD}{Colors.BLUE}🔍 Starting security scan of {base_url}{Colors.END}")
-    print(f"{Colors.CYAN}📊 Total paths to scan: {len(unique_paths)} (deduplicated){Colors.END}")
-    print(f"{Colors.CYAN}⚡ Scan speed: {speed}{Colors.END}")
+    print(f"{Colors.CYAN}📊 Wordlist: {scanner.wordlist.describe()}{Colors.END}")
+    print(f"{Colors.CYAN}⚡ Scan speed: {scanner.describe_pacing()}{Colors.END}")
     print("-" * 60)
 
-    # Set concurrency based on speed
-    if speed == "slow":
-        concurrency_limit = 1
-    elif speed == "medium":
-        concurrency_limit = 5
-    else:
-        concurrency_limit = 20
+    restore_sigint = install_interrupt_handler(lambda: interrupt_scans(scanner))
+    try:
+        async with scanner:
+            reports = await scanner.run(scan)
+    finally:
+        restore_sigint()
 
-    request_semaphore = asyncio.Semaphore(concurrency_limit)
+    print("-" * 60)
+    print(f"{Colors.BOLD}{Colors.GREEN}✅ Scan completed!{Colors.END}")
+    print(f"{Colors.YELLOW}📈 Total vulnerabilities found: {scan.vuln_count}{Colors.END}")
+    print(f"{Colors.CYAN}📊 Paths scanned: {scan.paths_scanned} (deduplicated){Colors.END}")
+    if scan.interrupted:
+        print(f"{Colors.YELLOW}⚠️ Scan was interrupted; the report is partial{Colors.END}")
+    print(f"{Colors.CYAN}📁 Files scanned: {scan.counters.get('files', 0)}{Colors.END}")
+    print(f"{Colors.CYAN}📂 Directories scanned: {scan.counters.get('directories', 0)}{Colors.END}")
+    print(f"{Colors.CYAN}⚡ Final pacing: {scan.rate.describe()}{Colors.END}")
+    print(f"{Colors.CYAN}📝 Results: {scan.results_path}{Colors.END}")
+    if scan.breaker.failures:
+        print(f"{Colors.YELLOW}⚠️ Connection failures: {scan.breaker.describe()}{Colors.END}")
+    if scan.breaker.aborted:
+        print(f"{Colors.RED}⛔ Target aborted; the report is partial{Colors.END}")
+    print(f"{Colors.CYAN}⏱️ Request phases (mean): {scanner.metrics.describe_phases(scan.host)}{Colors.END}")
+    slowest = scanner.metrics.slowest_requests(scan.host, 5)
+    if slowest:
+        print(f"{Colors.CYAN}🐢 Slowest paths:{Colors.END}")
+    for total, url, probe, status, phases in slowest:
+        # The phase that took longest is usually the one to look at
+        phase = max(PHASES[:-1], key=lambda name: phases[name])
+        print(f"   {format_seconds(total):>7}  {urlparse(url).path or '/'} ({probe}, {status or 'no response'}; "
+              f"mostly {phase} {format_seconds(phases[phase])})")
+
+    return ", ".join(reports)
+
+# Non-interactive batch mode: many targets, one event loop, one scanner (shared session and DNS cache)
+async def run_batch_scan(scanner: Scanner, targets: list, output_dir: str = "") -> dict:
+    print(f"{Colors.BOLD}{Colors.BLUE}🔍 Starting batch scan of {len(targets)} targets{Colors.END}")
+    print(f"{Colors.CYAN}📊 Wordlist: {scanner.wordlist.describe()}{Colors.END}")
+    print(f"{Colors.CYAN}⚡ Scan speed: {scanner.speed} (up to {scanner.per_host_limit} per host, {scanner.global_limit} total, "
+          f"{scanner.parallel_targets} targets at once){Colors.END}")
+    print("-" * 60)
 
-    connector = aiohttp.TCPConnector(limit=concurrency_limit, limit_per_host=concurrency_limit)
+    reports = {}
 
-    normalized_base = ensure_trailing_slash(base_url)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        # Initialize soft-404 baseline for this target
-        await init_soft_404_baseline(session, normalized_base, speed)
-        tasks = [analyze_path(session, normalized_base, path, findings, counters, speed) for path in unique_paths]
-        await asyncio.gather(*tasks)
-        await analyze_js(session, normalized_base, findings, counters, speed)
+    async def run_one(scan: ScanSession):
+        target_url = scan.scan_details["target_url"]
+        try:
+            report = await scanner.run(scan, output_dir, filename_tag=urlparse(target_url).netloc)
+        except Exception as e:
+            print(f"{scan.tag}{Colors.RED}[ERROR]{Colors.END} Scan failed: {e}")
+            return
+        # Never started: the batch was interrupted while it waited for a slot
+        if scan.rate is None:
+            return
+        report = ", ".join(report)
+        reports[target_url] = report
+        partial = " (aborted, partial)" if scan.breaker.aborted else " (interrupted, partial)" if scan.interrupted else ""
+        print(f"{scan.tag}{Colors.GREEN}✅ Done{partial}: {scan.paths_scanned} paths, {scan.vuln_count} vulnerabilities, reports: {report}{Colors.END}")
+        print(f"{scan.tag}{Colors.CYAN}⚡ Final pacing: {scan.rate.describe()}{Colors.END}")
+
+    restore_sigint = install_interrupt_handler(lambda: interrupt_scans(scanner))
+    try:
+        async with scanner:
+            await asyncio.gather(*(run_one(scan) for scan in targets))
+    finally:
+        restore_sigint()
 
     print("-" * 60)
-    print(f"{Colors.BOLD}{Colors.GREEN}✅ Scan completed!{Colors.END}")
-    print(f"{Colors.YELLOW}📈 Total vulnerabilities found: {vuln_count}{Colors.END}")
-    print(f"{Colors.CYAN}📁 Files scanned: {counters.get('files', 0)}{Colors.END}")
-    print(f"{Colors.CYAN}📂 Directories scanned: {counters.get('directories', 0)}{Colors.END}")
-
-    report_path = save_report_to_pdf(findings, counters)
-    return report_path
+    print(f"{Colors.BOLD}{Colors.GREEN}✅ Batch scan completed: {len(reports)}/{len(targets)} targets reported{Colors.END}")
+    return reports
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Website audit scanner with throttling and AI assistance")
-    parser.add_argument("--speed", choices=["fast", "medium", "slow"], default="slow",
-                        help="Scan speed with throttling delay (default: slow)")
+    parser.add_argument("--speed", choices=list(SPEED_PRESETS), default="slow",
+                        help="Starting pace per host; adapted to the target's latency and 429/503 responses (default: slow)")
+    parser.add_argument("--fixed-rate", action="store_true",
+                        help="Keep the --speed preset's concurrency and delay fixed instead of adapting them")
+    parser.add_argument("--min-concurrency", type=int, default=RATE_SETTINGS["min_concurrency"],
+                        help=f"Floor for in-flight requests per host (default: {RATE_SETTINGS['min_concurrency']})")
+    parser.add_argument("--max-concurrency", type=int,
+                        help="Ceiling for in-flight requests per host (default: 4 slow, 20 medium, 64 fast)")
+    parser.add_argument("--min-delay", type=float, metavar="SECONDS",
+                        help="Shortest delay before each request (default: 0.5 slow, 0.05 medium, 0 fast)")
+    parser.add_argument("--max-delay", type=float, default=RATE_SETTINGS["max_delay"], metavar="SECONDS",
+                        help=f"Longest delay before each request when backing off (default: {RATE_SETTINGS['max_delay']})")
+    parser.add_argument("--retries", type=int, default=RESILIENCE_SETTINGS["retries"],
+                        help=f"Retries for timeouts, connection errors and resets, with jittered backoff (default: {RESILIENCE_SETTINGS['retries']})")
+    parser.add_argument("--breaker-threshold", type=int, default=RESILIENCE_SETTINGS["threshold"],
+                        help=f"Consecutive failed requests before a host is paused or aborted (default: {RESILIENCE_SETTINGS['threshold']})")
+    parser.add_argument("--breaker-cooldown", type=float, default=RESILIENCE_SETTINGS["cooldown"], metavar="SECONDS",
+                        help=f"How long a failing host is paused; doubles on each trip (default: {RESILIENCE_SETTINGS['cooldown']:.0f})")
+    parser.add_argument("--on-host-failure", choices=["pause", "abort"], default="pause",
+                        help=f"When the breaker trips: pause the host, aborting after {RESILIENCE_SETTINGS['max_trips']} trips "
+                             "(default), or abort the target straight away")
+    parser.add_argument("--recursive", action="store_true",
+                        help="Probe the wordlist's names beneath every directory that exists (200 or 401/403)")
+    parser.add_argument("--max-depth", type=int, default=RECURSION_SETTINGS["max_depth"], metavar="N",
+                        help=f"Levels of recursion below a wordlist directory (default: {RECURSION_SETTINGS['max_depth']})")
+    parser.add_argument("--recursion-budget", type=int, default=RECURSION_SETTINGS["budget"], metavar="PROBES",
+                        help=f"Most child paths probed per target in recursive mode (default: {RECURSION_SETTINGS['budget']})")
+    parser.add_argument("--resume", metavar="SCAN_ID",
+                        help="Resume an interrupted scan with its original settings, skipping completed paths")
+    parser.add_argument("--checkpoint-db", default=CHECKPOINT_SETTINGS["path"], metavar="FILE",
+                        help=f"SQLite file recording scan progress for --resume (default: {CHECKPOINT_SETTINGS['path']})")
+    parser.add_argument("--no-checkpoint", action="store_true",
+                        help="Do not record progress (the scan cannot be resumed)")
+    parser.add_argument("--response-store", default=RESPONSE_STORE_SETTINGS["path"], metavar="FILE",
+                        help="SQLite file of validators and verdicts from earlier scans, used to revalidate unchanged "
+                             f"responses instead of re-analyzing them (default: {RESPONSE_STORE_SETTINGS['path']})")
+    parser.add_argument("--no-response-store", action="store_true",
+                        help="Analyze every response from scratch and do not remember them for the next scan")
+    parser.add_argument("--analysis-pool", choices=POOL_MODES, default=ANALYSIS_SETTINGS["mode"],
+                        help="Where CPU-bound response analysis runs: worker processes, threads, or inline on the "
+                             "event loop; auto uses threads on multi-core machines (default: auto)")
+    parser.add_argument("--analysis-workers", type=int, default=ANALYSIS_SETTINGS["workers"], metavar="N",
+                        help="Analysis pool workers (default: one per core)")
+    parser.add_argument("--analysis-queue", type=int, default=ANALYSIS_SETTINGS["max_pending"], metavar="BODIES",
+                        help="Most response bodies submitted to or waiting for the analysis pool (default: two per worker)")
     parser.add_argument("--disable-ai", action="store_true",
                         help="Disable optional OpenAI-assisted analysis even if configured")
+    parser.add_argument("--ai-workers", type=int, default=AI_TRIAGE_SETTINGS["workers"],
+                        help=f"Concurrent AI triage workers (default: {AI_TRIAGE_SETTINGS['workers']})")
+    parser.add_argument("--ai-rpm", type=float, default=AI_TRIAGE_SETTINGS["requests_per_minute"],
+                        help=f"AI triage request budget per minute (default: {AI_TRIAGE_SETTINGS['requests_per_minute']})")
+    parser.add_argument("--ai-tpm", type=float, default=AI_TRIAGE_SETTINGS["tokens_per_minute"],
+                        help=f"AI triage token budget per minute (default: {AI_TRIAGE_SETTINGS['tokens_per_minute']})")
+    parser.add_argument("--ai-queue", type=int, default=AI_TRIAGE_SETTINGS["queue_size"],
+                        help=f"Findings that may wait for triage before scanning pauses (default: {AI_TRIAGE_SETTINGS['queue_size']})")
+    parser.add_argument("--ai-cache", default=AI_CACHE_SETTINGS["path"], metavar="FILE",
+                        help=f"SQLite file caching AI verdicts across scans (default: {AI_CACHE_SETTINGS['path']})")
+    parser.add_argument("--no-ai-cache", action="store_true",
+                        help="Do not read or write the AI verdict cache")
+    parser.add_argument("--ai-cache-ttl", type=float, default=30, metavar="DAYS",
+                        help="Days before a cached AI verdict expires (default: 30)")
+    parser.add_argument("--ai-cache-size", type=int, default=AI_CACHE_SETTINGS["max_entries"],
+                        help=f"Maximum cached AI verdicts; least recently used are evicted (default: {AI_CACHE_SETTINGS['max_entries']})")
+    parser.add_argument("--keywords", metavar="FILE",
+                        help="JSON file of keyword tiers ({\"high\": [...], \"medium\": [...]}) replacing the built-in lists")
+    parser.add_argument("--wordlist", action="append", default=[], metavar="FILE",
+                        help="Plain-text or .gz wordlist (one path per line) to scan instead of the built-in list; "
+                             f"may be repeated, use '{BUILTIN}' to add the built-in list as well")
+    parser.add_argument("--include-category", action="append", default=[], metavar="NAMES",
+                        help="Only scan wordlist entries in these comma-separated categories. May be repeated.")
+    parser.add_argument("--exclude-category", action="append", default=[], metavar="NAMES",
+                        help="Skip wordlist entries in these comma-separated categories. May be repeated.")
+    parser.add_argument("--targets", metavar="FILE",
+                        help="Batch mode: CSV (company,url header) or JSONL file of targets; skips interactive prompts")
+    parser.add_argument("--global-limit", type=int, default=100,
+                        help="Batch mode: maximum in-flight requests across all targets (default: 100)")
+    parser.add_argument("--parallel-targets", type=int, default=10,
+                        help="Batch mode: number of targets scanned at once (default: 10)")
+    parser.add_argument("--output-dir", default="",
+                        help="Batch mode: directory for the per-target PDF reports and results files (default: current directory)")
+    parser.add_argument("--results-gzip", action="store_true",
+                        help="Gzip the per-target JSONL results files (.jsonl.gz)")
+    parser.add_argument("--report-format", action="append", default=[], metavar="FORMATS",
+                        help=f"Comma-separated report formats ({', '.join(REPORT_EXTENSIONS)}); may be repeated (default: pdf)")
+    parser.add_argument("--pdf-log", choices=["auto", "full", "summary", "none"], default=REPORT_SETTINGS["pdf_log"],
+                        help="Scan log in the PDF: one row per path, or a status histogram and the top "
+                             f"{REPORT_SETTINGS['top']} notable responses; auto summarizes scans over "
+                             f"--pdf-full-log-limit paths (default: {REPORT_SETTINGS['pdf_log']})")
+    parser.add_argument("--pdf-full-log-limit", type=int, default=REPORT_SETTINGS["pdf_full_log_limit"], metavar="PATHS",
+                        help=f"Largest scan that gets the full log in the PDF with --pdf-log auto (default: {REPORT_SETTINGS['pdf_full_log_limit']})")
+    parser.add_argument("--no-full-log", action="store_true",
+                        help="Batch mode: summarize the scan log in PDF reports unless a target row overrides it")
+    parser.add_argument("--file-probe", choices=FILE_PROBE_METHODS, default="range",
+                        help="How suspicious downloadable files are probed: GET with a Range header (default, "
+                             "captures the first bytes) or HEAD; a capped GET is used only if the server rejects it")
+    parser.add_argument("--body-cap", action="append", default=[], metavar="PROBE=KB",
+                        help=f"Override the response body cap for a probe type ({', '.join(BODY_CAPS)}); "
+                             "0 reads headers only. May be repeated.")
+    parser.add_argument("--transport", choices=BACKENDS, default=TRANSPORT_SETTINGS["backend"],
+                        help="HTTP client: aiohttp (default) or httpx, which multiplexes probes over HTTP/2 "
+                             'where the target offers it (pip install "httpx[http2]")')
+    parser.add_argument("--no-http2", action="store_true", help="Keep the httpx transport on HTTP/1.1")
+    parser.add_argument("--pool-size", type=int, default=TRANSPORT_SETTINGS["pool_size"], metavar="N",
+                        help="Connections kept open across all targets (default: the request limit)")
+    parser.add_argument("--keepalive", type=float, default=TRANSPORT_SETTINGS["keepalive"], metavar="SECONDS",
+                        help=f"How long an idle connection is kept for reuse (default: {TRANSPORT_SETTINGS['keepalive']:g})")
+    parser.add_argument("--dns-ttl", type=float, default=TRANSPORT_SETTINGS["dns_ttl"], metavar="SECONDS",
+                        help=f"How long DNS answers are cached, aiohttp only; 0 = no cache (default: {TRANSPORT_SETTINGS['dns_ttl']:g})")
+    parser.add_argument("--timeout", type=float, default=TRANSPORT_SETTINGS["timeout"], metavar="SECONDS",
+                        help=f"Time allowed for a whole request (default: {TRANSPORT_SETTINGS['timeout']:g})")
+    parser.add_argument("--connect-timeout", type=float, default=TRANSPORT_SETTINGS["connect_timeout"], metavar="SECONDS",
+                        help=f"Time allowed to open a connection (default: {TRANSPORT_SETTINGS['connect_timeout']:g})")
+    parser.add_argument("--read-timeout", type=float, default=TRANSPORT_SETTINGS["read_timeout"], metavar="SECONDS",
+                        help=f"Longest wait for more of a response (default: {TRANSPORT_SETTINGS['read_timeout']:g})")
+    parser.add_argument("--profile", nargs="?", const="stages", choices=PROFILE_MODES, metavar="MODE",
+                        help="Write a profile next to the reports: wall vs CPU time per stage, and with "
+                             "'cprofile' or 'sample' the hot functions too (default mode: stages)")
+    parser.add_argument("--metrics-json", default=METRICS_SETTINGS["json"], metavar="FILE",
+                        help="Write per-request phase timings (DNS, connect, time to first byte, download, "
+                             "throttle and queue waits) per host and probe type as JSON when the scan ends")
+    parser.add_argument("--metrics-prometheus", default=METRICS_SETTINGS["prometheus"], metavar="FILE",
+                        help="Keep the same metrics in a Prometheus text file, rewritten during the scan")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_SETTINGS["port"], metavar="PORT",
+                        help="Serve the metrics on http://127.0.0.1:PORT/metrics during the scan (default: off)")
+    parser.add_argument("--metrics-interval", type=float, default=METRICS_SETTINGS["interval"], metavar="SECONDS",
+                        help=f"How often the --metrics-prometheus file is rewritten (default: {METRICS_SETTINGS['interval']:g})")
 
     args = parser.parse_args()
+    resume_id = args.resume
+    if resume_id:
+        if not os.path.isfile(args.checkpoint_db):
+            parser.error(f"checkpoint file not found: {args.checkpoint_db}")
+        checkpoint = Checkpoint(args.checkpoint_db, resume_id)
+        stored_argv = checkpoint.argv()
+        if stored_argv is None:
+            parser.error(f"no scan '{resume_id}' in {args.checkpoint_db}")
+        # Same settings and output as the original run
+        args = parser.parse_args(stored_argv)
+        print(f"{Colors.CYAN}↩️ Resuming scan {resume_id}: {' '.join(stored_argv) or '(interactive)'}{Colors.END}")
+    elif not args.no_checkpoint:
+        checkpoint = Checkpoint(args.checkpoint_db, new_scan_id(), CHECKPOINT_SETTINGS["batch_size"],
+                                CHECKPOINT_SETTINGS["interval"])
+
+    if not args.no_response_store:
+        response_store = ResponseStore(args.response_store, RESPONSE_STORE_SETTINGS["batch_size"],
+                                       RESPONSE_STORE_SETTINGS["interval"])
+
+    body_caps = {}
+    for spec in args.body_cap:
+        probe, _, kb = spec.partition("=")
+        if probe not in BODY_CAPS or not kb.strip().isdigit():
+            parser.error(f"invalid --body-cap '{spec}' (expected PROBE=KB, PROBE one of {', '.join(BODY_CAPS)})")
+        body_caps[probe] = int(kb) * 1024
+    transport_problem = backend_unavailable(args.transport)
+    if transport_problem:
+        parser.error(transport_problem)
+    keyword_tiers = None
+    if args.keywords:
+        try:
+            keyword_tiers = load_keyword_tiers(args.keywords)
+        except (OSError, ValueError) as e:
+            parser.error(f"could not load --keywords {args.keywords}: {e}")
+    for source in args.wordlist:
+        if source != BUILTIN and not os.path.isfile(source):
+            parser.error(f"wordlist not found: {source}")
+    include_categories = [n.strip() for v in args.include_category for n in v.split(",") if n.strip()]
+    exclude_categories = [n.strip() for v in args.exclude_category for n in v.split(",") if n.strip()]
+    report_formats = [n.strip().lower() for v in args.report_format for n in v.split(",") if n.strip()] or ["pdf"]
+    for fmt in report_formats:
+        if fmt not in REPORT_EXTENSIONS:
+            parser.error(f"unknown --report-format '{fmt}' (expected {', '.join(REPORT_EXTENSIONS)})")
 
     if args.disable_ai:
         AI_ENABLED = False
@@ -1059,9 +465,127 @@ if __name__ == "__main__":
     else:
         reason = AI_DISABLED_REASON or "AI disabled"
         print(f"{Colors.YELLOW}⚠️ AI analysis disabled: {reason}{Colors.END}")
-    
-    # Get scan details from user
-    get_scan_details()
 
-    report = asyncio.run(run_full_scan(scan_details["target_url"], args.speed))
-    print(f"{Colors.BOLD}{Colors.GREEN}📄 Report saved to: {report}{Colors.END}")
+    # One scanner for the run; every setting comes from the command line
+    scanner = Scanner(
+        args.speed,
+        Wordlist(args.wordlist, include_categories, exclude_categories),
+        keyword_tiers,
+        rate=dict(
+            adaptive=not args.fixed_rate,
+            min_concurrency=max(1, args.min_concurrency),
+            max_concurrency=max(1, args.max_concurrency) if args.max_concurrency else None,
+            min_delay=max(0.0, args.min_delay) if args.min_delay is not None else None,
+            max_delay=max(0.0, args.max_delay),
+        ),
+        resilience=dict(
+            retries=max(0, args.retries),
+            threshold=max(1, args.breaker_threshold),
+            cooldown=max(0.0, args.breaker_cooldown),
+            abort_on_trip=args.on_host_failure == "abort",
+        ),
+        results=dict(compress=args.results_gzip),
+        analysis=dict(
+            mode=args.analysis_pool,
+            workers=max(0, args.analysis_workers),
+            max_pending=max(0, args.analysis_queue),
+        ),
+        recursion=dict(
+            enabled=args.recursive,
+            max_depth=max(1, args.max_depth),
+            budget=max(0, args.recursion_budget),
+        ),
+        reports=dict(
+            formats=list(dict.fromkeys(report_formats)),
+            pdf_log=args.pdf_log,
+            pdf_full_log_limit=max(0, args.pdf_full_log_limit),
+        ),
+        ai_triage=dict(
+            workers=max(1, args.ai_workers),
+            queue_size=max(1, args.ai_queue),
+            requests_per_minute=args.ai_rpm,
+            tokens_per_minute=args.ai_tpm,
+        ),
+        ai_cache=dict(
+            path="" if args.no_ai_cache else args.ai_cache,
+            ttl_seconds=args.ai_cache_ttl * 24 * 3600,
+            max_entries=max(1, args.ai_cache_size),
+        ),
+        transport=dict(
+            backend=args.transport,
+            http2=not args.no_http2,
+            pool_size=max(0, args.pool_size),
+            keepalive=max(0.0, args.keepalive),
+            dns_ttl=max(0.0, args.dns_ttl),
+            timeout=max(0.0, args.timeout),
+            connect_timeout=max(0.0, args.connect_timeout),
+            read_timeout=max(0.0, args.read_timeout),
+        ),
+        metrics=dict(
+            json=args.metrics_json,
+            prometheus=args.metrics_prometheus,
+            port=max(0, args.metrics_port),
+            interval=max(1.0, args.metrics_interval),
+        ),
+        body_caps=body_caps,
+        file_probe=args.file_probe,
+        # A single target gets the whole limit; batch mode shares --global-limit across --parallel-targets
+        global_limit=max(1, args.global_limit) if args.targets else 0,
+        parallel_targets=max(1, args.parallel_targets) if args.targets else 0,
+        checkpoint=checkpoint,
+        response_store=response_store,
+        ai_client=client if AI_ENABLED else None,
+        ai_model=OPENAI_MODEL,
+        ai_disabled_reason=AI_DISABLED_REASON,
+    )
+
+    if resume_id:
+        targets = resume_targets(checkpoint, batch=bool(args.targets))
+        if not targets:
+            print(f"{Colors.GREEN}✅ Scan {resume_id} is already complete{Colors.END}")
+            sys.exit(0)
+    elif args.targets:
+        targets = load_targets(args.targets, include_full_log=not args.no_full_log)
+    else:
+        # Get scan details from user
+        targets = [get_scan_details()]
+    if not targets:
+        print(f"{Colors.RED}No valid targets found in {args.targets}{Colors.END}")
+        sys.exit(1)
+    if checkpoint is not None and not resume_id:
+        start_checkpoint(checkpoint, targets, sys.argv[1:])
+
+    profiler = Profiler(args.profile) if args.profile else None
+    try:
+        if profiler is not None:
+            profiler.start()
+        if args.targets:
+            asyncio.run(run_batch_scan(scanner, targets, args.output_dir))
+        else:
+            report = asyncio.run(run_full_scan(scanner, targets[0]))
+            print(f"{Colors.BOLD}{Colors.GREEN}📄 Reports saved to: {report}{Colors.END}")
+    except KeyboardInterrupt:
+        print(f"\n{Colors.RED}Scan aborted{Colors.END}")
+        if checkpoint is not None:
+            print(f"{Colors.CYAN}💾 Resume with --resume {checkpoint.scan_id}{Colors.END}")
+        sys.exit(130)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        if checkpoint is not None:
+            checkpoint.close()
+        if response_store is not None:
+            response_store.close()
+    if profiler is not None:
+        # A batch gets one profile for all its targets
+        if args.targets:
+            profile_path = os.path.join(args.output_dir, f"scan_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+        else:
+            profile_path = f"{targets[0].report_base}_profile.txt"
+        profiler.write_report(profile_path, scanner.timer, scanner.metrics,
+                              args.targets or targets[0].scan_details["target_url"])
+        print(f"{Colors.CYAN}⏱️ Profile: {profile_path}{Colors.END}")
+    unfinished = scanner.interrupted or any(scan.interrupted or (scan.breaker and scan.breaker.aborted) for scan in targets)
+    if unfinished and checkpoint is not None:
+        print(f"{Colors.CYAN}💾 Resume with --resume {checkpoint.scan_id}{Colors.END}")
+    sys.exit(0)
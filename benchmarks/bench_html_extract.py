@@ -0,0 +1,102 @@
+# Benchmark: HTML text and script extraction, BeautifulSoup versus html_extract.
+#
+# Builds synthetic HTML pages of a few sizes (nested markup, inline scripts
+# and styles, entities, comments and <script src> tags) and times, per page:
+# the soft-404 text as it was computed before (a BeautifulSoup tree, then
+# get_text), html_extract without and with the soft-404 text limit, and
+# script src discovery both ways. Also checks that both sides agree on the
+# normalized text and the script list.
+#
+#   python benchmarks/bench_html_extract.py [--sizes 20,200,1000] [--repeat 5]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis import SOFT_404_MIN_CHARS  # noqa: E402
+from html_extract import extract, script_srcs, visible_text  # noqa: E402
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+WORDS = ["account", "order", "shipping", "the", "and", "product", "review", "price", "search", "&amp;",
+         "&copy;", "help", "contact", "menu", "cart", "login", "news", "team", "about", "careers"]
+
+
+def make_page(kb: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    parts = ["<!DOCTYPE html><html><head><title>Shop &amp; more</title>",
+             "<style>.a{color:red}.b>p{margin:0}</style>"]
+    parts += [f'<script src="/static/js/chunk-{i}.js"></script>' for i in range(12)]
+    parts.append("</head><body><!-- header -->")
+    size, block = sum(map(len, parts)), 0
+    while size < kb * 1024:
+        block += 1
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40)))
+        piece = (f'<div class="b" id="x{block}"><p>{text}</p><ul><li><a href="/p/{block}">{rng.choice(WORDS)}</a></li>'
+                 f"<li>{rng.choice(WORDS)}</li></ul><span>{block}</span></div>")
+        if block % 25 == 0:
+            piece += f'<script>window.__state{block} = {{"k": "<div>{text}</div>"}};</script>'
+        parts.append(piece)
+        size += len(piece)
+    parts.append('<script src="/static/js/app.js"></script></body></html>')
+    return "".join(parts)
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def bs4_text(content: str) -> str:
+    # analysis._normalize_html_text() before html_extract
+    return normalize(BeautifulSoup(content, "html.parser").get_text(" "))
+
+
+def bs4_scripts(content: str) -> list:
+    return [s["src"] for s in BeautifulSoup(content, "html.parser").find_all("script", src=True)]
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="20,200,1000", help="page sizes in KB, comma-separated (default: 20,200,1000)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement; the best is reported (default: 5)")
+    args = parser.parse_args()
+    if BeautifulSoup is None:
+        print("beautifulsoup4 is not installed; only html_extract is timed")
+
+    for kb in (int(s) for s in args.sizes.split(",")):
+        page = make_page(kb)
+        print(f"{kb} KB page ({len(page)} chars)")
+        rows = [
+            ("html_extract text (full)", lambda: normalize(visible_text(page))),
+            (f"html_extract text ({SOFT_404_MIN_CHARS // 1024}K cap)",
+             lambda: normalize(visible_text(page, SOFT_404_MIN_CHARS))),
+            ("html_extract scripts", lambda: script_srcs(page)),
+            ("html_extract one pass", lambda: extract(page)),
+        ]
+        if BeautifulSoup is not None:
+            rows = [("bs4 text", lambda: bs4_text(page)), ("bs4 scripts", lambda: bs4_scripts(page))] + rows
+        for label, fn in rows:
+            print(f"  {label:<30} {best_of(fn, args.repeat) * 1000:9.2f} ms")
+        if BeautifulSoup is not None:
+            same_text = bs4_text(page) == normalize(visible_text(page))
+            same_scripts = bs4_scripts(page) == script_srcs(page)
+            print(f"  agrees with bs4: text {same_text}, scripts {same_scripts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# Micro-benchmark: keyword scoring throughput on large inputs.
+#
+# Compares the original per-keyword scoring function with KeywordMatcher
+# (both backends when pyahocorasick is installed), on whole strings and on
+# 64 KB streamed chunks, for the built-in keyword tiers and a larger tier set.
+#
+#   python benchmarks/bench_keywords.py [--mb 8]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KeywordMatcher, ahocorasick  # noqa: E402
+
+BUILTIN_TIERS = {
+    "high": ["password", "secret", "api_key", "aws_access_key", "private_key", "credentials"],
+    "medium": ["token", "auth", "key", "user", "email"],
+}
+
+FILLER = ["function", "var", "return", "this", "value", "const", "if", "else", "data", "item", "map", "for", "{", "});"]
+
+
+def legacy_score(content: str, tiers: dict) -> str:
+    # Original score_content_sensitivity(): lowercase, then one `in` scan per keyword
+    content_lower = content.lower()
+    if any(k in content_lower for k in tiers["high"]):
+        return "high"
+    if any(k in content_lower for k in tiers["medium"]):
+        return "medium"
+    return "low"
+
+
+def make_text(size: int, needle: str = "", at: float = 0.5) -> str:
+    rng = random.Random(1)
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(FILLER)
+        parts.append(word)
+        length += len(word) + 1
+    text = " ".join(parts)[:size]
+    if needle:
+        pos = int(len(text) * at)
+        text = text[:pos] + needle + text[pos:]
+    return text
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stream(matcher: KeywordMatcher, text: str, chunk: int = 64 * 1024):
+    s = matcher.stream()
+    for i in range(0, len(text), chunk):
+        if s.feed(text[i:i + chunk]):
+            break
+    return s.score
+
+
+def run_case(label: str, text: str, tiers: dict):
+    mb = len(text) / 1e6
+    rows = [("legacy score_content_sensitivity", lambda: legacy_score(text, tiers))]
+    backends = ["find"] + (["automaton"] if ahocorasick is not None else [])
+    for backend in backends:
+        m = KeywordMatcher(tiers, backend=backend)
+        rows.append((f"{backend}: score()", lambda m=m: m.score(text)))
+        rows.append((f"{backend}: find() with offsets", lambda m=m: m.find(text)))
+        rows.append((f"{backend}: 64KB stream, early stop", lambda m=m: stream(m, text)))
+    print(f"\n{label} ({mb:.1f} MB, {sum(len(v) for v in tiers.values())} keywords)")
+    baseline = None
+    for name, fn in rows:
+        elapsed = best_of(fn)
+        baseline = baseline or elapsed
+        print(f"  {name:<38} {elapsed * 1000:8.1f} ms  {mb / elapsed:8.1f} MB/s  x{baseline / elapsed:5.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=8, help="input size in MB (default: 8)")
+    args = parser.parse_args()
+    size = int(args.mb * 1_000_000)
+
+    rng = random.Random(7)
+    large_tiers = {
+        "high": BUILTIN_TIERS["high"] + [f"secret_{rng.randrange(10**6)}" for _ in range(30)],
+        "medium": BUILTIN_TIERS["medium"] + [f"internal_{rng.randrange(10**6)}" for _ in range(30)],
+    }
+
+    if ahocorasick is None:
+        print("pyahocorasick not installed: only the 'find' backend is measured")
+    run_case("No keywords (clean bundle)", make_text(size), BUILTIN_TIERS)
+    run_case("High keyword near the start (exposed dump)", make_text(size, "DB_PASSWORD=", at=0.02), BUILTIN_TIERS)
+    run_case("Medium keyword at the end", make_text(size, "user", at=0.99), BUILTIN_TIERS)
+    run_case("Large tier set, no keywords", make_text(size), large_tiers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Benchmark: report generation time per renderer on a large synthetic scan.
+#
+# Writes a results file with --paths probe records (mostly 404s, a sprinkling
+# of findings, 403s and errors), then times the one-pass aggregation, each
+# renderer, and the PDF with its full per-path log versus the summarized log.
+# The full PDF log is measured on --full-pdf-paths paths only (it is the slow
+# case the summary replaces) and extrapolated.
+#
+#   python benchmarks/bench_reports.py [--paths 100000] [--full-pdf-paths 10000]
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reporting import RENDERERS, REPORT_EXTENSIONS, ReportData, render_pdf  # noqa: E402
+from result_sink import ResultSink  # noqa: E402
+
+SETTINGS = {"pdf_log": "summary", "pdf_full_log_limit": 2000, "top": 50, "html_page_size": 200}
+
+
+def write_results(path: str, paths: int):
+    rng = random.Random(3)
+    sink = ResultSink(path, flush_interval=60)
+    sink.write({"kind": "scan", "company_name": "Bench", "target_url": "https://example.test/",
+                "scan_date": "2026-01-01 00:00:00", "include_full_log": True})
+    findings = 0
+    for i in range(paths):
+        typ = "directory" if i % 3 == 0 else "file"
+        path_name = f"dir{i // 100}/entry-{i}" + ("" if typ == "directory" else ".php")
+        roll = rng.random()
+        record = {"kind": "probe", "url": f"https://example.test/{path_name}", "path": path_name, "type": typ,
+                  "status": 404, "has_content": False, "vulnerability": "clean"}
+        if roll < 0.001:
+            record.update(status=200, has_content=True, vulnerability="high")
+        elif roll < 0.003:
+            record.update(status=403, vulnerability="medium")
+        elif roll < 0.02:
+            record.update(status=rng.choice([301, 302, 403, 500]))
+        elif roll < 0.025:
+            record.update(status=None, vulnerability="unreached", error="timeout")
+        sink.write(record)
+        if record["vulnerability"] in ("high", "medium"):
+            findings += 1
+            sink.write({"kind": "finding", "id": findings, "level": record["vulnerability"], "url": record["url"],
+                        "notes": "Synthetic finding", "type": typ})
+    sink.write({"kind": "summary", "counters": {"files": paths * 2 // 3, "directories": paths // 3},
+                "paths_scanned": paths, "findings": findings, "interrupted": False, "aborted": False})
+    sink.close()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=100_000, help="probe records in the results file (default: 100000)")
+    parser.add_argument("--full-pdf-paths", type=int, default=10_000,
+                        help="scan size for the full-log PDF measurement (default: 10000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = os.path.join(tmp, "scan.jsonl")
+        write_results(results, args.paths)
+        print(f"{args.paths} paths, results file {os.path.getsize(results) / 1e6:.1f} MB")
+
+        elapsed, data = timed(lambda: ReportData(results))
+        print(f"  {'aggregate (one pass)':<26} {elapsed:8.2f} s")
+        for fmt, render in RENDERERS.items():
+            out = os.path.join(tmp, "report" + REPORT_EXTENSIONS[fmt])
+            elapsed, _ = timed(lambda: render(data, out, SETTINGS))
+            label = f"{fmt} (summary log)" if fmt == "pdf" else fmt
+            print(f"  {label:<26} {elapsed:8.2f} s  {os.path.getsize(out) / 1e6:8.2f} MB")
+
+        small = os.path.join(tmp, "small.jsonl")
+        write_results(small, args.full_pdf_paths)
+        small_data = ReportData(small)
+        out = os.path.join(tmp, "full.pdf")
+        elapsed, _ = timed(lambda: render_pdf(small_data, out, dict(SETTINGS, pdf_log="full")))
+        scale = args.paths / args.full_pdf_paths
+        print(f"  {'pdf (full log)':<26} {elapsed:8.2f} s  {os.path.getsize(out) / 1e6:8.2f} MB"
+              f"  for {args.full_pdf_paths} paths, ~{elapsed * scale:.0f} s / "
+              f"~{os.path.getsize(out) * scale / 1e6:.0f} MB at {args.paths}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# Benchmark: end-to-end scan throughput against a local stand-in target.
+#
+# For each server profile, starts benchmarks/target_server.py in its own
+# process, then scans it once per --speed preset, wordlist size and HTTP
+# transport (see transport.py). Every
+# scan runs in a fresh child process (so peak RSS and CPU time are the
+# scan's own) through the same Scanner the CLI uses, with console output off
+# and AI triage disabled. Per scan it records:
+#
+#   requests/s, p50/p95/p99 request latency, peak RSS (not on Windows),
+#   user/system CPU, and wall and CPU seconds per stage (see timing.py)
+#
+# Results are written as JSON with the commit they were measured on, so two
+# runs can be compared:
+#
+#   python benchmarks/bench_scan.py [--profiles plain,catch-all] [--speeds slow,medium,fast] [--sizes 200,1000]
+#   python benchmarks/bench_scan.py --output after.json --compare before.json
+#   python benchmarks/bench_scan.py --profiles plain,catch-all,slow,throttled --speeds fast --transports aiohttp,httpx
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows: no getrusage, so no peak RSS
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rate_control import SPEED_PRESETS  # noqa: E402
+from transport import BACKENDS, backend_unavailable, http2_available  # noqa: E402
+
+SERVER = os.path.join(ROOT, "benchmarks", "target_server.py")
+
+# target_server.py arguments per profile
+PROFILES = {
+    "plain": ["--latency", "lognormal:20:0.5"],
+    "catch-all": ["--latency", "lognormal:20:0.5", "--catch-all"],
+    "slow": ["--latency", "lognormal:150:0.8", "--drip-every", "3", "--drip-seconds", "2"],
+    "throttled": ["--latency", "fixed:10", "--rate-limit", "100"],
+}
+
+WORDS = ["admin", "backup", "config", "uploads", "old", "test", "api", "static", "db", "logs", "private",
+         "assets", "export", "report", "data", "internal", "legacy", "site", "files", "archive"]
+EXTENSIONS = ["", "", "", "/", ".php", ".html", ".txt", ".js", ".zip", ".sql", ".bak", ".env"]
+
+
+def write_wordlist(path: str, size: int, seed: int = 1):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(size):
+            fh.write(f"{rng.choice(WORDS)}{i}{rng.choice(EXTENSIONS)}\n")
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def scan_case(case: dict) -> dict:
+    from scanner import Scanner, ScanSession
+    from wordlists import Wordlist
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wordlist_path = os.path.join(tmp, "wordlist.txt")
+        write_wordlist(wordlist_path, case["paths"])
+        scanner = Scanner(case["speed"], Wordlist([wordlist_path]), quiet=True,
+                          reports={"formats": case["formats"]}, analysis={"mode": case["analysis"]},
+                          transport={"backend": case["transport"]})
+        scan = ScanSession("Bench", case["url"])
+        before, started = os.times(), time.perf_counter()
+        async with scanner:
+            await scanner.run(scan, tmp)
+        wall = time.perf_counter() - started
+        after = os.times()
+    summary = scanner.timer.summary()
+    rss = peak_rss_mb()
+    return {
+        "wall": round(wall, 3),
+        "requests": summary["requests"],
+        "requests_per_second": round(summary["requests"] / wall, 1) if wall else 0.0,
+        "latency_ms": {k: round(v * 1000, 2) for k, v in summary["latency"].items()},
+        "peak_rss_mb": round(rss, 1) if rss is not None else None,
+        "cpu_user": round(after.user - before.user + after.children_user - before.children_user, 3),
+        "cpu_system": round(after.system - before.system + after.children_system - before.children_system, 3),
+        "bytes_read": summary["bytes_read"],
+        "paths_scanned": scan.paths_scanned,
+        "findings": scan.finding_count,
+        "stages": summary["stages"],
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(profile: str):
+    port = free_port()
+    server = subprocess.Popen([sys.executable, SERVER, "--port", str(port)] + PROFILES[profile],
+                              stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline()
+    if not line.startswith("ready"):
+        server.kill()
+        raise RuntimeError(f"target server for profile '{profile}' did not start")
+    return server, f"http://127.0.0.1:{port}"
+
+
+def run_child(case: dict, timeout: float) -> dict:
+    done = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", json.dumps(case)],
+                          capture_output=True, text=True, timeout=timeout, cwd=ROOT)
+    if done.returncode != 0:
+        raise RuntimeError(done.stderr.strip().splitlines()[-1] if done.stderr.strip() else f"exit {done.returncode}")
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def git_revision() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, cwd=ROOT).stdout.strip()
+        except OSError:
+            return ""
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def case_key(result: dict) -> tuple:
+    # Results from before the transport option were all aiohttp
+    return result["profile"], result["speed"], result["paths"], result.get("transport", "aiohttp")
+
+
+def print_result(result: dict):
+    latency = result["latency_ms"]
+    rss = f"rss {result['peak_rss_mb']:>6.1f} MB  " if result["peak_rss_mb"] is not None else ""
+    print(f"  {result['profile']:<10} {result['speed']:<7} {result['paths']:>6} paths  {result['transport']:<8}"
+          f"{result['requests_per_second']:>8.1f} req/s  p50 {latency['p50']:>7.1f}  p95 {latency['p95']:>7.1f}  "
+          f"p99 {latency['p99']:>7.1f} ms  {rss}"
+          f"cpu {result['cpu_user'] + result['cpu_system']:>6.2f}s  wall {result['wall']:>7.2f}s")
+    ordered = sorted(result["stages"].items(), key=lambda item: -item[1]["wall"])
+    stages = "  ".join(f"{name} {s['wall']:.2f}/{s['cpu']:.2f}s" for name, s in ordered)
+    print(f"  {'':<10} stages (wall/cpu): {stages}")
+
+
+def print_comparison(results: list, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    previous = {case_key(r): r for r in baseline["results"]}
+    print(f"Compared with {baseline_path} ({baseline['meta']['commit'][:10] or 'unknown commit'}):")
+
+    def change(new, old):
+        return f"{(new - old) / old * 100:+.1f}%" if old and new is not None else "n/a"
+
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        print(f"  {result['profile']:<10} {result['speed']:<7} {result['paths']:>6} paths  {result['transport']:<8}"
+              f"req/s {change(result['requests_per_second'], old['requests_per_second'])}  "
+              f"p95 {change(result['latency_ms']['p95'], old['latency_ms']['p95'])}  "
+              f"rss {change(result['peak_rss_mb'], old.get('peak_rss_mb'))}  "
+              f"cpu {change(result['cpu_user'] + result['cpu_system'], old['cpu_user'] + old['cpu_system'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", default="plain,catch-all",
+                        help=f"comma-separated target server profiles ({', '.join(PROFILES)}; default: plain,catch-all)")
+    parser.add_argument("--speeds", default=",".join(SPEED_PRESETS),
+                        help=f"comma-separated --speed presets (default: {','.join(SPEED_PRESETS)})")
+    parser.add_argument("--sizes", default="200,1000", help="comma-separated wordlist sizes (default: 200,1000)")
+    parser.add_argument("--transports", default="aiohttp",
+                        help=f"comma-separated HTTP transports ({', '.join(BACKENDS)}; default: aiohttp)")
+    parser.add_argument("--report-format", default="pdf", help="report formats rendered after each scan (default: pdf)")
+    parser.add_argument("--analysis-pool", default="auto", help="analysis pool mode (default: auto)")
+    parser.add_argument("--timeout", type=float, default=900, help="seconds allowed per scan (default: 900)")
+    parser.add_argument("--output", default="bench_scan.json", help="results file (default: bench_scan.json)")
+    parser.add_argument("--compare", metavar="FILE", help="earlier results file to compare against")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # Child process: one scan, results as a JSON line on stdout
+        print(json.dumps(asyncio.run(scan_case(json.loads(args.case)))))
+        return
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    for profile in profiles:
+        if profile not in PROFILES:
+            parser.error(f"unknown profile '{profile}' (expected {', '.join(PROFILES)})")
+    speeds = [s.strip() for s in args.speeds.split(",") if s.strip()]
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    transports = [t.strip() for t in args.transports.split(",") if t.strip()]
+    for transport in transports:
+        if backend_unavailable(transport):
+            parser.error(backend_unavailable(transport))
+
+    results = []
+    for profile in profiles:
+        server, url = start_server(profile)
+        print(f"{profile}: {' '.join(PROFILES[profile])}")
+        try:
+            for speed in speeds:
+                for size in sizes:
+                    for transport in transports:
+                        case = {"url": url, "speed": speed, "paths": size, "transport": transport,
+                                "formats": args.report_format.split(","), "analysis": args.analysis_pool}
+                        try:
+                            result = dict(profile=profile, speed=speed, paths=size, transport=transport,
+                                          **run_child(case, args.timeout))
+                        except (RuntimeError, subprocess.TimeoutExpired) as e:
+                            print(f"  {profile:<10} {speed:<7} {size:>6} paths  {transport:<8}failed: {e}")
+                            continue
+                        results.append(result)
+                        print_result(result)
+        finally:
+            server.terminate()
+            server.wait()
+
+    meta = dict(git_revision(), date=time.strftime("%Y-%m-%dT%H:%M:%S"), python=platform.python_version(),
+                platform=platform.platform(), cpus=os.cpu_count(), http2=http2_available(),
+                profiles={p: PROFILES[p] for p in profiles})
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump({"meta": meta, "results": results}, fh, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# Micro-benchmark: requests/s and client CPU per request of each transport over TLS.
+#
+# Starts two local HTTPS servers in child processes, one HTTP/1.1 (aiohttp)
+# and one HTTP/2 (a minimal h2 server), and sends the same GETs through
+# transport.py: aiohttp over HTTP/1.1, httpx over HTTP/1.1 and httpx over
+# HTTP/2. CPU is the client process's own, so it is the transport's cost per
+# request. Needs httpx, h2 and trustme (for the test certificates).
+#
+#   python benchmarks/bench_transport.py [--requests 3000] [--concurrency 8,64]
+import argparse
+import asyncio
+import functools
+import multiprocessing
+import os
+import ssl
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transport  # noqa: E402
+
+
+class H2Server(asyncio.Protocol):
+    """Just enough of an HTTP/2 server: every request gets a 200 naming its path"""
+
+    def __init__(self):
+        import h2.config
+        import h2.connection
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self, data):
+        import h2.events
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                body = b"h2 " + dict(event.headers)[b":path"]
+                self.conn.send_headers(event.stream_id, [(":status", "200"), ("content-length", str(len(body)))])
+                self.conn.send_data(event.stream_id, body, end_stream=True)
+        self.transport.write(self.conn.data_to_send())
+
+
+def serve(protocol: str, pem: bytes, ready, port):
+    from aiohttp import web
+
+    async def handler(request):
+        return web.Response(body=b"h1 " + request.path.encode())
+
+    async def main():
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "server.pem")
+            with open(path, "wb") as fh:
+                fh.write(pem)
+            context.load_cert_chain(path)
+        if protocol == "h2":
+            context.set_alpn_protocols(["h2"])
+            server = await asyncio.get_running_loop().create_server(H2Server, "127.0.0.1", 0, ssl=context)
+            port.value = server.sockets[0].getsockname()[1]
+        else:
+            app = web.Application()
+            app.router.add_get("/{tail:.*}", handler)
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=context)
+            await site.start()
+            port.value = site._server.sockets[0].getsockname()[1]
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+async def measure(backend: str, url: str, requests: int, concurrency: int) -> tuple:
+    client = transport.open_transport(backend, pool_size=concurrency, per_host=concurrency, keepalive=15, dns_ttl=300,
+                                      timeout=20, connect_timeout=10, read_timeout=20, headers={})
+    slots = asyncio.Semaphore(concurrency)
+
+    async def get(i):
+        async with slots:
+            async with client.request("GET", f"{url}/p{i}") as response:
+                async for _chunk in response.content.iter_chunked(4096):
+                    pass
+
+    try:
+        # Warm up: open the connections first
+        await asyncio.gather(*(get(i) for i in range(concurrency)))
+        started, cpu = time.perf_counter(), time.process_time()
+        await asyncio.gather(*(get(i) for i in range(requests)))
+        wall, cpu = time.perf_counter() - started, time.process_time() - cpu
+    finally:
+        await client.close()
+    return requests / wall, cpu / requests, client.describe_versions()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=3000, help="GETs per case (default: 3000)")
+    parser.add_argument("--concurrency", default="8,64", help="requests in flight, comma-separated (default: 8,64)")
+    args = parser.parse_args()
+    if not transport.http2_available():
+        sys.exit('httpx with HTTP/2 support is needed: pip install "httpx[http2]"')
+    import aiohttp
+    import httpx
+    import trustme
+
+    ca = trustme.CA()
+    cert = ca.issue_cert("127.0.0.1")
+    client_context = ssl.create_default_context()
+    ca.configure_trust(client_context)
+    # The transports build their own clients; make them trust the test CA
+    transport.aiohttp.TCPConnector = functools.partial(aiohttp.TCPConnector, ssl=client_context)
+    transport.httpx.AsyncClient = functools.partial(httpx.AsyncClient, verify=client_context)
+    pem = b"".join(blob.bytes() for blob in cert.cert_chain_pems) + cert.private_key_pem.bytes()
+
+    urls, servers = {}, []
+    for protocol in ("h1", "h2"):
+        ready, port = multiprocessing.Event(), multiprocessing.Value("i", 0)
+        server = multiprocessing.Process(target=serve, daemon=True, args=(
+            protocol, pem, ready, port))
+        server.start()
+        servers.append(server)
+        ready.wait()
+        urls[protocol] = f"https://127.0.0.1:{port.value}"
+
+    try:
+        for concurrency in [int(n) for n in args.concurrency.split(",")]:
+            print(f"\n{args.requests} GETs, {concurrency} in flight")
+            for backend, protocol in (("aiohttp", "h1"), ("httpx", "h1"), ("httpx", "h2")):
+                rate, cpu, versions = asyncio.run(measure(backend, urls[protocol], args.requests, concurrency))
+                label = f"{backend} {'HTTP/2' if protocol == 'h2' else 'HTTP/1.1'}"
+                print(f"  {label:<16} {rate:8.0f} req/s  {cpu * 1000:6.2f} ms CPU/request  {versions}")
+    finally:
+        for server in servers:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
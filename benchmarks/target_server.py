@@ -0,0 +1,203 @@
+# Stand-in target for scanner benchmarks: a local aiohttp server whose
+# behaviour is set from the command line.
+#
+# Whether a path exists, and what it returns, is decided by a hash of the
+# path, so every run against the same settings sees the same site:
+#
+#   existing pages         HTML, some with medium/high keywords
+#   existing directories   "Index of" listings (--listing-rate of them)
+#   sensitive files        .zip/.sql/.bak/... served as --binary-kb of bytes,
+#                          with Range and HEAD support
+#   slow-drip responses    every --drip-every'th existing page is sent in
+#                          8 chunks spread over --drip-seconds
+#   missing paths          404, or with --catch-all a 200 soft-404 template
+#   rate limiting          --rate-limit N answers 429 (Retry-After: 1) once
+#                          the server is above N requests/s
+#   homepage               links --scripts JS bundles of --bundle-kb each
+#
+# Every response is delayed by a sample of --latency: fixed:MS,
+# uniform:MIN_MS:MAX_MS or lognormal:MEDIAN_MS:SIGMA.
+#
+#   python benchmarks/target_server.py --port 8899 --latency lognormal:20:0.6 --catch-all
+import argparse
+import asyncio
+import math
+import random
+import time
+import zlib
+
+from aiohttp import web
+
+# Extensions served as binary downloads (a subset of the scanner's suspicious extensions)
+BINARY_EXTENSIONS = ("zip", "tar", "gz", "sql", "sqlite", "db", "bak", "backup", "7z", "rar")
+
+DRIP_CHUNKS = 8
+
+VOCABULARY = ["order", "account", "invoice", "shipping", "catalog", "review", "price", "stock", "gallery",
+              "warranty", "newsletter", "support", "release", "changelog", "profile", "billing", "region"]
+
+
+def parse_latency(spec: str):
+    """A function returning one latency sample in seconds"""
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(v) for v in params.split(":")]
+    except ValueError:
+        values = []
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0] / 1000, values[1] / 1000)
+    if kind == "lognormal" and len(values) == 2 and values[0] > 0:
+        mu = math.log(values[0] / 1000)
+        return lambda: random.lognormvariate(mu, values[1])
+    raise ValueError(f"invalid latency '{spec}' (fixed:MS, uniform:MIN_MS:MAX_MS or lognormal:MEDIAN_MS:SIGMA)")
+
+
+def path_hash(path: str, salt: str = "") -> float:
+    """Stable value in [0, 1) for a path"""
+    return zlib.crc32((salt + path).encode()) / 2 ** 32
+
+
+def chrome(title: str, body: str) -> str:
+    # Site navigation and footer around every page, so pages share a realistic template
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+    footer = " ".join(f"Footer link {i} about our shop, delivery and returns." for i in range(60))
+    return (f"<!DOCTYPE html><html><head><title>{title}</title><style>.nav{{display:flex}}</style></head>"
+            f"<body><ul class=\"nav\">{nav}</ul><main>{body}</main><footer>{footer}</footer></body></html>")
+
+
+def page_text(path: str, words: int = 500) -> str:
+    # Text of its own, so a real page does not look like the soft-404 template
+    rng = random.Random(path)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+class TargetSite:
+    def __init__(self, args):
+        self.args = args
+        self.latency = parse_latency(args.latency)
+        self.binary = random.Random(7).randbytes(args.binary_kb * 1024)
+        bundle_line = "function render(a){return a.map(function(x){return x.value*2})};\n"
+        self.bundle = (bundle_line * (args.bundle_kb * 1024 // len(bundle_line) + 1))[:args.bundle_kb * 1024]
+        # Rate limiting: a token bucket refilled at --rate-limit tokens per second
+        self.tokens = float(args.rate_limit)
+        self.refilled = time.monotonic()
+        self.requests = 0
+
+    def allow(self) -> bool:
+        if not self.args.rate_limit:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.args.rate_limit, self.tokens + (now - self.refilled) * self.args.rate_limit)
+        self.refilled = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        await asyncio.sleep(self.latency())
+        if not self.allow():
+            return web.Response(status=429, headers={"Retry-After": "1"}, text="Too many requests")
+        path = request.path
+        if path == "/":
+            scripts = "".join(f'<script src="/static/js/bundle-{i}.js"></script>' for i in range(self.args.scripts))
+            return web.Response(text=chrome("Shop", f"{scripts}<h1>Welcome</h1>"), content_type="text/html")
+        if path.startswith("/static/js/bundle-"):
+            body = self.bundle + ("\nvar api_key = 'bench';\n" if path.endswith("-0.js") else "")
+            return web.Response(text=body, content_type="application/javascript")
+        if path_hash(path) >= self.args.hit_rate:
+            if self.args.catch_all:
+                page = chrome("Shop", f"<h1>Sorry, there is nothing at {path}</h1><p>Try the search box above.</p>")
+                return web.Response(text=page, content_type="text/html")
+            return web.Response(status=404, text="Not Found")
+
+        name = path.rstrip("/").rsplit("/", 1)[-1]
+        extension = name.rpartition(".")[2].lower() if "." in name else ""
+        if extension in BINARY_EXTENSIONS:
+            return self.binary_response(request)
+        if not extension and path_hash(path, "listing") < self.args.listing_rate:
+            links = "".join(f'<a href="{name}/file{i}.txt">file{i}.txt</a>\n' for i in range(50))
+            return web.Response(text=f"<html><head><title>Index of {path}</title></head><body><h1>Index of {path}</h1>"
+                                     f"<pre>{links}</pre></body></html>", content_type="text/html")
+        kind = path_hash(path, "content")
+        text = "password=hunter2" if kind < 0.1 else "user token" if kind < 0.3 else "Our products"
+        page = chrome(name, f"<h1>{name}</h1><p>{text}</p><p>{page_text(path)}</p>")
+        if self.args.drip_every and int(path_hash(path, "drip") * 2 ** 32) % self.args.drip_every == 0:
+            return await self.drip(request, page.encode())
+        return web.Response(text=page, content_type="text/html")
+
+    def binary_response(self, request: web.Request) -> web.Response:
+        body = self.binary
+        headers = {"Content-Type": "application/octet-stream", "Accept-Ranges": "bytes"}
+        range_header = request.headers.get("Range", "")
+        if range_header.startswith("bytes=0-"):
+            end = min(int(range_header[8:] or len(body) - 1), len(body) - 1)
+            headers["Content-Range"] = f"bytes 0-{end}/{len(body)}"
+            return web.Response(status=206, body=body[:end + 1], headers=headers)
+        return web.Response(body=body, headers=headers)
+
+    async def drip(self, request: web.Request, body: bytes) -> web.StreamResponse:
+        resp = web.StreamResponse(headers={"Content-Type": "text/html"})
+        resp.content_length = len(body)
+        await resp.prepare(request)
+        step = len(body) // DRIP_CHUNKS + 1
+        try:
+            for start in range(0, len(body), step):
+                await resp.write(body[start:start + step])
+                await asyncio.sleep(self.args.drip_seconds / DRIP_CHUNKS)
+            await resp.write_eof()
+        except ConnectionResetError:
+            # The scanner stops reading once a keyword decides the verdict
+            pass
+        return resp
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Stand-in target server for scanner benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--latency", default="fixed:0",
+                        help="Per-response delay: fixed:MS, uniform:MIN_MS:MAX_MS or lognormal:MEDIAN_MS:SIGMA (default: fixed:0)")
+    parser.add_argument("--hit-rate", type=float, default=0.05, help="Share of paths that exist (default: 0.05)")
+    parser.add_argument("--catch-all", action="store_true", help="Answer missing paths with a 200 soft-404 page")
+    parser.add_argument("--rate-limit", type=float, default=0, metavar="RPS",
+                        help="Answer 429 above this many requests per second (default: off)")
+    parser.add_argument("--binary-kb", type=int, default=4096, help="Size of sensitive file downloads (default: 4096)")
+    parser.add_argument("--drip-every", type=int, default=10, metavar="N",
+                        help="Every Nth existing page is a slow-drip response; 0 = none (default: 10)")
+    parser.add_argument("--drip-seconds", type=float, default=1.0, help="Duration of a slow-drip response (default: 1)")
+    parser.add_argument("--listing-rate", type=float, default=0.5,
+                        help="Share of existing directories that return a listing (default: 0.5)")
+    parser.add_argument("--scripts", type=int, default=10, help="JS bundles linked from the homepage (default: 10)")
+    parser.add_argument("--bundle-kb", type=int, default=200, help="Size of each JS bundle (default: 200)")
+    return parser
+
+
+async def start_server(args) -> web.AppRunner:
+    site = TargetSite(args)
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", site.handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    return runner
+
+
+async def serve(args):
+    runner = await start_server(args)
+    # The benchmark harness waits for this line
+    print(f"ready http://{args.host}:{args.port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(build_parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,153 @@
+# Checkpoints for resuming interrupted scans.
+#
+# A scan is registered in a local SQLite file under a scan id, with the
+# command-line arguments it was started with and its targets (details, output
+# file names, soft-404 baseline and how far each one got). Every result record
+# of a completed path is added as the scan goes; records are buffered and
+# written in one transaction per batch, so the hot path only appends to a list.
+#
+# `--resume <scan-id>` re-runs the same arguments, rewrites each unfinished
+# target's results file from its checkpointed records and skips the paths
+# that are already done. Probes that got no answer (unreached, rate limited,
+# aborted) are not completed work and are tried again.
+import json
+import secrets
+import sqlite3
+import time
+from datetime import datetime
+from typing import Optional
+
+# Probe outcomes that are retried on resume instead of being checkpointed
+RETRY_OUTCOMES = ("unreached", "rate-limited", "aborted")
+
+# Target phases: not started, scanning wordlist paths (JS analysis runs alongside), finishing JS analysis, finished
+PHASES = ("pending", "paths", "js", "done")
+
+
+def new_scan_id() -> str:
+    return datetime.now().strftime("%Y%m%d-%H%M%S-") + secrets.token_hex(2)
+
+
+class Checkpoint:
+    def __init__(self, path: str, scan_id: str, batch_size: int = 500, interval: float = 5.0):
+        self.path = path
+        self.scan_id = scan_id
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.pending = []
+        self.last_commit = time.monotonic()
+        self.db = sqlite3.connect(path)
+        # Same trade-off as the AI verdict cache: WAL, no fsync per commit
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS scans ("
+            " scan_id TEXT PRIMARY KEY, created REAL NOT NULL, argv TEXT NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS targets ("
+            " scan_id TEXT NOT NULL, target_id INTEGER NOT NULL, details TEXT NOT NULL,"
+            " report_base TEXT NOT NULL DEFAULT '', results_path TEXT NOT NULL DEFAULT '',"
+            " baseline TEXT, phase TEXT NOT NULL DEFAULT 'pending', PRIMARY KEY (scan_id, target_id))"
+        )
+        # kind/key/url/ref are copied out of the record so resume can filter without parsing JSON
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " scan_id TEXT NOT NULL, target_id INTEGER NOT NULL, kind TEXT NOT NULL, key TEXT,"
+            " url TEXT, ref INTEGER, record TEXT NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS records_target ON records (scan_id, target_id, kind, url)")
+        self.db.commit()
+
+    # Scan and targets
+
+    def start(self, argv: list, targets: list):
+        """Register a new scan; `targets` are the scan_details dicts, in order"""
+        self.db.execute("INSERT INTO scans (scan_id, created, argv) VALUES (?, ?, ?)",
+                        (self.scan_id, time.time(), json.dumps(argv)))
+        self.db.executemany(
+            "INSERT INTO targets (scan_id, target_id, details) VALUES (?, ?, ?)",
+            [(self.scan_id, i, json.dumps(details, default=str)) for i, details in enumerate(targets)],
+        )
+        self.db.commit()
+
+    def argv(self) -> Optional[list]:
+        row = self.db.execute("SELECT argv FROM scans WHERE scan_id = ?", (self.scan_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def targets(self) -> list:
+        """Stored targets in order, as dicts with target_id, details, report_base, results_path, baseline, phase"""
+        rows = self.db.execute(
+            "SELECT target_id, details, report_base, results_path, baseline, phase FROM targets"
+            " WHERE scan_id = ? ORDER BY target_id",
+            (self.scan_id,),
+        ).fetchall()
+        return [
+            {"target_id": target_id, "details": json.loads(details), "report_base": report_base,
+             "results_path": results_path, "baseline": baseline, "phase": phase}
+            for target_id, details, report_base, results_path, baseline, phase in rows
+        ]
+
+    def set_output(self, target_id: int, report_base: str, results_path: str):
+        self._update_target(target_id, "report_base = ?, results_path = ?", (report_base, results_path))
+
+    def set_baseline(self, target_id: int, fingerprint: Optional[tuple]):
+        # NULL = not measured yet; JSON null = measured, the target has no soft-404 page
+        self._update_target(target_id, "baseline = ?", (json.dumps(list(fingerprint) if fingerprint else None),))
+
+    def set_phase(self, target_id: int, phase: str):
+        self._update_target(target_id, "phase = ?", (phase,))
+
+    def _update_target(self, target_id: int, assignments: str, values: tuple):
+        # Flushes pending records first so the target row never runs ahead of them
+        self.flush()
+        self.db.execute(f"UPDATE targets SET {assignments} WHERE scan_id = ? AND target_id = ?",
+                        values + (self.scan_id, target_id))
+        self.db.commit()
+
+    # Result records
+
+    def add(self, target_id: int, record: dict, key: Optional[str] = None):
+        """Buffer a result record; `key` marks the probe record that completes a path"""
+        kind = record.get("kind", "")
+        if kind == "probe" and record.get("vulnerability") in RETRY_OUTCOMES:
+            return
+        ref = record.get("id") if kind in ("finding", "notes") else None
+        self.pending.append((self.scan_id, target_id, kind, key if kind == "probe" else None,
+                             record.get("url"), ref, json.dumps(record, separators=(",", ":"), default=str)))
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_commit >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.db.executemany(
+                "INSERT INTO records (scan_id, target_id, kind, key, url, ref, record) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self.pending,
+            )
+            self.db.commit()
+            self.pending = []
+        self.last_commit = time.monotonic()
+
+    def replay(self, target_id: int):
+        """Yield (key, record) for a target's checkpointed records in the order they were written.
+        A finding whose probe never made it into the checkpoint is dropped: the path is probed again."""
+        self.flush()
+        rows = self.db.execute(
+            "SELECT key, record FROM records WHERE scan_id = ? AND target_id = ? AND (kind != 'finding' OR url IN"
+            " (SELECT url FROM records WHERE scan_id = ? AND target_id = ? AND kind = 'probe')) ORDER BY rowid",
+            (self.scan_id, target_id, self.scan_id, target_id),
+        )
+        for key, record in rows:
+            yield key, json.loads(record)
+
+    def last_finding_id(self, target_id: int) -> int:
+        # Includes dropped findings, so their late AI notes can never attach to a new finding
+        row = self.db.execute(
+            "SELECT MAX(ref) FROM records WHERE scan_id = ? AND target_id = ? AND kind = 'finding'",
+            (self.scan_id, target_id),
+        ).fetchone()
+        return row[0] or 0
+
+    def close(self):
+        self.flush()
+        self.db.close()
@@ -0,0 +1,80 @@
+# Crawl frontier for recursive discovery.
+#
+# When a probe confirms a directory (a 200 that is not a soft 404, or a
+# 401/403), the wordlist's names are queued as children beneath it, down to a
+# maximum depth. Children are never materialized up front: each confirmed
+# directory is one cursor over the wordlist names in a heap, ordered by how
+# promising the directory is (sensitive before other directories, 200 before
+# 401/403, shallow before deep), and children are drawn from the best cursor
+# as the scheduler makes room for them. Every path, from the wordlist or the
+# frontier, is deduplicated on its normalized key, and a per-target budget
+# caps how many children are probed in total.
+import heapq
+import itertools
+
+from wordlists import SeenKeys, normalize_path_key
+
+
+class Frontier:
+    def __init__(self, names, classify, max_depth: int = 2, budget: int = 2000, skip=None):
+        """`names()` returns a fresh iterable of child names, `classify(path)` a PathInfo;
+        `skip(key)` is True for paths finished before a resume (they still count against the budget)"""
+        self.names = names
+        self.classify = classify
+        self.max_depth = max_depth
+        self.budget = max(0, budget)
+        self.skip = skip or (lambda key: False)
+        self.seen = SeenKeys()
+        # Depth of each released child until it is probed; wordlist entries are depth 0
+        self.depths = {}
+        self.released = 0
+        self.expanded = 0
+        self._cursors = []
+        self._sequence = itertools.count()
+
+    def admit(self, path: str) -> bool:
+        """Register a wordlist path about to be probed; False if it is already known"""
+        return self.seen.add(normalize_path_key(path))
+
+    def expand(self, info, status: int, depth: int) -> bool:
+        """Queue the children of a confirmed directory; False if it is too deep or the budget is spent"""
+        if depth >= self.max_depth or self.exhausted:
+            return False
+        rank = (0 if info.sensitive else 2) + (0 if status == 200 else 1)
+        parent = info.path.strip("/") + "/"
+        heapq.heappush(self._cursors, (rank, depth + 1, next(self._sequence), parent, iter(self.names())))
+        self.expanded += 1
+        return True
+
+    @property
+    def exhausted(self) -> bool:
+        return self.released >= self.budget
+
+    @property
+    def unexplored(self) -> int:
+        """Directories whose children were not all queued (budget spent or scan stopped)"""
+        return len(self._cursors)
+
+    def pop(self):
+        """Next child to probe (a PathInfo), or None if there is none right now"""
+        while self._cursors and not self.exhausted:
+            rank, depth, sequence, parent, names = self._cursors[0]
+            for name in names:
+                path = parent + name
+                key = normalize_path_key(path)
+                if not self.seen.add(key):
+                    continue
+                self.released += 1
+                if self.skip(key):
+                    if self.exhausted:
+                        break
+                    continue
+                self.depths[key] = depth
+                return self.classify(path)
+            else:
+                heapq.heappop(self._cursors)
+        return None
+
+    def depth(self, path: str) -> int:
+        """Depth of a path about to be probed (0 for wordlist entries)"""
+        return self.depths.pop(normalize_path_key(path), 0)
@@ -0,0 +1,143 @@
+# Lightweight HTML extraction for the per-probe hot paths.
+#
+# The soft-404 check only needs a page's visible text, and JS discovery only
+# needs its <script src> values. Both used to build a full BeautifulSoup tree
+# per response. extract() runs the stdlib tokenizer (html.parser.HTMLParser)
+# once over the page instead, without building a DOM, and collects the
+# visible text (up to a character limit), script srcs and link hrefs in the
+# same pass. Once the text limit is reached and nothing else is wanted, it
+# stops reading the page.
+#
+# The text matches BeautifulSoup's get_text(" "): script, style and template
+# contents, ruby annotations (rt/rp), comments and declarations are left out,
+# CDATA sections are kept and character references are decoded (compared in
+# benchmarks/bench_html_extract.py).
+from html.parser import HTMLParser
+from typing import NamedTuple, Optional
+
+# Elements whose text is not visible page text
+HIDDEN_TEXT_TAGS = frozenset(("script", "style", "template", "rt", "rp"))
+
+# The page is fed to the tokenizer in slices so extraction can stop early
+FEED_CHARS = 16 * 1024
+
+
+class PageExtract(NamedTuple):
+    text: str            # visible text pieces joined by spaces (not normalized)
+    scripts: list        # <script src> values, in order
+    links: list          # <a href> / <link href> values, in order
+
+
+class _Extractor(HTMLParser):
+    def __init__(self, text_limit: Optional[int], scripts: bool, links: bool):
+        super().__init__(convert_charrefs=True)
+        self.text_limit = text_limit
+        self.want_scripts = scripts
+        self.want_links = links
+        self.pieces = []
+        self.text_chars = 0
+        self.scripts = []
+        self.links = []
+        # Open hidden-text elements, innermost last; text is kept only while there are none
+        self.hidden = []
+        # The last event was text: a string cut at a feed boundary continues the last piece
+        self.in_text = False
+
+    @property
+    def done(self) -> bool:
+        """Nothing more to collect: the text is full and no srcs or hrefs are wanted"""
+        return (self.text_limit is not None and self.text_chars >= self.text_limit
+                and not self.want_scripts and not self.want_links)
+
+    def handle_starttag(self, tag, attrs):
+        self.in_text = False
+        if tag in HIDDEN_TEXT_TAGS:
+            self.hidden.append(tag)
+            if tag == "script" and self.want_scripts:
+                src = _attribute(attrs, "src")
+                if src is not None:
+                    self.scripts.append(src)
+        elif self.want_links and tag in ("a", "link"):
+            href = _attribute(attrs, "href")
+            if href is not None:
+                self.links.append(href)
+
+    def handle_startendtag(self, tag, attrs):
+        # <script src="..."/> opens nothing; the tokenizer still reports it here
+        self.in_text = False
+        if tag == "script" and self.want_scripts:
+            src = _attribute(attrs, "src")
+            if src is not None:
+                self.scripts.append(src)
+        elif self.want_links and tag in ("a", "link"):
+            href = _attribute(attrs, "href")
+            if href is not None:
+                self.links.append(href)
+
+    def handle_endtag(self, tag):
+        self.in_text = False
+        # An end tag closes everything opened after its start tag, as in BeautifulSoup's tree
+        if tag in self.hidden:
+            del self.hidden[len(self.hidden) - 1 - self.hidden[::-1].index(tag):]
+        elif tag == "ruby":
+            # </rt> and </rp> may be omitted
+            while self.hidden and self.hidden[-1] in ("rt", "rp"):
+                self.hidden.pop()
+
+    def handle_comment(self, data):
+        self.in_text = False
+
+    def handle_decl(self, decl):
+        self.in_text = False
+
+    def handle_pi(self, data):
+        self.in_text = False
+
+    def unknown_decl(self, data):
+        self.in_text = False
+        # <![CDATA[...]]> sections are text to BeautifulSoup
+        if data.startswith("CDATA["):
+            self.handle_data(data[6:])
+            self.in_text = False
+
+    def handle_data(self, data):
+        if self.hidden or (self.text_limit is not None and self.text_chars >= self.text_limit):
+            return
+        if self.in_text:
+            self.pieces[-1] += data
+        else:
+            self.pieces.append(data)
+            self.in_text = True
+        self.text_chars += len(data)
+
+
+def _attribute(attrs, name: str) -> Optional[str]:
+    # Like BeautifulSoup: the last of repeated attributes wins, and a bare one (<script src>) is ""
+    found = None
+    for key, value in attrs:
+        if key == name:
+            found = value if value is not None else ""
+    return found
+
+
+def extract(content: str, text_limit: Optional[int] = None, scripts: bool = True, links: bool = True) -> PageExtract:
+    """Visible text (at most about `text_limit` chars), script srcs and link hrefs of an HTML page, in one pass"""
+    parser = _Extractor(text_limit, scripts, links)
+    for start in range(0, len(content), FEED_CHARS):
+        parser.feed(content[start:start + FEED_CHARS])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    text = " ".join(parser.pieces)
+    if text_limit is not None:
+        text = text[:text_limit]
+    return PageExtract(text, parser.scripts, parser.links)
+
+
+def visible_text(content: str, limit: Optional[int] = None) -> str:
+    return extract(content, limit, scripts=False, links=False).text
+
+
+def script_srcs(content: str) -> list:
+    return extract(content, 0, scripts=True, links=False).scripts
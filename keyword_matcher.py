@@ -0,0 +1,145 @@
+# Compiled multi-keyword matcher for content sensitivity scoring.
+#
+# Keyword tiers are compiled once. Matching reports which keywords occurred and
+# where (first character offset of each), works on whole strings or on chunks
+# streamed in one after another (keywords split across a chunk boundary are
+# still found), and can stop as soon as a keyword from the most severe tier
+# is seen.
+#
+# Two backends:
+#   - "automaton": an Aho-Corasick automaton (optional `pyahocorasick` package);
+#     one pass over the text regardless of how many keywords there are.
+#   - "find": one C-level str.find() per keyword still missing. For small
+#     keyword sets this beats both the automaton and a combined regex in
+#     CPython (see benchmarks/bench_keywords.py), so it is used below
+#     AUTOMATON_MIN_KEYWORDS even when pyahocorasick is installed.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Below this many keywords, per-keyword str.find() is faster than the automaton
+AUTOMATON_MIN_KEYWORDS = 24
+
+
+class KeywordMatcher:
+    def __init__(self, tiers: dict, backend: str = "auto"):
+        """`tiers` maps tier name -> keywords, most severe tier first (e.g. {"high": [...], "medium": [...]})"""
+        self.tiers = list(tiers)
+        self.keyword_tier = {}
+        for tier, keywords in tiers.items():
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                # A keyword listed in two tiers counts for the more severe one
+                if keyword and keyword not in self.keyword_tier:
+                    self.keyword_tier[keyword] = tier
+        if not self.keyword_tier:
+            raise ValueError("at least one keyword is required")
+        # Most severe tier first so searches can stop early; configured order within a tier
+        rank = {tier: i for i, tier in enumerate(self.tiers)}
+        self.keywords = sorted(self.keyword_tier, key=lambda k: rank[self.keyword_tier[k]])
+        self.tier_keywords = {tier: [k for k in self.keywords if self.keyword_tier[k] == tier] for tier in self.tiers}
+        self.max_len = max(len(k) for k in self.keywords)
+
+        if backend == "auto":
+            use_automaton = ahocorasick is not None and len(self.keywords) >= AUTOMATON_MIN_KEYWORDS
+            backend = "automaton" if use_automaton else "find"
+        if backend == "automaton":
+            if ahocorasick is None:
+                raise ValueError("the automaton backend needs the pyahocorasick package")
+            self.automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+        elif backend != "find":
+            raise ValueError(f"unknown backend '{backend}'")
+        self.backend = backend
+
+    def _search(self, text: str, found: dict, base: int, skip_before: int, stop_at_top: bool):
+        """Record the first offset of each keyword in lowercased `text` not already in `found`.
+        Matches ending before `skip_before` were seen in an earlier chunk."""
+        top = self.tiers[0]
+        if self.backend == "automaton":
+            for end, keyword in self.automaton.iter(text):
+                if end < skip_before or keyword in found:
+                    continue
+                found[keyword] = base + end - len(keyword) + 1
+                if stop_at_top and self.keyword_tier[keyword] == top:
+                    return
+            return
+        for keyword in self.keywords:
+            if keyword in found:
+                continue
+            index = text.find(keyword)
+            if index != -1:
+                found[keyword] = base + index
+                if stop_at_top and self.keyword_tier[keyword] == top:
+                    return
+
+    def find(self, text: str, stop_at_top: bool = False) -> list:
+        """Return [(keyword, tier, offset)] for the first occurrence of each keyword, in text order"""
+        found = {}
+        self._search(text.lower(), found, 0, 0, stop_at_top)
+        return self._as_matches(found)
+
+    def _as_matches(self, found: dict) -> list:
+        return sorted(((k, self.keyword_tier[k], offset) for k, offset in found.items()), key=lambda m: m[2])
+
+    def tier_of(self, keywords) -> str:
+        """Most severe tier among matched keywords, or "low" when nothing matched"""
+        matched = {self.keyword_tier[k] for k in keywords}
+        for tier in self.tiers:
+            if tier in matched:
+                return tier
+        return "low"
+
+    def score(self, text: str) -> str:
+        """Tier only; stops at the first keyword of the most severe matching tier"""
+        text = text.lower()
+        if self.backend == "find":
+            for tier in self.tiers:
+                if any(k in text for k in self.tier_keywords[tier]):
+                    return tier
+            return "low"
+        found = {}
+        self._search(text, found, 0, 0, stop_at_top=True)
+        return self.tier_of(found)
+
+    def stream(self, min_chars: int = 0) -> "KeywordStream":
+        return KeywordStream(self, min_chars)
+
+
+class KeywordStream:
+    """Incremental matcher for a body that arrives in chunks"""
+
+    def __init__(self, matcher: KeywordMatcher, min_chars: int = 0):
+        self.matcher = matcher
+        # A top-tier match only ends the read once this much text has been seen
+        self.min_chars = min_chars
+        self.reset()
+
+    def reset(self):
+        """Forget everything fed so far (e.g. before the body is fetched again)"""
+        self.chars_seen = 0
+        self.found = {}
+        self.score = "low"
+        self._tail = ""
+
+    def feed(self, text: str) -> bool:
+        """Match the next chunk; returns True once the verdict is decisive and reading can stop"""
+        matcher = self.matcher
+        top = matcher.tiers[0]
+        if self.score != top:
+            # Prefix the end of the previous chunk so keywords split across the boundary are found
+            window = self._tail + text.lower()
+            base = self.chars_seen - len(self._tail)
+            matcher._search(window, self.found, base, len(self._tail), stop_at_top=True)
+            self.score = matcher.tier_of(self.found)
+            self._tail = window[-(matcher.max_len - 1):] if matcher.max_len > 1 else ""
+        self.chars_seen += len(text)
+        return self.score == top and self.chars_seen >= self.min_chars
+
+    @property
+    def matches(self) -> list:
+        """[(keyword, tier, offset)] for the first occurrence of each keyword seen so far"""
+        return self.matcher._as_matches(self.found)
@@ -0,0 +1,344 @@
+# Per-request timing: where a scan's time goes.
+#
+# Every request is split into phases:
+#
+#   throttle   waiting on the host's rate controller (slot, pacing delay, pauses)
+#   queue      waiting on the scanner's global request limit
+#   pool       waiting for a free connection in aiohttp's connector
+#   dns        resolving the host (0 on a DNS cache hit)
+#   connect    TCP connect, plus the TLS handshake for https (aiohttp times them together)
+#   ttfb       request headers sent -> response headers received
+#   download   response headers -> the end of our (capped) read
+#   total      all of the above
+#
+# The pool, dns, connect and ttfb phases come from an aiohttp.TraceConfig, or
+# from httpcore's trace events with the httpx transport (where the pool wait
+# lasts until the first event, and DNS is part of connect). The scanner passes a
+# RequestTiming as each request's trace context and adds the throttle, queue
+# and download phases itself. Phases feed fixed-bucket
+# histograms per (host, probe type), so memory does not grow with the number
+# of requests. Only the slowest requests of each host are kept individually.
+# The numbers can be exported as a JSON summary, as a Prometheus text file
+# rewritten during the scan, or from a local /metrics endpoint.
+import asyncio
+import bisect
+import heapq
+import itertools
+import json
+import os
+import time
+
+import aiohttp
+from aiohttp import web
+
+PHASES = ("throttle", "queue", "pool", "dns", "connect", "ttfb", "download", "total")
+
+# Histogram upper bounds in seconds (Prometheus style; the last bucket is +Inf)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram"):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> float:
+        """Estimate from the buckets, interpolating within one (as Prometheus' histogram_quantile)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = BUCKETS[i - 1] if i else 0.0
+                if i == len(BUCKETS):
+                    return lower
+                return lower + (BUCKETS[i] - lower) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+        }
+
+
+# httpcore trace events -> (phase, True at its start / False at its end); TLS counts as connect,
+# as it does with aiohttp
+HTTPCORE_EVENTS = {
+    "connection.connect_tcp.started": ("connect", True),
+    "connection.connect_tcp.complete": ("connect", False),
+    "connection.start_tls.started": ("connect", True),
+    "connection.start_tls.complete": ("connect", False),
+}
+for _version in ("http11", "http2"):
+    HTTPCORE_EVENTS[f"{_version}.send_request_headers.started"] = ("ttfb", True)
+    HTTPCORE_EVENTS[f"{_version}.receive_response_headers.complete"] = ("ttfb", False)
+
+
+class RequestTiming:
+    """Trace context of one request (and its retries to other URLs, e.g. the HTTP fallback)"""
+    __slots__ = ("pool", "dns", "connect", "ttfb", "started", "headers_at")
+
+    def __init__(self):
+        self.pool = self.dns = self.connect = self.ttfb = 0.0
+        # Phase -> when it started; phases nest (DNS resolution happens inside connection setup)
+        self.started = {}
+        # When the last response's headers arrived; the download is timed from here
+        self.headers_at = None
+
+    def begin(self, phase: str):
+        self.started[phase] = time.monotonic()
+
+    def end(self, phase: str):
+        now = time.monotonic()
+        setattr(self, phase, getattr(self, phase) + now - self.started.pop(phase, now))
+        if phase == "ttfb":
+            self.headers_at = now
+
+    async def httpcore_trace(self, event: str, info: dict):
+        """The `trace` request extension of httpx"""
+        step = HTTPCORE_EVENTS.get(event)
+        if step is None:
+            return
+        if "pool" in self.started:
+            # The transport began the pool phase; the first event means a connection was assigned
+            self.end("pool")
+        phase, starting = step
+        if starting:
+            self.begin(phase)
+        else:
+            self.end(phase)
+
+
+def _timing(trace_config_ctx):
+    timing = trace_config_ctx.trace_request_ctx
+    return timing if isinstance(timing, RequestTiming) else None
+
+
+def _phase_start(phase: str):
+    async def handler(session, trace_config_ctx, params):
+        timing = _timing(trace_config_ctx)
+        if timing is not None:
+            timing.begin(phase)
+    return handler
+
+
+def _phase_end(phase: str):
+    async def handler(session, trace_config_ctx, params):
+        timing = _timing(trace_config_ctx)
+        if timing is not None:
+            timing.end(phase)
+    return handler
+
+
+def format_seconds(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ScanMetrics:
+    def __init__(self, slowest: int = 10):
+        # (host, probe) -> {phase: Histogram}
+        self.histograms = {}
+        # (host, probe) -> [requests, response bytes]
+        self.totals = {}
+        # (host, status class) -> requests; "error" when there was no response
+        self.statuses = {}
+        # host -> min-heap of the slowest requests (total, order, url, probe, status, phases)
+        self.slowest = {}
+        self.keep_slowest = slowest
+        # Breaks ties between equally slow requests, so the heap never compares the rest
+        self._order = itertools.count()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        config = aiohttp.TraceConfig()
+        config.on_connection_queued_start.append(_phase_start("pool"))
+        config.on_connection_queued_end.append(_phase_end("pool"))
+        config.on_dns_resolvehost_start.append(_phase_start("dns"))
+        config.on_dns_resolvehost_end.append(_phase_end("dns"))
+        config.on_connection_create_start.append(_phase_start("connect"))
+        config.on_connection_create_end.append(_phase_end("connect"))
+        # A redirect ends one hop's wait for headers; the next hop starts with its own headers
+        config.on_request_headers_sent.append(_phase_start("ttfb"))
+        config.on_request_redirect.append(_phase_end("ttfb"))
+        config.on_request_end.append(_phase_end("ttfb"))
+        return config
+
+    def record(self, host: str, probe: str, url: str, status, bytes_read: int, throttle: float, queue: float,
+               timing: RequestTiming, finished: float, started: float):
+        """One request: `started` is when it left the queue, `finished` the end of the read (monotonic)"""
+        download = finished - timing.headers_at if timing.headers_at is not None else 0.0
+        phases = {
+            "throttle": throttle,
+            "queue": queue,
+            "pool": timing.pool,
+            "dns": timing.dns,
+            # aiohttp resolves the host while it creates the connection
+            "connect": max(0.0, timing.connect - timing.dns),
+            "ttfb": timing.ttfb,
+            "download": download,
+            "total": throttle + queue + finished - started,
+        }
+        histograms = self.histograms.get((host, probe))
+        if histograms is None:
+            histograms = self.histograms[(host, probe)] = {phase: Histogram() for phase in PHASES}
+        for phase, seconds in phases.items():
+            histograms[phase].observe(seconds)
+        totals = self.totals.setdefault((host, probe), [0, 0])
+        totals[0] += 1
+        totals[1] += bytes_read
+        status_class = f"{status // 100}xx" if status else "error"
+        self.statuses[(host, status_class)] = self.statuses.get((host, status_class), 0) + 1
+        slowest = self.slowest.setdefault(host, [])
+        entry = (phases["total"], next(self._order), url, probe, status, phases)
+        if len(slowest) < self.keep_slowest:
+            heapq.heappush(slowest, entry)
+        elif entry[0] > slowest[0][0]:
+            heapq.heapreplace(slowest, entry)
+
+    def _merged(self, key_index: int) -> dict:
+        merged = {}
+        for key, histograms in self.histograms.items():
+            target = merged.setdefault(key[key_index], {phase: Histogram() for phase in PHASES})
+            for phase, histogram in histograms.items():
+                target[phase].merge(histogram)
+        return merged
+
+    def phase_breakdown(self, host: str = None) -> dict:
+        """Mean seconds per request for each phase (of one host, or all)"""
+        merged = {phase: Histogram() for phase in PHASES}
+        for (h, _probe), histograms in self.histograms.items():
+            if host is None or h == host:
+                for phase, histogram in histograms.items():
+                    merged[phase].merge(histogram)
+        return {phase: (h.sum / h.count if h.count else 0.0) for phase, h in merged.items()}
+
+    def describe_phases(self, host: str = None) -> str:
+        breakdown = self.phase_breakdown(host)
+        phases = ", ".join(f"{phase} {format_seconds(breakdown[phase])}" for phase in PHASES[:-1])
+        return f"{phases} (total {format_seconds(breakdown['total'])})"
+
+    def slowest_requests(self, host: str, limit: int = 5) -> list:
+        """[(total seconds, url, probe, status, phases)], slowest first"""
+        ordered = sorted(self.slowest.get(host, []), key=lambda entry: -entry[0])[:limit]
+        return [(total, url, probe, status, phases) for total, _order, url, probe, status, phases in ordered]
+
+    def summary(self) -> dict:
+        def described(merged):
+            return {key: {phase: h.as_dict() for phase, h in histograms.items()} for key, histograms in merged.items()}
+
+        hosts = {}
+        for (host, probe), (requests, received) in self.totals.items():
+            entry = hosts.setdefault(host, {"requests": 0, "bytes": 0, "statuses": {}})
+            entry["requests"] += requests
+            entry["bytes"] += received
+        for (host, status_class), n in self.statuses.items():
+            hosts[host]["statuses"][status_class] = n
+        by_host = described(self._merged(0))
+        for host, entry in hosts.items():
+            entry["phases"] = by_host[host]
+            entry["slowest"] = [{"url": url, "probe": probe, "status": status, "seconds": round(total, 6),
+                                 "phases": {p: round(s, 6) for p, s in phases.items()}}
+                                for total, url, probe, status, phases in self.slowest_requests(host, self.keep_slowest)]
+        return {"phases": list(PHASES), "hosts": hosts, "probes": described(self._merged(1))}
+
+    def prometheus(self) -> str:
+        lines = [
+            "# HELP scanner_request_phase_seconds Time spent in each phase of a request",
+            "# TYPE scanner_request_phase_seconds histogram",
+        ]
+        for (host, probe), histograms in sorted(self.histograms.items()):
+            for phase, h in histograms.items():
+                labels = f'host="{_label(host)}",probe="{_label(probe)}",phase="{phase}"'
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), h.counts):
+                    cumulative += n
+                    lines.append(f'scanner_request_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"scanner_request_phase_seconds_sum{{{labels}}} {h.sum:.6f}")
+                lines.append(f"scanner_request_phase_seconds_count{{{labels}}} {h.count}")
+        lines += ["# HELP scanner_response_bytes_total Response body bytes read",
+                  "# TYPE scanner_response_bytes_total counter"]
+        for (host, probe), (_requests, received) in sorted(self.totals.items()):
+            lines.append(f'scanner_response_bytes_total{{host="{_label(host)}",probe="{_label(probe)}"}} {received}')
+        lines += ["# HELP scanner_responses_total Requests by response status class",
+                  "# TYPE scanner_responses_total counter"]
+        for (host, status_class), n in sorted(self.statuses.items()):
+            lines.append(f'scanner_responses_total{{host="{_label(host)}",status="{status_class}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: str, text: str):
+    # Readers (e.g. node_exporter's textfile collector) never see a half-written file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+class MetricsExporter:
+    """Writes `metrics` as a Prometheus text file every `interval` seconds and/or serves it on
+    http://127.0.0.1:`port`/metrics; close() writes the final file and the JSON summary"""
+
+    def __init__(self, metrics: ScanMetrics, json_path: str = "", prometheus_path: str = "", port: int = 0,
+                 interval: float = 10.0):
+        self.metrics = metrics
+        self.json_path = json_path
+        self.prometheus_path = prometheus_path
+        self.port = port
+        self.interval = interval
+        self._writer = None
+        self._runner = None
+
+    async def start(self):
+        if self.prometheus_path:
+            self._writer = asyncio.create_task(self._write_periodically())
+        if self.port:
+            app = web.Application()
+            app.router.add_get("/metrics", self._serve)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    async def _serve(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.metrics.prometheus(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    async def _write_periodically(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            _write_atomic(self.prometheus_path, self.metrics.prometheus())
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self.prometheus_path:
+            _write_atomic(self.prometheus_path, self.metrics.prometheus())
+        if self.json_path:
+            _write_atomic(self.json_path, json.dumps(self.metrics.summary(), indent=2))
@@ -0,0 +1,47 @@
+# Precomputed path classification for wordlist entries.
+#
+# Every probe needs the same three facts about its path: does it look like a
+# directory, is it (under) a sensitive directory, and does it have a
+# suspicious downloadable extension. The classifier indexes the sensitive
+# directory list and extension set once, and each wordlist entry is classified
+# once into a PathInfo record that the scan reads instead of re-deriving them.
+from typing import NamedTuple
+
+
+class PathInfo(NamedTuple):
+    path: str          # wordlist entry as given
+    rel_path: str      # path relative to the target base URL (no leading slash)
+    is_dir: bool       # looks like a directory
+    sensitive: bool    # is, or is nested under, a sensitive directory
+    suspicious: bool   # file with a suspicious downloadable extension
+
+
+class PathClassifier:
+    def __init__(self, sensitive_directories, suspicious_extensions):
+        # Exact strings, as listed; a path is sensitive if it or any of its
+        # leading segment prefixes ("a", "a/b", ...) is in this set
+        self.sensitive = frozenset(sensitive_directories)
+        # Directory names are matched case-insensitively against the last segment
+        self.sensitive_names = frozenset(d.lower() for d in sensitive_directories)
+        self.extensions = frozenset(e.lower() for e in suspicious_extensions)
+
+    def is_sensitive(self, path: str) -> bool:
+        clean_path = path.strip("/")
+        if clean_path in self.sensitive:
+            return True
+        slash = clean_path.find("/")
+        while slash != -1:
+            if clean_path[:slash] in self.sensitive:
+                return True
+            slash = clean_path.find("/", slash + 1)
+        return False
+
+    def classify(self, path: str) -> PathInfo:
+        last = path.strip("/").rpartition("/")[2].lower()
+        has_ext = "." in last
+        if path.endswith("/"):
+            is_dir = True
+        else:
+            is_dir = bool(last) and not has_ext and last in self.sensitive_names
+        suspicious = has_ext and last.rpartition(".")[2] in self.extensions
+        return PathInfo(path, path.lstrip("/"), is_dir, self.is_sensitive(path), suspicious)
@@ -0,0 +1,172 @@
+# --profile: where a scan's time went, written next to its reports.
+#
+# The stage timings come from the scanner's StageTimer (timing.py), which is
+# always on. A profile report puts them side by side with the whole
+# process's wall and CPU time, so a slow scan can be pinned on waiting
+# (network, throttling, the AI API) or on CPU in one stage (soft-404 checks,
+# keyword scoring, report rendering). Two optional profilers add the hot
+# functions:
+#
+#   cprofile   deterministic cProfile of the event loop thread (threads
+#              running report rendering or the thread analysis pool are not
+#              included); a noticeable overhead on busy scans
+#   sample     a background thread records every thread's stack every
+#              5 ms; low overhead, approximate, covers all threads
+#
+# Neither sees the process analysis pool's workers; their share shows up as
+# the soft_404 stage's wall time and in the process's child CPU time.
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime
+
+PROFILE_MODES = ("stages", "cprofile", "sample")
+
+SAMPLE_INTERVAL = 0.005
+
+# Top frames of a thread with nothing to do: the event loop waiting on sockets and
+# timers (kept, and reported as such) and pool workers waiting for work (dropped)
+LOOP_IDLE = ("selectors.py", "select")
+WORKER_IDLE = {("thread.py", "_worker"), ("threading.py", "wait"), ("queue.py", "get")}
+
+
+def _frame_key(code) -> tuple:
+    return os.path.basename(code.co_filename), code.co_firstlineno, code.co_name
+
+
+class StackSampler:
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        # (file, line, function) -> samples with it on top of the stack / anywhere on it
+        self.own = {}
+        self.total = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                top = _frame_key(frame.f_code)
+                if (top[0], top[2]) in WORKER_IDLE:
+                    continue
+                self.samples += 1
+                self.own[top] = self.own.get(top, 0) + 1
+                seen = set()
+                while frame is not None:
+                    key = _frame_key(frame.f_code)
+                    if key not in seen:
+                        seen.add(key)
+                        self.total[key] = self.total.get(key, 0) + 1
+                    frame = frame.f_back
+
+    def hot_functions(self, limit: int) -> list:
+        """[(function, own seconds, total seconds)], most own time first (samples x interval)"""
+        ordered = sorted(self.own.items(), key=lambda item: -item[1])[:limit]
+        return [(f"{name} ({filename}:{line})", n * self.interval, self.total.get((filename, line, name), 0) * self.interval)
+                for (filename, line, name), n in ordered]
+
+
+class Profiler:
+    def __init__(self, mode: str = "stages"):
+        self.mode = mode
+        self.profile = cProfile.Profile() if mode == "cprofile" else None
+        self.sampler = StackSampler() if mode == "sample" else None
+        self.wall = 0.0
+        self.cpu = None
+        self._started = None
+
+    def start(self):
+        self._started = (time.perf_counter(), os.times())
+        if self.profile is not None:
+            self.profile.enable()
+        if self.sampler is not None:
+            self.sampler.start()
+
+    def stop(self):
+        if self._started is None:
+            return
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+        started, before = self._started
+        after = os.times()
+        self.wall = time.perf_counter() - started
+        # Children: analysis pool processes, once they have exited
+        self.cpu = {
+            "user": after.user - before.user,
+            "system": after.system - before.system,
+            "children": after.children_user - before.children_user + after.children_system - before.children_system,
+        }
+        self._started = None
+
+    def hot_functions(self, limit: int = 25) -> list:
+        if self.sampler is not None:
+            return self.sampler.hot_functions(limit)
+        if self.profile is None:
+            return []
+        stats = pstats.Stats(self.profile, stream=io.StringIO())
+        # (file, line, function) -> (primitive calls, calls, own time, cumulative time, callers)
+        ordered = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:limit]
+        return [(f"{name} ({os.path.basename(filename)}:{line})", own, cumulative)
+                for (filename, line, name), (_pcalls, _calls, own, cumulative, _callers) in ordered]
+
+    def write_report(self, path: str, timer, metrics=None, title: str = "") -> str:
+        """Plain-text report of stage wall/CPU time and hot functions; returns `path`"""
+        cpu = self.cpu or {"user": 0.0, "system": 0.0, "children": 0.0}
+        process_cpu = cpu["user"] + cpu["system"] + cpu["children"]
+        summary = timer.summary()
+        busy = process_cpu / self.wall if self.wall else 0.0
+        # One core's worth of CPU means the scan was held up by its own processing
+        hint = "mostly waiting on the network, pacing or the AI API" if busy < 0.5 else "CPU-bound; see cpu/wall below"
+        lines = [
+            f"Scan profile{f': {title}' if title else ''} ({datetime.now().strftime('%d-%m-%Y %H:%M:%S')})",
+            "",
+            f"Wall time    {self.wall:10.2f}s",
+            f"CPU time     {process_cpu:10.2f}s  (user {cpu['user']:.2f}s, system {cpu['system']:.2f}s, "
+            f"analysis workers {cpu['children']:.2f}s)",
+            f"CPU / wall   {busy * 100:9.0f}%  ({hint})",
+            f"Requests     {summary['requests']:10d}  ({summary['bytes_read'] / 1048576:.1f} MB read; latency "
+            + ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in summary["latency"].items()) + ")",
+        ]
+        if metrics is not None:
+            lines.append(f"Per request  {metrics.describe_phases()}")
+        lines += [
+            "",
+            "Stages (wall time of overlapping stages adds up to more than the scan's; CPU is the",
+            "thread's own for soft_404, keywords, script_extract and report_*, the event loop's for baseline,",
+            "paths and js; ai_triage is wall time only)",
+            "",
+            f"  {'stage':<16}{'calls':>9}{'wall':>11}{'cpu':>11}{'cpu/wall':>10}",
+        ]
+        for name, stage in sorted(summary["stages"].items(), key=lambda item: -item[1]["wall"]):
+            share = f"{stage['cpu'] / stage['wall'] * 100:.0f}%" if stage["wall"] else "-"
+            lines.append(f"  {name:<16}{stage['calls']:>9}{stage['wall']:>10.2f}s{stage['cpu']:>10.2f}s{share:>10}")
+        hot = self.hot_functions()
+        if hot:
+            source = ("cProfile, event loop thread" if self.mode == "cprofile"
+                      else f"sampled every {SAMPLE_INTERVAL * 1000:.0f}ms, all threads; "
+                           f"{LOOP_IDLE[1]} ({LOOP_IDLE[0]}) is the event loop waiting for I/O")
+            lines += ["", f"Hot functions ({source})", "", f"  {'own':>9}{'total':>10}  function"]
+            lines += [f"  {own:>8.2f}s{total:>9.2f}s  {name}" for name, own, total in hot]
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+        return path
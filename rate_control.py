@@ -0,0 +1,209 @@
+# Adaptive per-host request pacing.
+#
+# Each target host gets a RateController that decides how many requests may be
+# in flight and how long to wait before each one. It starts from a --speed
+# preset and adjusts with AIMD (additive increase, multiplicative decrease):
+# every successful response first shortens the delay and then raises the
+# concurrency (quickly until the host first pushes back, gently after that),
+# while 429/503 responses, connection errors and a sharp rise in latency
+# halve the concurrency and double the delay. A Retry-After header (or,
+# without one, an exponential backoff) pauses the whole host. Everything
+# stays within the floor and ceiling given on the command line.
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Starting point and default limits for each --speed name
+SPEED_PRESETS = {
+    "slow": {"concurrency": 1, "delay": 3.0, "max_concurrency": 4, "min_delay": 0.5},
+    "medium": {"concurrency": 5, "delay": 0.5, "max_concurrency": 20, "min_delay": 0.05},
+    "fast": {"concurrency": 20, "delay": 0.0, "max_concurrency": 64, "min_delay": 0.0},
+}
+
+# Statuses that mean "slow down" rather than anything about the path itself
+THROTTLE_STATUSES = (429, 503)
+
+# Longest pause honoured from a Retry-After header or backoff, in seconds
+MAX_PAUSE_SECONDS = 120.0
+
+# Latency counts as congestion once the smoothed value is this many times the
+# host's baseline and at least LATENCY_MIN_RISE seconds above it
+LATENCY_TOLERANCE = 2.5
+LATENCY_MIN_RISE = 0.5
+
+
+class RateController:
+    def __init__(self, concurrency: float, delay: float, min_concurrency: int = 1, max_concurrency: int = 20,
+                 min_delay: float = 0.0, max_delay: float = 10.0, adaptive: bool = True):
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.min_delay = max(0.0, min_delay)
+        self.max_delay = max(self.min_delay, max_delay)
+        self.limit = float(min(max(concurrency, self.min_concurrency), self.max_concurrency))
+        self.delay = min(max(delay, self.min_delay), self.max_delay)
+        self.adaptive = adaptive
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.consecutive_throttles = 0
+        self.decreased_at = 0.0
+        # Ramp up quickly until the host first pushes back, then probe upwards gently
+        self.slow_start = True
+        # Latency tracking: smoothed average and a slowly rising baseline (recent best)
+        self.latency = None
+        self.baseline = None
+        self.responses = 0
+        self.throttled = 0
+        self.errors = 0
+        self.closed = False
+        # Futures of requests waiting for a slot, and of requests sleeping out their delay
+        self._waiters = []
+        self._sleepers = []
+
+    async def acquire(self) -> bool:
+        """Wait for a request slot and the pacing delay. Returns False, without taking a slot,
+        if the host was closed in the meantime."""
+        while True:
+            if self.closed:
+                return False
+            pause = self.paused_until - time.monotonic()
+            if self.in_flight < int(self.limit) and pause <= 0:
+                break
+            # Woken when a slot frees up, or when the pause is over
+            await self._wait(self._waiters, pause if pause > 0 else None)
+        self.in_flight += 1
+        # Jittered around the current delay (e.g. 2-4s for the slow preset's 3s);
+        # a 429 elsewhere may also have paused the host while waiting it out
+        wait = random.uniform(self.delay * 2 / 3, self.delay * 4 / 3) if self.delay > 0 else 0
+        while wait > 0 and not self.closed:
+            await self._wait(self._sleepers, wait)
+            wait = self.paused_until - time.monotonic()
+        if self.closed:
+            self.in_flight -= 1
+            return False
+        return True
+
+    async def _wait(self, waiters: list, timeout: Optional[float]):
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+
+    def close(self):
+        """Give up on the host: waiting and future acquire() calls return False at once"""
+        self.closed = True
+        self._notify(self._sleepers)
+        self._notify()
+
+    def release(self, started: float, status: Optional[int] = None, retry_after: Optional[float] = None,
+                completed: bool = True):
+        """Free the slot and learn from the outcome. `completed=False` (cancelled) frees it without adjusting."""
+        self.in_flight -= 1
+        if completed:
+            self._observe(started, status, retry_after)
+        self._notify()
+
+    def _notify(self, waiters: Optional[list] = None):
+        waiters = self._waiters if waiters is None else waiters
+        pending = list(waiters)
+        waiters.clear()
+        for waiter in pending:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _observe(self, started: float, status: Optional[int], retry_after: Optional[float]):
+        now = time.monotonic()
+        self.responses += 1
+        if status in THROTTLE_STATUSES:
+            self.throttled += 1
+            self.consecutive_throttles += 1
+            pause = retry_after if retry_after is not None else 2.0 ** min(self.consecutive_throttles, 7)
+            self.pause(min(pause, MAX_PAUSE_SECONDS))
+            self._decrease(started, now)
+            return
+        self.consecutive_throttles = 0
+        if status is None:
+            self.errors += 1
+            self._decrease(started, now)
+            return
+
+        sample = now - started
+        self.latency = sample if self.latency is None else self.latency * 0.8 + sample * 0.2
+        # The baseline drops to a faster sample at once and only creeps up
+        self.baseline = sample if self.baseline is None else min(sample, self.baseline + (sample - self.baseline) * 0.01)
+        if self.latency > self.baseline * LATENCY_TOLERANCE and self.latency - self.baseline > LATENCY_MIN_RISE:
+            self._decrease(started, now, factor=0.75)
+        else:
+            self._increase()
+
+    def _increase(self):
+        if not self.adaptive:
+            return
+        # Shed the delay first, then add slots: one per success while ramping up,
+        # roughly one per window of successful requests after the first push back
+        if self.delay > self.min_delay:
+            self.delay = max(self.min_delay, self.delay * (0.9 if self.slow_start else 0.98))
+            if self.delay < 0.01:
+                self.delay = self.min_delay
+        else:
+            step = 1.0 if self.slow_start else 1.0 / self.limit
+            self.limit = min(float(self.max_concurrency), self.limit + step)
+
+    def _decrease(self, started: float, now: float, factor: float = 0.5):
+        # Requests sent before the last decrease saw the old rate; one cut per burst is enough
+        if not self.adaptive or started < self.decreased_at:
+            return
+        self.decreased_at = now
+        self.slow_start = False
+        self.limit = max(float(self.min_concurrency), self.limit * factor)
+        self.delay = min(self.max_delay, max(self.delay / factor, self.min_delay, 0.1))
+
+    def pause(self, seconds: float):
+        """Hold back every request to this host for `seconds` (requests already sent are unaffected)"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def describe(self) -> str:
+        text = f"{int(self.limit)} in flight, {self.delay:.2f}s delay"
+        if self.throttled or self.errors:
+            text += f", {self.throttled} throttled, {self.errors} errors"
+        return text
+
+
+def make_controller(speed: str, adaptive: bool = True, min_concurrency: int = 1, max_concurrency: Optional[int] = None,
+                    min_delay: Optional[float] = None, max_delay: float = 10.0) -> RateController:
+    """Controller starting from a --speed preset; None limits fall back to the preset's defaults"""
+    preset = SPEED_PRESETS.get(speed, SPEED_PRESETS["fast"])
+    if not adaptive:
+        # Fixed preset: concurrency and delay never change (pauses for Retry-After still apply)
+        return RateController(preset["concurrency"], preset["delay"], preset["concurrency"], preset["concurrency"],
+                              preset["delay"], preset["delay"], adaptive=False)
+    return RateController(
+        preset["concurrency"],
+        preset["delay"],
+        min_concurrency=min_concurrency,
+        max_concurrency=max_concurrency if max_concurrency is not None else preset["max_concurrency"],
+        min_delay=min_delay if min_delay is not None else preset["min_delay"],
+        max_delay=max_delay,
+    )
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    value = (value or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
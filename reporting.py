@@ -0,0 +1,1044 @@
+# Report generation from a scan's results file (see result_sink.py).
+#
+# ReportData reads the JSONL file once and aggregates everything the reports
+# need: the findings with their AI notes, outcome / status / type counts and
+# the top-N notable responses. Renderers then write one format each:
+#
+#   pdf   findings and statistics in full; the per-path log only for small
+#         scans, a status histogram and the top-N responses otherwise
+#   html  single self-contained page; the log is embedded as JSON and shown
+#         a page at a time, so it stays usable with 100k+ paths
+#   csv   one row per scanned path
+#   json  scan details, statistics, findings and the log in one document
+#
+# The log itself is never held in memory: the html, csv and json renderers
+# and the full PDF log stream it from the results file in a second pass.
+import csv
+import heapq
+import html
+import json
+import os
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from result_sink import read_records
+from wordlists import SeenKeys
+
+# Short labels and PDF text colours for each probe outcome ("vulnerability" field)
+RESULT_LABELS = {
+    "high": "HIGH",
+    "medium": "MED",
+    "clean": "CLEAN",
+    "skipped": "SKIP",
+    "rate-limited": "LIMIT",
+    "unreached": "ERROR",
+    "aborted": "ABORT",
+}
+RESULT_COLORS = {
+    "high": (200, 30, 30),
+    "medium": (200, 120, 20),
+    "clean": (30, 140, 50),
+    "skipped": (120, 120, 120),
+    "rate-limited": (120, 120, 120),
+    "unreached": (120, 120, 120),
+    "aborted": (120, 120, 120),
+}
+
+# File extension for each format; the renderers are registered in RENDERERS below
+REPORT_EXTENSIONS = {"pdf": ".pdf", "html": ".html", "csv": ".csv", "json": ".json"}
+
+
+def _notable_rank(record: dict):
+    """Findings first, then any response other than a 404; None for the rest"""
+    outcome = record.get("vulnerability") or "clean"
+    if outcome == "high":
+        return 0
+    if outcome == "medium":
+        return 1
+    if outcome == "clean" and record.get("status") not in (None, 404):
+        return 2
+    return None
+
+
+def _status_label(record: dict) -> str:
+    if record.get("status") is not None:
+        return str(record["status"])
+    return record.get("error") or record.get("vulnerability") or "none"
+
+
+class ReportData:
+    def __init__(self, results_path: str, top: int = 50):
+        """Aggregate a results file in a single pass"""
+        self.results_path = results_path
+        self.scan_details = {}
+        self.summary = {}
+        self.findings = []
+        self.total = 0
+        # Paths in the log once duplicates are dropped (what the log tables show)
+        self.unique = 0
+        self.outcomes = {}
+        self.statuses = {}
+        self.types = {}
+        self.top = top
+        self._notable = []
+
+        findings = {}
+        seen = SeenKeys()
+        for record in read_records(results_path):
+            kind = record.get("kind")
+            if kind == "probe":
+                self.total += 1
+                outcome = record.get("vulnerability") or "clean"
+                self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+                label = _status_label(record)
+                self.statuses[label] = self.statuses.get(label, 0) + 1
+                typ = record.get("type") or "file"
+                self.types[typ] = self.types.get(typ, 0) + 1
+                if seen.add((record.get("path") or "").strip("/")):
+                    self.unique += 1
+                    self._keep_notable(record)
+            elif kind == "finding":
+                findings[record["id"]] = record
+            elif kind == "notes" and record.get("id") in findings:
+                findings[record["id"]]["notes"] = record.get("notes", "")
+            elif kind == "scan":
+                self.scan_details = record
+            elif kind == "summary":
+                self.summary = record
+        self.findings = list(findings.values())
+
+    def _keep_notable(self, record: dict):
+        # Bounded heap of the `top` best (rank, order) pairs; the worst one sits on top
+        rank = _notable_rank(record)
+        if rank is None or self.top <= 0:
+            return
+        entry = (-rank, -self.unique, record)
+        if len(self._notable) < self.top:
+            heapq.heappush(self._notable, entry)
+        elif entry > self._notable[0]:
+            heapq.heapreplace(self._notable, entry)
+
+    @property
+    def notable(self) -> list:
+        """Top-N notable responses, findings first, in scan order within each rank"""
+        return [entry[2] for entry in sorted(self._notable, reverse=True)]
+
+    @property
+    def counters(self) -> dict:
+        # A scan cut short by a crash has no summary record; count the log instead
+        if "counters" in self.summary:
+            return self.summary["counters"]
+        return {"files": self.types.get("file", 0), "directories": self.types.get("directory", 0)}
+
+    @property
+    def finding_changes(self) -> dict:
+        """Findings by change since the previous scan (new, changed, carried-over); empty without a response store"""
+        changes = {}
+        for finding in self.findings:
+            if finding.get("change"):
+                changes[finding["change"]] = changes.get(finding["change"], 0) + 1
+        return changes
+
+    @property
+    def aborted(self) -> bool:
+        return bool(self.summary.get("aborted"))
+
+    @property
+    def interrupted(self) -> bool:
+        return bool(self.summary.get("interrupted"))
+
+    def describe_failures(self) -> str:
+        failures = self.summary.get("connection_failures") or {}
+        return ", ".join(f"{count} {kind}" for kind, count in sorted(failures.items()))
+
+    def log_rows(self):
+        """Second pass: probe records in scan order, one per path"""
+        seen = SeenKeys()
+        for record in read_records(self.results_path, "probe"):
+            if seen.add((record.get("path") or "").strip("/")):
+                yield record
+
+
+# PDF report generator (styled with logo, modern fonts, and improved tables)
+class PDFReport(FPDF):
+    def __init__(self, scan_details: dict, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scan_details = scan_details
+
+    def header(self):
+        scan_details = self.scan_details
+        try:
+            logo_path = os.path.join(os.path.dirname(__file__), "images", "logo.png")
+            if os.path.isfile(logo_path):
+                # Place logo at top-left (width ~28mm), keep aspect ratio
+                self.image(logo_path, x=15, y=10, w=28)
+        except Exception:
+            # If logo fails, continue without it
+            pass
+
+        self.set_xy(15, 12)
+        self.set_font("Helvetica", "B", 16)
+        self.set_text_color(20, 40, 80)
+        self.cell(
+            0,
+            10,
+            "Website Security Scan Report",
+            border=0,
+            align="R",
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+
+        self.set_font("Helvetica", "B", 12)
+        self.set_text_color(0, 0, 0)
+        self.cell(
+            0,
+            8,
+            f"Company: {scan_details['company_name']}",
+            border=0,
+            align="R",
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+        self.set_font("Helvetica", "", 10)
+        self.cell(
+            0,
+            6,
+            f"Target URL: {scan_details['target_url']}",
+            border=0,
+            align="R",
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+        self.cell(
+            0,
+            6,
+            f"Scan Date: {scan_details['scan_date']}",
+            border=0,
+            align="R",
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+
+        # Separator line
+        self.ln(2)
+        self.set_draw_color(220, 223, 230)
+        self.set_line_width(0.4)
+        self.line(15, self.get_y(), 195, self.get_y())
+        self.ln(5)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font("Helvetica", "I", 8)
+        self.set_text_color(120, 120, 120)
+        self.cell(
+            0,
+            10,
+            f"Page {self.page_no()}",
+            border=0,
+            align="C",
+            new_x=XPos.RIGHT,
+            new_y=YPos.TOP,
+        )
+
+
+def pdf_log_mode(data: ReportData, settings: dict) -> str:
+    """"full", "summary" or "none": "auto" keeps the row-per-path log for scans up to `pdf_full_log_limit` paths"""
+    mode = settings.get("pdf_log", "auto")
+    # A target that opted out of the full log still gets the summary
+    if mode in ("auto", "full") and not data.scan_details.get("include_full_log", True):
+        return "summary"
+    if mode == "auto":
+        return "summary" if data.unique > settings.get("pdf_full_log_limit", 2000) else "full"
+    return mode
+
+
+# Findings and statistics in full; the scan log row by row or summarized (see pdf_log_mode)
+def render_pdf(data: ReportData, path: str, settings: dict):
+    scan_details = data.scan_details
+    findings = data.findings
+    counters = data.counters
+    log_mode = pdf_log_mode(data, settings)
+    pdf = PDFReport(scan_details)
+    # Margins and auto page break
+    pdf.set_margins(15, 18, 15)
+    pdf.set_auto_page_break(auto=True, margin=18)
+    pdf.add_page()
+
+    # Summary card
+    pdf.set_fill_color(245, 247, 250)  # light gray-blue
+    pdf.set_draw_color(222, 226, 233)
+    pdf.set_text_color(20, 20, 20)
+    pdf.set_line_width(0.3)
+
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(
+        0,
+        10,
+        "Scan Summary",
+        border=0,
+        new_x=XPos.LMARGIN,
+        new_y=YPos.NEXT,
+    )
+    pdf.set_font("Helvetica", "", 11)
+
+    pdf.set_x(15)
+    pdf.multi_cell(
+        0,
+        8,
+        f"Files scanned: {counters.get('files',0)}",
+        border=0,
+        align="L",
+        fill=False,
+    )
+    pdf.set_x(15)
+    pdf.multi_cell(
+        0,
+        8,
+        f"Directories scanned: {counters.get('directories',0)}",
+        border=0,
+        align="L",
+        fill=False,
+    )
+    pdf.set_x(15)
+    pdf.multi_cell(
+        0,
+        8,
+        f"Potential issues found: {len(findings)}",
+        border=0,
+        align="L",
+        fill=False,
+    )
+    changes = data.finding_changes
+    if changes:
+        pdf.set_x(15)
+        pdf.multi_cell(
+            0,
+            8,
+            f"Since the last scan: {changes.get('new', 0)} new, {changes.get('changed', 0)} changed, "
+            f"{changes.get('carried-over', 0)} carried over",
+            border=0,
+            align="L",
+            fill=False,
+        )
+    if data.aborted:
+        pdf.set_x(15)
+        pdf.set_text_color(200, 30, 30)
+        pdf.multi_cell(
+            0,
+            8,
+            f"Target aborted after repeated connection failures ({data.describe_failures()}); "
+            "the remaining paths were not scanned",
+            border=0,
+            align="L",
+            fill=False,
+        )
+        pdf.set_text_color(20, 20, 20)
+    if data.interrupted:
+        pdf.set_x(15)
+        pdf.set_text_color(200, 120, 0)
+        pdf.multi_cell(
+            0,
+            8,
+            f"Scan interrupted before completion: results cover {data.summary.get('paths_scanned', data.total)} paths only",
+            border=0,
+            align="L",
+            fill=False,
+        )
+        pdf.set_text_color(20, 20, 20)
+    pdf.ln(5)
+
+    # Findings details as styled table
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(
+        0,
+        10,
+        "Details",
+        border=0,
+        new_x=XPos.LMARGIN,
+        new_y=YPos.NEXT,
+    )
+    if not findings:
+        pdf.set_font("Helvetica", "I", 11)
+        pdf.cell(
+            0,
+            8,
+            "No security issues detected.",
+            border=1,
+            align="C",
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+    else:
+        header_fill = (240, 244, 248)
+        row_alt_fill = (249, 251, 253)
+        pdf.set_font("Helvetica", "B", 10)
+        pdf.set_fill_color(*header_fill)
+        pdf.set_draw_color(220, 223, 230)
+        pdf.set_text_color(20, 40, 80)
+        # Columns: Level (22) | Type (22) | URL (80) | Notes (56) = 180,
+        # or with Change (24) after a previous scan: URL (66) | Notes (46)
+        url_w, notes_w = (66, 46) if changes else (80, 56)
+        pdf.cell(
+            22,
+            8,
+            "Level",
+            border=1,
+            align="C",
+            fill=True,
+            new_x=XPos.RIGHT,
+            new_y=YPos.TOP,
+        )
+        pdf.cell(
+            22,
+            8,
+            "Type",
+            border=1,
+            align="C",
+            fill=True,
+            new_x=XPos.RIGHT,
+            new_y=YPos.TOP,
+        )
+        if changes:
+            pdf.cell(
+                24,
+                8,
+                "Change",
+                border=1,
+                align="C",
+                fill=True,
+                new_x=XPos.RIGHT,
+                new_y=YPos.TOP,
+            )
+        pdf.cell(
+            url_w,
+            8,
+            "URL",
+            border=1,
+            align="L",
+            fill=True,
+            new_x=XPos.RIGHT,
+            new_y=YPos.TOP,
+        )
+        pdf.cell(
+            notes_w,
+            8,
+            "Notes",
+            border=1,
+            align="L",
+            fill=True,
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+
+        pdf.set_font("Helvetica", "", 9)
+        pdf.set_text_color(15, 15, 15)
+        fill_toggle = False
+        for f in findings:
+            if fill_toggle:
+                pdf.set_fill_color(*row_alt_fill)
+            else:
+                pdf.set_fill_color(255, 255, 255)
+            fill_toggle = not fill_toggle
+
+            level = (f.get("level") or "").upper()
+            typ = (f.get("type") or "").capitalize()
+            url = f.get("url") or ""
+            notes = f.get("notes") or ""
+            # Truncate to keep row heights clean
+            url_disp = (url[:url_w - 4] + "...") if len(url) > url_w - 1 else url
+            notes_disp = (notes[:notes_w - 3] + "...") if len(notes) > notes_w else notes
+
+            # Color-code level text
+            if level == "HIGH":
+                level_color = (200, 30, 30)
+            elif level == "MEDIUM":
+                level_color = (200, 120, 20)
+            else:
+                level_color = (30, 140, 50)
+
+            # Level
+            pdf.set_text_color(*level_color)
+            pdf.cell(
+                22,
+                7,
+                level,
+                border=1,
+                align="C",
+                fill=True,
+                new_x=XPos.RIGHT,
+                new_y=YPos.TOP,
+            )
+            # Type
+            pdf.set_text_color(15, 15, 15)
+            pdf.cell(
+                22,
+                7,
+                typ,
+                border=1,
+                align="C",
+                fill=True,
+                new_x=XPos.RIGHT,
+                new_y=YPos.TOP,
+            )
+            # Change since the last scan
+            if changes:
+                pdf.cell(
+                    24,
+                    7,
+                    f.get("change", ""),
+                    border=1,
+                    align="C",
+                    fill=True,
+                    new_x=XPos.RIGHT,
+                    new_y=YPos.TOP,
+                )
+            # URL
+            pdf.cell(
+                url_w,
+                7,
+                url_disp,
+                border=1,
+                align="L",
+                fill=True,
+                new_x=XPos.RIGHT,
+                new_y=YPos.TOP,
+            )
+            # Notes
+            pdf.cell(
+                notes_w,
+                7,
+                notes_disp,
+                border=1,
+                align="L",
+                fill=True,
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
+            )
+
+    # Complete scan log (styled table) - optional
+    if log_mode == "summary":
+        _pdf_log_summary(pdf, data, settings.get("top", 50))
+    elif log_mode == "full":
+        pdf.add_page()
+        pdf.set_font("Helvetica", "B", 14)
+        pdf.cell(
+            0,
+            10,
+            "Complete Scan Log",
+            border=0,
+            align="C",
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+        pdf.ln(2)
+
+        # Table header
+        header_fill = (240, 244, 248)
+        row_alt_fill = (249, 251, 253)
+        pdf.set_font("Helvetica", "B", 10)
+        pdf.set_fill_color(*header_fill)
+        pdf.set_draw_color(220, 223, 230)
+        pdf.set_text_color(20, 40, 80)
+        pdf.cell(
+            100,
+            8,
+            "Path",
+            border=1,
+            align="L",
+            fill=True,
+            new_x=XPos.RIGHT,
+            new_y=YPos.TOP,
+        )
+        pdf.cell(
+            25,
+            8,
+            "Status",
+            border=1,
+            align="C",
+            fill=True,
+            new_x=XPos.RIGHT,
+            new_y=YPos.TOP,
+        )
+        pdf.cell(
+            25,
+            8,
+            "Result",
+            border=1,
+            align="C",
+            fill=True,
+            new_x=XPos.RIGHT,
+            new_y=YPos.TOP,
+        )
+        pdf.cell(
+            25,
+            8,
+            "Type",
+            border=1,
+            align="C",
+            fill=True,
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+
+        # Table rows
+        pdf.set_font("Helvetica", "", 9)
+        pdf.set_text_color(15, 15, 15)
+        fill_toggle = False
+        for scan in data.log_rows():
+            if fill_toggle:
+                pdf.set_fill_color(*row_alt_fill)
+            else:
+                pdf.set_fill_color(255, 255, 255)
+            fill_toggle = not fill_toggle
+
+            display_path = scan["path"][:95] + "..." if len(scan["path"]) > 98 else scan["path"]
+
+            outcome = scan.get("vulnerability") or "clean"
+            pdf.set_text_color(*RESULT_COLORS.get(outcome, RESULT_COLORS["clean"]))
+            result_symbol = RESULT_LABELS.get(outcome, "CLEAN")
+
+            pdf.cell(
+                100,
+                7,
+                display_path,
+                border=1,
+                align="L",
+                fill=True,
+                new_x=XPos.RIGHT,
+                new_y=YPos.TOP,
+            )
+            pdf.cell(
+                25,
+                7,
+                str(scan["status"]),
+                border=1,
+                align="C",
+                fill=True,
+                new_x=XPos.RIGHT,
+                new_y=YPos.TOP,
+            )
+            pdf.cell(
+                25,
+                7,
+                result_symbol,
+                border=1,
+                align="C",
+                fill=True,
+                new_x=XPos.RIGHT,
+                new_y=YPos.TOP,
+            )
+            pdf.cell(
+                25,
+                7,
+                scan["type"],
+                border=1,
+                align="C",
+                fill=True,
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT,
+            )
+
+            # Reset text color for next row
+            pdf.set_text_color(15, 15, 15)
+
+    # Summary statistics as table
+    pdf.ln(6)
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.set_text_color(20, 40, 80)
+    pdf.cell(
+        0,
+        8,
+        "Scan Statistics",
+        border=0,
+        new_x=XPos.LMARGIN,
+        new_y=YPos.NEXT,
+    )
+
+    header_fill = (240, 244, 248)
+    row_alt_fill = (249, 251, 253)
+
+    # Table header
+    pdf.set_font("Helvetica", "B", 10)
+    pdf.set_fill_color(*header_fill)
+    pdf.set_draw_color(220, 223, 230)
+    pdf.set_text_color(20, 40, 80)
+    pdf.cell(
+        120,
+        8,
+        "Metric",
+        border=1,
+        align="L",
+        fill=True,
+        new_x=XPos.RIGHT,
+        new_y=YPos.TOP,
+    )
+    pdf.cell(
+        60,
+        8,
+        "Value",
+        border=1,
+        align="C",
+        fill=True,
+        new_x=XPos.LMARGIN,
+        new_y=YPos.NEXT,
+    )
+
+    # Table rows
+    pdf.set_font("Helvetica", "", 10)
+    pdf.set_text_color(20, 20, 20)
+    outcomes = data.outcomes
+    total_scanned = data.total
+    high_vulns = outcomes.get("high", 0)
+    medium_vulns = outcomes.get("medium", 0)
+    clean_scans = outcomes.get("clean", 0)
+    skipped_scans = outcomes.get("skipped", 0)
+    rate_limited_scans = outcomes.get("rate-limited", 0)
+    unreached_scans = outcomes.get("unreached", 0)
+    aborted_scans = outcomes.get("aborted", 0) + data.summary.get("paths_aborted", 0)
+
+    stats_rows = [
+        ("Total URLs scanned", str(total_scanned)),
+        ("High risk vulnerabilities", str(high_vulns)),
+        ("Medium risk vulnerabilities", str(medium_vulns)),
+        ("Clean scans", str(clean_scans)),
+        ("Skipped (CDN libraries)", str(skipped_scans)),
+        ("Rate limited (not checked)", str(rate_limited_scans)),
+        ("Unreached (connection errors)", str(unreached_scans)),
+        ("Aborted (target given up)", str(aborted_scans)),
+    ]
+    fill_toggle = False
+    for metric, value in stats_rows:
+        if fill_toggle:
+            pdf.set_fill_color(*row_alt_fill)
+        else:
+            pdf.set_fill_color(255, 255, 255)
+        fill_toggle = not fill_toggle
+        pdf.cell(
+            120,
+            7,
+            metric,
+            border=1,
+            align="L",
+            fill=True,
+            new_x=XPos.RIGHT,
+            new_y=YPos.TOP,
+        )
+        pdf.cell(
+            60,
+            7,
+            value,
+            border=1,
+            align="C",
+            fill=True,
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+
+    pdf.output(path)
+
+
+def _pdf_table_row(pdf, cells: list, height: float, fill: bool):
+    # cells: (width, text, align); the last one ends the line
+    for i, (width, text, align) in enumerate(cells):
+        last = i == len(cells) - 1
+        pdf.cell(
+            width,
+            height,
+            text,
+            border=1,
+            align=align,
+            fill=fill,
+            new_x=XPos.LMARGIN if last else XPos.RIGHT,
+            new_y=YPos.NEXT if last else YPos.TOP,
+        )
+
+
+# Summarized scan log for large scans: responses by status, then the top-N notable paths
+def _pdf_log_summary(pdf, data: ReportData, top: int):
+    header_fill = (240, 244, 248)
+    row_alt_fill = (249, 251, 253)
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.set_text_color(20, 40, 80)
+    pdf.cell(
+        0,
+        10,
+        "Scan Log Summary",
+        border=0,
+        align="C",
+        new_x=XPos.LMARGIN,
+        new_y=YPos.NEXT,
+    )
+    pdf.set_font("Helvetica", "I", 9)
+    pdf.set_text_color(90, 90, 90)
+    pdf.multi_cell(
+        0,
+        6,
+        f"{data.unique} paths scanned. The complete log is in the results file "
+        f"({os.path.basename(data.results_path)}); the HTML, CSV and JSON reports include it in full.",
+        border=0,
+        align="C",
+    )
+    pdf.ln(3)
+
+    # Responses by status, with a proportional bar
+    pdf.set_font("Helvetica", "B", 10)
+    pdf.set_fill_color(*header_fill)
+    pdf.set_draw_color(220, 223, 230)
+    pdf.set_text_color(20, 40, 80)
+    _pdf_table_row(pdf, [(30, "Status", "C"), (30, "Paths", "C"), (120, "", "L")], 8, True)
+    pdf.set_font("Helvetica", "", 9)
+    pdf.set_text_color(15, 15, 15)
+    statuses = sorted(data.statuses.items(), key=lambda item: -item[1])
+    largest = statuses[0][1] if statuses else 1
+    for i, (status, count) in enumerate(statuses):
+        pdf.set_fill_color(*(row_alt_fill if i % 2 else (255, 255, 255)))
+        y = pdf.get_y()
+        _pdf_table_row(pdf, [(30, status, "C"), (30, str(count), "C"), (120, "", "L")], 7, True)
+        pdf.set_fill_color(90, 130, 190)
+        pdf.rect(77, y + 1.5, max(0.5, 116 * count / largest), 4, style="F")
+
+    # Top-N notable responses
+    notable = data.notable[:top]
+    pdf.ln(6)
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.set_text_color(20, 40, 80)
+    pdf.cell(
+        0,
+        8,
+        f"Notable Responses (top {len(notable)})",
+        border=0,
+        new_x=XPos.LMARGIN,
+        new_y=YPos.NEXT,
+    )
+    if not notable:
+        pdf.set_font("Helvetica", "I", 10)
+        pdf.cell(
+            0,
+            8,
+            "Every path returned 404 or could not be checked.",
+            border=1,
+            align="C",
+            new_x=XPos.LMARGIN,
+            new_y=YPos.NEXT,
+        )
+        return
+    pdf.set_font("Helvetica", "B", 10)
+    pdf.set_fill_color(*header_fill)
+    _pdf_table_row(pdf, [(100, "Path", "L"), (25, "Status", "C"), (25, "Result", "C"), (25, "Type", "C")], 8, True)
+    pdf.set_font("Helvetica", "", 9)
+    for i, record in enumerate(notable):
+        pdf.set_fill_color(*(row_alt_fill if i % 2 else (255, 255, 255)))
+        outcome = record.get("vulnerability") or "clean"
+        path = record.get("path") or ""
+        pdf.set_text_color(*RESULT_COLORS.get(outcome, RESULT_COLORS["clean"]))
+        _pdf_table_row(pdf, [
+            (100, path[:95] + "..." if len(path) > 98 else path, "L"),
+            (25, str(record.get("status")), "C"),
+            (25, RESULT_LABELS.get(outcome, "CLEAN"), "C"),
+            (25, record.get("type") or "", "C"),
+        ], 7, True)
+    pdf.set_text_color(15, 15, 15)
+
+
+# HTML report: static summary and findings, the log embedded as JSON rows and paged in the browser
+HTML_STYLE = """
+body{font-family:Helvetica,Arial,sans-serif;margin:2em auto;max-width:1100px;color:#141414}
+h1{color:#142850;margin-bottom:0}h2{color:#142850;margin-top:1.6em}
+.meta{color:#555;margin-top:.3em}.note{color:#c87800}.alert{color:#c81e1e}
+table{border-collapse:collapse;width:100%;font-size:13px}
+th,td{border:1px solid #dcdfe6;padding:4px 8px;text-align:left;word-break:break-all}
+th{background:#f0f4f8;color:#142850}tr:nth-child(even) td{background:#f9fbfd}
+.high{color:#c81e1e;font-weight:bold}.medium{color:#c87814;font-weight:bold}.clean{color:#1e8c32}
+.skipped,.rate-limited,.unreached,.aborted{color:#787878}
+.bar{background:#5a82be;height:10px}
+#pager{margin:.6em 0}#pager button{margin-right:.4em}
+"""
+
+HTML_SCRIPT = """
+const rows = LOG;
+let view = rows, page = 0;
+const body = document.getElementById("log-rows"), info = document.getElementById("page-info");
+function esc(s) { return String(s).replace(/[&<>"]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})[c]); }
+function show() {
+  const pages = Math.max(1, Math.ceil(view.length / PAGE_SIZE));
+  page = Math.min(Math.max(page, 0), pages - 1);
+  body.innerHTML = view.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE).map(r =>
+    `<tr><td>${esc(r[0])}</td><td>${esc(r[1])}</td><td class="${esc(r[2])}">${esc(LABELS[r[2]] || r[2])}</td><td>${esc(r[3])}</td></tr>`).join("");
+  info.textContent = `Page ${page + 1} of ${pages} (${view.length} paths)`;
+}
+function apply() {
+  const text = document.getElementById("log-search").value.toLowerCase();
+  const result = document.getElementById("log-result").value;
+  view = rows.filter(r => (!result || r[2] === result) && (!text || r[0].toLowerCase().includes(text)));
+  page = 0; show();
+}
+document.getElementById("log-search").addEventListener("input", apply);
+document.getElementById("log-result").addEventListener("change", apply);
+document.getElementById("prev").addEventListener("click", () => { page--; show(); });
+document.getElementById("next").addEventListener("click", () => { page++; show(); });
+show();
+"""
+
+
+def _script_json(value) -> str:
+    # Safe inside <script>: no "</script>" can close the tag early
+    return json.dumps(value, separators=(",", ":")).replace("</", "<\\/")
+
+
+def render_html(data: ReportData, path: str, settings: dict):
+    esc = html.escape
+    details = data.scan_details
+    counters = data.counters
+    with open(path, "w", encoding="utf-8") as out:
+        out.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+                  f"<title>Security scan: {esc(str(details.get('company_name', '')))}</title>"
+                  f"<style>{HTML_STYLE}</style></head><body>\n")
+        out.write("<h1>Website Security Scan Report</h1>\n")
+        out.write(f"<p class=\"meta\">Company: {esc(str(details.get('company_name', '')))}<br>"
+                  f"Target URL: {esc(str(details.get('target_url', '')))}<br>"
+                  f"Scan Date: {esc(str(details.get('scan_date', '')))}</p>\n")
+
+        out.write("<h2>Scan Summary</h2>\n<p>")
+        out.write(f"Files scanned: {counters.get('files', 0)}<br>"
+                  f"Directories scanned: {counters.get('directories', 0)}<br>"
+                  f"Potential issues found: {len(data.findings)}</p>\n")
+        changes = data.finding_changes
+        if changes:
+            out.write(f"<p>Since the last scan: {changes.get('new', 0)} new, {changes.get('changed', 0)} changed, "
+                      f"{changes.get('carried-over', 0)} carried over</p>\n")
+        if data.aborted:
+            out.write(f"<p class=\"alert\">Target aborted after repeated connection failures "
+                      f"({esc(data.describe_failures())}); the remaining paths were not scanned</p>\n")
+        if data.interrupted:
+            out.write(f"<p class=\"note\">Scan interrupted before completion: results cover "
+                      f"{data.summary.get('paths_scanned', data.total)} paths only</p>\n")
+
+        out.write("<h2>Details</h2>\n")
+        if not data.findings:
+            out.write("<p><em>No security issues detected.</em></p>\n")
+        else:
+            change_header = "<th>Change</th>" if changes else ""
+            out.write(f"<table><tr><th>Level</th><th>Type</th>{change_header}<th>URL</th><th>Notes</th></tr>\n")
+            for f in data.findings:
+                level = f.get("level") or ""
+                change = f"<td>{esc(f.get('change', ''))}</td>" if changes else ""
+                out.write(f"<tr><td class=\"{esc(level)}\">{esc(level.upper())}</td>"
+                          f"<td>{esc((f.get('type') or '').capitalize())}</td>{change}"
+                          f"<td>{esc(f.get('url') or '')}</td><td>{esc(f.get('notes') or '')}</td></tr>\n")
+            out.write("</table>\n")
+
+        out.write("<h2>Scan Statistics</h2>\n<table><tr><th>Result</th><th>Paths</th></tr>\n")
+        out.write(f"<tr><td>Total URLs scanned</td><td>{data.total}</td></tr>\n")
+        for outcome, count in sorted(data.outcomes.items(), key=lambda item: -item[1]):
+            out.write(f"<tr><td class=\"{esc(outcome)}\">{esc(RESULT_LABELS.get(outcome, outcome))}</td>"
+                      f"<td>{count}</td></tr>\n")
+        if data.summary.get("paths_aborted"):
+            out.write(f"<tr><td class=\"aborted\">ABORT (not started)</td><td>{data.summary['paths_aborted']}</td></tr>\n")
+        out.write("</table>\n")
+
+        out.write("<h2>Responses by Status</h2>\n<table><tr><th>Status</th><th>Paths</th><th></th></tr>\n")
+        statuses = sorted(data.statuses.items(), key=lambda item: -item[1])
+        largest = statuses[0][1] if statuses else 1
+        for status, count in statuses:
+            out.write(f"<tr><td>{esc(status)}</td><td>{count}</td><td style=\"width:60%\">"
+                      f"<div class=\"bar\" style=\"width:{max(0.5, 100 * count / largest):.1f}%\"></div></td></tr>\n")
+        out.write("</table>\n")
+
+        out.write("<h2>Complete Scan Log</h2>\n<div id=\"pager\">"
+                  "<input id=\"log-search\" placeholder=\"Filter paths\"> <select id=\"log-result\"><option value=\"\">All results</option>")
+        for outcome in data.outcomes:
+            out.write(f"<option value=\"{esc(outcome)}\">{esc(RESULT_LABELS.get(outcome, outcome))}</option>")
+        out.write("</select> <button id=\"prev\">&lt;</button><button id=\"next\">&gt;</button> <span id=\"page-info\"></span></div>\n")
+        out.write("<noscript><p>The scan log needs JavaScript; see the CSV or JSON report.</p></noscript>\n")
+        out.write("<table><thead><tr><th>Path</th><th>Status</th><th>Result</th><th>Type</th></tr></thead>"
+                  "<tbody id=\"log-rows\"></tbody></table>\n")
+
+        # Rows are written as they are read, a compact array per path
+        out.write(f"<script>\nconst PAGE_SIZE = {max(1, settings.get('html_page_size', 200))};\n"
+                  f"const LABELS = {_script_json(RESULT_LABELS)};\nconst LOG = [\n")
+        for record in data.log_rows():
+            status = record.get("status")
+            row = [record.get("path") or "", "" if status is None else status,
+                   record.get("vulnerability") or "clean", record.get("type") or ""]
+            out.write(_script_json(row) + ",\n")
+        out.write(f"];\n{HTML_SCRIPT}</script>\n</body></html>\n")
+
+
+CSV_COLUMNS = ["path", "url", "type", "status", "result", "error", "level", "change", "notes"]
+
+
+def render_csv(data: ReportData, path: str, settings: dict):
+    """One row per scanned path; level and notes are filled in for findings"""
+    findings = {f.get("url"): f for f in data.findings}
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(CSV_COLUMNS)
+        for record in data.log_rows():
+            finding = findings.get(record.get("url"), {})
+            status = record.get("status")
+            writer.writerow([
+                record.get("path") or "",
+                record.get("url") or "",
+                record.get("type") or "",
+                "" if status is None else status,
+                record.get("vulnerability") or "clean",
+                record.get("error") or "",
+                finding.get("level", ""),
+                finding.get("change", ""),
+                finding.get("notes", ""),
+            ])
+
+
+def render_json(data: ReportData, path: str, settings: dict):
+    """Scan details, statistics and findings, then the log streamed into a "log" array"""
+    head = {
+        "scan": {k: v for k, v in data.scan_details.items() if k != "kind"},
+        "statistics": {
+            "total": data.total,
+            "paths": data.unique,
+            "counters": data.counters,
+            "outcomes": data.outcomes,
+            "statuses": data.statuses,
+            "interrupted": data.interrupted,
+            "aborted": data.aborted,
+            "paths_aborted": data.summary.get("paths_aborted", 0),
+            "connection_failures": data.summary.get("connection_failures", {}),
+            "finding_changes": data.finding_changes,
+        },
+        "findings": [{k: v for k, v in f.items() if k != "kind"} for f in data.findings],
+    }
+    with open(path, "w", encoding="utf-8") as out:
+        # Open the head object, then append the log array before its closing brace
+        out.write(json.dumps(head, indent=1, default=str)[:-2] + ",\n \"log\": [")
+        first = True
+        for record in data.log_rows():
+            record.pop("kind", None)
+            out.write(("\n  " if first else ",\n  ") + json.dumps(record, separators=(",", ":"), default=str))
+            first = False
+        out.write("\n ]\n}\n")
+
+
+RENDERERS = {
+    "pdf": render_pdf,
+    "html": render_html,
+    "csv": render_csv,
+    "json": render_json,
+}
+
+
+def write_reports(results_path: str, base: str, formats: list, settings: dict, timer=None) -> list:
+    """Render each requested format to `base` + its extension; returns the written paths.
+    With a StageTimer (timing.py), reading the results file and each format are timed as stages."""
+    def timed(stage, fn, *args):
+        return fn(*args) if timer is None else timer.call(stage, fn, *args)
+
+    data = timed("report_data", ReportData, results_path, settings.get("top", 50))
+    paths = []
+    for fmt in formats:
+        path = base + REPORT_EXTENSIONS[fmt]
+        timed(f"report_{fmt}", RENDERERS[fmt], data, path, settings)
+        paths.append(path)
+    return paths
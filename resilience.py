@@ -0,0 +1,85 @@
+# Per-host failure handling: error classification, retry backoff and a circuit breaker.
+#
+# A dead or blocking host used to be sent every remaining path, each one
+# waiting out the full timeout. Failed requests are now classified, transient
+# failures are retried after a jittered exponential backoff, and a breaker
+# per host trips after a run of consecutive failures: the host is paused for
+# a cooldown (then probed again), and after too many trips - or on the first
+# one with the "abort" policy - the rest of that target is given up.
+import asyncio
+import random
+import socket
+import ssl
+
+import aiohttp
+
+# Error kinds reported by classify_error()
+ERROR_KINDS = ("dns", "connect", "tls", "timeout", "reset", "error")
+
+# Worth retrying: the same request may well succeed a moment later
+TRANSIENT_ERRORS = ("connect", "timeout", "reset")
+
+
+def classify_error(exc: BaseException) -> str:
+    if isinstance(exc, (ssl.SSLError, ssl.CertificateError, aiohttp.ClientSSLError)):
+        return "tls"
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(exc, aiohttp.ClientConnectorError):
+        if isinstance(getattr(exc, "os_error", None), socket.gaierror):
+            return "dns"
+        return "connect"
+    if isinstance(exc, socket.gaierror):
+        return "dns"
+    if isinstance(exc, (aiohttp.ServerDisconnectedError, aiohttp.ClientPayloadError, ConnectionResetError,
+                        BrokenPipeError)):
+        return "reset"
+    if isinstance(exc, (aiohttp.ClientOSError, ConnectionError)):
+        return "connect"
+    return "error"
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 10.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, base * 2^attempt), capped"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 8, cooldown: float = 30.0, max_trips: int = 3, abort_on_trip: bool = False):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.max_trips = max(1, max_trips)
+        self.abort_on_trip = abort_on_trip
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.aborted = False
+        # Failure counts by kind, for the report
+        self.failures = {}
+        self.last_error = ""
+
+    def record_success(self):
+        self.consecutive_failures = 0
+
+    def record_failure(self, kind: str) -> str:
+        """Count a failed request; returns "", "pause" (host should rest for `cooldown`) or "abort" """
+        self.failures[kind] = self.failures.get(kind, 0) + 1
+        self.last_error = kind
+        if self.aborted:
+            return ""
+        self.consecutive_failures += 1
+        if self.consecutive_failures < self.threshold:
+            return ""
+        self.trips += 1
+        if self.abort_on_trip or self.trips >= self.max_trips:
+            self.aborted = True
+            return "abort"
+        # Half-open after the cooldown: one more failure trips the breaker again
+        self.consecutive_failures = self.threshold - 1
+        return "pause"
+
+    def pause_seconds(self) -> float:
+        # Each trip rests the host twice as long as the last one
+        return self.cooldown * 2 ** (self.trips - 1)
+
+    def describe(self) -> str:
+        return ", ".join(f"{count} {kind}" for kind, count in sorted(self.failures.items()))
@@ -0,0 +1,137 @@
+# Per-URL memory of earlier scans, for conditional re-scans.
+#
+# For every response that was classified from its content (a 200) or that
+# produced a finding, the store keeps the ETag and Last-Modified validators,
+# a hash of a fixed-length body prefix (scanner.DIGEST_BYTES), and the probe
+# and finding records.
+# The next scan of the target sends If-None-Match / If-Modified-Since; a 304,
+# or a 200 whose content hash is unchanged, reuses the stored classification
+# instead of scoring the body and triaging it with the AI again.
+#
+# Entries are written during the scan in batches (by count or age, like the
+# checkpoint's records), so memory stays flat over a large target and a crash
+# loses at most the last batch. An AI verdict that lands after its entry was
+# written is saved by remembering the finding again.
+import hashlib
+import json
+import sqlite3
+import time
+from typing import NamedTuple, Optional
+
+
+class StoredResponse(NamedTuple):
+    etag: str
+    last_modified: str
+    content_hash: str
+    probe: dict
+    finding: Optional[dict]
+
+
+def content_hash(*parts) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8", errors="ignore"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def conditional_headers(previous: Optional[StoredResponse]) -> dict:
+    if previous is None:
+        return {}
+    headers = {}
+    if previous.etag:
+        headers["If-None-Match"] = previous.etag
+    if previous.last_modified:
+        headers["If-Modified-Since"] = previous.last_modified
+    return headers
+
+
+def is_unchanged(previous: StoredResponse, status: Optional[int], digest: str) -> bool:
+    """Whether a new response can reuse the stored classification"""
+    if status == 304:
+        return True
+    if status == 200:
+        return bool(previous.content_hash) and digest == previous.content_hash
+    # Classified from the status line alone (e.g. 403 on a sensitive path): same status, same verdict
+    return status is not None and status == previous.probe.get("status")
+
+
+class ResponseStore:
+    def __init__(self, path: str, batch_size: int = 500, interval: float = 5.0):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        # url -> fields remembered and not written yet
+        self.pending = {}
+        self.last_commit = time.monotonic()
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, target TEXT NOT NULL, etag TEXT NOT NULL, last_modified TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL, probe TEXT NOT NULL, finding TEXT, updated REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_target ON responses (target)")
+        self.db.commit()
+
+    def load(self, target: str) -> dict:
+        """Stored responses of one target, by URL"""
+        rows = self.db.execute(
+            "SELECT url, etag, last_modified, content_hash, probe, finding FROM responses WHERE target = ?", (target,)
+        )
+        return {
+            url: StoredResponse(etag, last_modified, digest, json.loads(probe), json.loads(finding) if finding else None)
+            for url, etag, last_modified, digest, probe, finding in rows
+        }
+
+    def remember(self, target: str, url: str, **fields):
+        """Merge fields (probe, finding, etag, last_modified, content_hash) into the URL's pending entry.
+        The finding dict is kept by reference, so an AI verdict landing later is still saved."""
+        self.pending.setdefault(url, {"target": target}).update(fields)
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_commit >= self.interval:
+            self._write(complete_only=True)
+
+    def flush(self, target: Optional[str] = None):
+        """Write the pending entries (of one target, or all)"""
+        self._write(target)
+
+    def _write(self, target: Optional[str] = None, complete_only: bool = False):
+        # A finding is remembered just before its probe; mid-scan batches leave it until the probe is in
+        rows, stale, verdicts = [], [], []
+        now = time.time()
+        for url, entry in list(self.pending.items()):
+            if target is not None and entry["target"] != target:
+                continue
+            probe = entry.get("probe")
+            if probe is None and complete_only:
+                continue
+            del self.pending[url]
+            finding = entry.get("finding")
+            if probe is None:
+                if finding is not None:
+                    # A late AI verdict for an entry written earlier
+                    verdicts.append((json.dumps(self._stored_finding(finding), default=str), url))
+                continue
+            if probe.get("status") != 200 and finding is None:
+                # Nothing worth revalidating any more
+                stale.append((url,))
+                continue
+            if finding is not None:
+                finding = self._stored_finding(finding)
+            rows.append((url, entry["target"], entry.get("etag", ""), entry.get("last_modified", ""),
+                         entry.get("content_hash", ""), json.dumps(probe, default=str),
+                         json.dumps(finding, default=str) if finding is not None else None, now))
+        self.db.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.db.executemany("DELETE FROM responses WHERE url = ?", stale)
+        self.db.executemany("UPDATE responses SET finding = ? WHERE url = ?", verdicts)
+        self.db.commit()
+        self.last_commit = time.monotonic()
+
+    @staticmethod
+    def _stored_finding(finding: dict) -> dict:
+        return {k: v for k, v in finding.items() if k not in ("id", "kind", "change")}
+
+    def close(self):
+        self.flush()
+        self.db.close()
@@ -0,0 +1,72 @@
+# Append-only JSONL record of a scan.
+#
+# Every probe result and finding is written out as one JSON line as soon as
+# it is produced, instead of being kept in memory until the report is built.
+# Writes are buffered and flushed at most every `flush_interval` seconds, so
+# the file can be tailed while the scan runs and a crash loses at most the
+# last interval. Reports are then built by streaming the records back.
+#
+# Record kinds: "scan" (target details, first line), "probe" (one scanned
+# URL), "finding", "notes" (an AI verdict for an earlier finding, by id) and
+# "summary" (counters, last line of a completed scan).
+import gzip
+import json
+import time
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8", buffering=64 * 1024)
+
+
+class ResultSink:
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        """Gzip-compressed when `path` ends in .gz"""
+        self.path = path
+        self.flush_interval = flush_interval
+        self.file = _open(path, "w")
+        self.count = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, record: dict):
+        self.file.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        self.count += 1
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        # For gzip this is a sync flush: everything written so far can be decompressed
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+def read_records(path: str, kind: str = None):
+    """Yield the records of a results file, optionally only those of one kind.
+    A file cut short by a crash is read up to its last complete line."""
+    with _open(path, "r") as f:
+        try:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if kind is None or record.get("kind") == kind:
+                    yield record
+        except (EOFError, gzip.BadGzipFile):
+            return
+
+
+def load_findings(path: str) -> list:
+    """Findings in the order they were found, with any later AI notes applied"""
+    findings = {}
+    for record in read_records(path):
+        if record.get("kind") == "finding":
+            findings[record["id"]] = record
+        elif record.get("kind") == "notes" and record.get("id") in findings:
+            findings[record["id"]]["notes"] = record.get("notes", "")
+    return list(findings.values())
@@ -0,0 +1,1372 @@
+# Embeddable scan engine.
+#
+# A Scanner owns everything a scan needs: its settings, the HTTP transport, the
+# request limit shared by its targets, the AI triage pipeline and verdict
+# cache, the analysis pool, and optionally a checkpoint and response store.
+# Nothing is kept in module globals, so several scanners (or several targets
+# of one scanner) can run side by side in one event loop. Each target is a
+# ScanSession holding its own pacing, circuit breaker, soft-404 baseline,
+# results file and counters. scan() runs one and yields its result records
+# (the same records that go to the results file) as they are written:
+#
+#   async with Scanner(speed="fast") as scanner:
+#       async for record in scanner.scan("https://example.com", "Example Ltd"):
+#           if record["kind"] == "finding":
+#               print(record["level"], record["url"])
+#
+# app.py is the command-line front end to this module.
+import asyncio
+import codecs
+import functools
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from urllib.parse import urljoin, urlparse
+
+from ai_triage import TriagePipeline
+from ai_cache import VerdictCache
+from keyword_matcher import KeywordMatcher, KeywordStream
+from analysis import AnalysisPool, SOFT_404_MIN_CHARS, looks_like_soft_404, page_fingerprint
+from html_extract import script_srcs
+from path_classifier import PathClassifier, PathInfo
+from wordlists import Wordlist, normalize_path_key
+from response_store import conditional_headers, content_hash, is_unchanged
+from scheduler import Scheduler
+from frontier import Frontier
+from rate_control import RateController, THROTTLE_STATUSES, make_controller, parse_retry_after
+from resilience import CircuitBreaker, TRANSIENT_ERRORS, backoff_delay, classify_error
+from result_sink import ResultSink
+from reporting import write_reports
+from timing import StageTimer
+from metrics import MetricsExporter, RequestTiming, ScanMetrics
+from transport import open_transport
+
+
+# ANSI color codes for console output
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    PURPLE = '\033[95m'
+    CYAN = '\033[96m'
+    WHITE = '\033[97m'
+    BOLD = '\033[1m'
+    END = '\033[0m'
+
+
+# Default settings; a Scanner copies these and applies its own overrides
+
+# AI verdict cache location and limits
+AI_CACHE_SETTINGS = {
+    "path": "ai_verdict_cache.sqlite",
+    "ttl_seconds": 30 * 24 * 3600,
+    "max_entries": 10000,
+}
+
+# Pool for CPU-bound response analysis (see analysis.py)
+ANALYSIS_SETTINGS = {
+    "mode": "auto",         # process, thread or inline; auto = thread pool on multi-core machines
+    "workers": 0,           # 0 = one per core
+    "max_pending": 0,       # bodies submitted or waiting for the pool; 0 = two per worker
+}
+
+# AI triage workers and their shared rate/token budgets
+AI_TRIAGE_SETTINGS = {
+    "workers": 2,
+    "queue_size": 100,
+    "requests_per_minute": 60,
+    "tokens_per_minute": 40000,
+}
+
+# Per-host pacing: --speed picks the starting point, the controller adapts within these limits
+# (None = the preset's default; see rate_control.SPEED_PRESETS)
+RATE_SETTINGS = {
+    "adaptive": True,
+    "min_concurrency": 1,
+    "max_concurrency": None,
+    "min_delay": None,
+    "max_delay": 10.0,
+}
+
+# Times a request is retried after a 429/503 (the host is paused in between)
+THROTTLE_RETRIES = 3
+
+# Connection failures: retries for transient errors, and when to stop hammering a failing host
+RESILIENCE_SETTINGS = {
+    "retries": 2,
+    "threshold": 8,        # consecutive failures that trip a host's circuit breaker
+    "cooldown": 30.0,      # seconds the host rests after the first trip (doubles per trip)
+    "max_trips": 3,        # trips before the target is aborted
+    "abort_on_trip": False,
+}
+
+# Results files (one JSONL per target, see result_sink.py): flushed at most this often
+RESULT_SETTINGS = {
+    "compress": False,
+    "flush_interval": 1.0,
+}
+
+# Reports rendered from each results file (see reporting.py)
+REPORT_SETTINGS = {
+    "formats": ["pdf"],
+    "pdf_log": "auto",              # full, summary or none; auto = full up to pdf_full_log_limit paths
+    "pdf_full_log_limit": 2000,
+    "top": 50,                      # notable responses listed in a summarized log
+    "html_page_size": 200,
+}
+
+# Recursive discovery beneath confirmed directories (see frontier.py); off by default
+RECURSION_SETTINGS = {
+    "enabled": False,
+    "max_depth": 2,         # levels of children below a wordlist directory
+    "budget": 2000,         # child probes per target
+}
+
+# HTTP client (see transport.py); pool_size 0 = the scanner's request limit
+TRANSPORT_SETTINGS = {
+    "backend": "aiohttp",       # or "httpx", which can multiplex probes over HTTP/2
+    "http2": True,              # httpx only; needs the h2 package
+    "pool_size": 0,
+    "keepalive": 15.0,          # seconds an idle connection is kept for reuse
+    "dns_ttl": 300.0,           # aiohttp only; 0 = resolve every new connection
+    "timeout": 20.0,            # whole request, headers and (capped) body
+    "connect_timeout": 10.0,
+    "read_timeout": 20.0,       # longest wait for the next bytes of a response
+}
+
+# Per-request phase timings (see metrics.py): always collected, exported only when asked
+METRICS_SETTINGS = {
+    "json": "",             # JSON summary written when the scanner closes
+    "prometheus": "",       # Prometheus text file, rewritten every `interval` seconds
+    "port": 0,              # serve the same text on http://127.0.0.1:PORT/metrics
+    "interval": 10.0,
+    "slowest": 10,          # slowest requests kept per host
+}
+
+# Sensitive directories that should not be publicly accessible
+SENSITIVE_DIRECTORIES = [
+    "admin", "administrator", "admin1", "admin2", "admin_area", "admin_panel",
+    "admin/login", "adminconsole", "admincontrol", "cpanel", "backend", "admincp",
+    "admin-console", "cmsadmin", "root", "superuser", "system_admin", "dashboard",
+    "backup", "backups", "db_backup", "site-backup", "website_backup",
+    "uploads", "upload", "tmp", "temp", "files", "public_files", "private_files",
+    "secret", "private", "old_site", "bk", "old", "archive",
+    "logs", "log", "debug", "error", "access", "server",
+    "config", "configuration", "settings", "env", "environment",
+    "database", "db", "mysql", "sql", "dump", "data",
+    "git", "svn", "hg", "bzr", "cvs",
+    "test", "tests", "testing", "dev", "development", "staging", "sandbox", "demo",
+    "example", "examples", "docs", "documentation", "doc",
+    "wp-admin", "wp-content", "joomla", "drupal", "magento", "prestashop",
+    "img", "images", "img/", "images/","bk", "bk/", "backup", "backup/", "backups", "backups/",
+    # Modern frameworks and package dirs
+    "storage", "storage/logs", "storage/app", "storage/framework", "bootstrap/cache",
+    "var", "var/log",
+    "vendor", "node_modules",
+    # Admin tools
+    "phpmyadmin", "phppgadmin", "_debugbar",
+    # Well-known endpoints folder
+    ".well-known"
+]
+
+# Suspicious file names/extensions that should not be publicly downloadable
+SUSPICIOUS_FILE_EXTENSIONS = {
+    "zip", "7z", "rar", "tar", "gz", "bz2",
+    "sql", "sqlite", "db", "bak", "backup",
+    "env", "pem", "key", "pfx", "cer",
+}
+
+# Sensitive-prefix index and extension lookup, built once at load time (read-only, shared by every scanner)
+path_classifier = PathClassifier(SENSITIVE_DIRECTORIES, SUSPICIOUS_FILE_EXTENSIONS)
+
+
+def is_sensitive_directory(path: str) -> bool:
+    """Check if a path represents a sensitive directory that should not be publicly accessible"""
+    return path_classifier.is_sensitive(path)
+
+
+def is_suspicious_file(path: str) -> bool:
+    return path_classifier.classify(path).suspicious
+
+
+def path_looks_like_directory(path: str) -> bool:
+    """Heuristic: consider it a directory if it ends with '/', or the last segment has no dot and matches sensitive dir names."""
+    return path_classifier.classify(path).is_dir
+
+
+def normalize_target_url(target_url: str) -> str:
+    """Ensure a target URL has a protocol (https:// by default)"""
+    target_url = target_url.strip()
+    if not target_url.startswith(('http://', 'https://')):
+        target_url = 'https://' + target_url
+    return target_url
+
+
+def ensure_trailing_slash(url: str) -> str:
+    return url if url.endswith('/') else url + '/'
+
+
+# Sensitive directories and suspicious files are probed ahead of the rest of the queued paths
+def path_priority(info: PathInfo) -> int:
+    return 0 if info.sensitive or info.suspicious else 1
+
+
+# Keyword tiers for content sensitivity scoring, most severe first (a Scanner may be given its own)
+KEYWORD_TIERS = {
+    "high": ["password", "secret", "api_key", "aws_access_key", "private_key", "credentials"],
+    "medium": ["token", "auth", "key", "user", "email"],
+}
+
+# Compiled once for the default tiers
+keyword_matcher = KeywordMatcher(KEYWORD_TIERS)
+
+
+# Content sensitivity scoring (simple keyword check)
+def score_content_sensitivity(content: str) -> str:
+    return keyword_matcher.score(content)
+
+
+def keyword_evidence(matches: list) -> list:
+    return [{"keyword": keyword, "tier": tier, "offset": offset} for keyword, tier, offset in matches]
+
+
+def describe_keywords(matches: list, tier: str, limit: int = 3) -> str:
+    names = [keyword for keyword, t, _ in matches if t == tier]
+    return ", ".join(names[:limit]) + (", ..." if len(names) > limit else "")
+
+
+# Maximum body bytes read per probe type; 0 means status only (stop after the headers).
+# Peak memory is roughly concurrency x cap instead of the size of the largest file on the target.
+BODY_CAPS = {
+    "file": 1024,                # suspicious downloadable files: only the first bytes, kept as evidence
+    "page": 1024 * 1024,         # paths whose content is scored and soft-404 checked
+    "js": 4 * 1024 * 1024,       # linked JavaScript bundles
+    "baseline": 256 * 1024,      # soft-404 baseline page
+}
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Body bytes behind the response store's content hash. The hash always covers exactly this prefix
+# (or the whole body if shorter), read on past an early keyword stop, so it never depends on chunking.
+DIGEST_BYTES = 64 * 1024
+
+# Small bodies we don't need are still drained so the keep-alive connection can be reused;
+# anything larger is abandoned and the connection closed instead of downloaded
+DRAIN_LIMIT_BYTES = 64 * 1024
+
+# How suspicious downloadable files are probed: "range" (GET with Range: bytes=0-N) or "head".
+# Either way a plain capped GET is only used when the server rejects the probe.
+FILE_PROBE_METHODS = ("range", "head")
+
+# Statuses that mean the server does not support the HEAD/Range probe itself
+PROBE_REJECTED_STATUSES = (400, 405, 416, 501)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+@dataclass
+class FetchResult:
+    status: Optional[int]
+    text: str = ""
+    bytes_read: int = 0
+    truncated: bool = False
+    # Seconds from a Retry-After header on a 429/503
+    retry_after: Optional[float] = None
+    # Why no response was received (see resilience.classify_error), or "aborted"
+    error: str = ""
+    # Seconds from sending the request to the end of the read (set by limited_fetch)
+    elapsed: float = 0.0
+    # Validators for conditional re-scans
+    etag: str = ""
+    last_modified: str = ""
+    # Evidence for file probes
+    method: str = "GET"
+    content_type: str = ""
+    content_length: Optional[int] = None
+    first_bytes: bytes = b""
+    # Hash of the first DIGEST_BYTES of a streamed body and its Content-Length (only when asked for)
+    body_digest: str = ""
+
+
+def _retry_after(resp) -> Optional[float]:
+    if resp.status not in THROTTLE_STATUSES:
+        return None
+    return parse_retry_after(resp.headers.get("Retry-After", ""))
+
+
+async def _drain_small_body(resp):
+    drained = 0
+    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_BYTES):
+        drained += len(chunk)
+        if drained > DRAIN_LIMIT_BYTES:
+            break
+
+
+async def _read_capped(resp, max_bytes: int, scorer: Optional[KeywordStream], timer: Optional[StageTimer] = None,
+                       digest_bytes: int = 0) -> FetchResult:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    parts = []
+    bytes_read = 0
+    truncated = False
+    digest_limit = min(digest_bytes, max_bytes)
+    prefix = bytearray()
+    stopped_early = False
+    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_BYTES):
+        if bytes_read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - bytes_read]
+            truncated = True
+        bytes_read += len(chunk)
+        prefix += chunk[:digest_limit - len(prefix)]
+        text = decoder.decode(chunk)
+        parts.append(text)
+        if truncated:
+            break
+        if scorer is not None and (scorer.feed(text) if timer is None else timer.call("keywords", scorer.feed, text)):
+            stopped_early = True
+            break
+    if stopped_early:
+        # Where the scorer stops depends on chunk sizes; finish the digest prefix so the hash doesn't
+        if len(prefix) < digest_limit:
+            async for chunk in resp.content.iter_chunked(STREAM_CHUNK_BYTES):
+                chunk = chunk[:digest_limit - len(prefix)]
+                bytes_read += len(chunk)
+                prefix += chunk
+                if len(prefix) >= digest_limit:
+                    break
+        truncated = not resp.content.at_eof()
+    parts.append(decoder.decode(b"", final=True))
+    body_digest = content_hash(bytes(prefix), resp.headers.get("Content-Length", "")) if digest_limit > 0 else ""
+    return FetchResult(resp.status, "".join(parts), bytes_read, truncated,
+                       etag=resp.headers.get("ETag", ""), last_modified=resp.headers.get("Last-Modified", ""),
+                       body_digest=body_digest)
+
+
+async def _get(transport, url: str, headers: Optional[dict], max_bytes: int, scorer: Optional[KeywordStream],
+               timer: Optional[StageTimer] = None, trace: Optional[RequestTiming] = None,
+               digest_bytes: int = 0) -> FetchResult:
+    async with transport.request("GET", url, headers, trace) as resp:
+        # Only 200 bodies are ever analysed; everything else is decided by the status line
+        if resp.status != 200 or max_bytes <= 0:
+            await _drain_small_body(resp)
+            return FetchResult(resp.status, retry_after=_retry_after(resp))
+        return await _read_capped(resp, max_bytes, scorer, timer, digest_bytes)
+
+
+def _total_length(resp) -> Optional[int]:
+    # "Content-Range: bytes 0-1023/52428800" carries the full size on a 206
+    content_range = resp.headers.get("Content-Range", "")
+    total = content_range.rpartition("/")[2]
+    if total.isdigit():
+        return int(total)
+    length = resp.headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else None
+
+
+async def _file_evidence(resp, method: str, max_bytes: int) -> FetchResult:
+    first_bytes = b""
+    if max_bytes > 0 and method != "HEAD":
+        async for chunk in resp.content.iter_chunked(max_bytes):
+            first_bytes = chunk[:max_bytes]
+            break
+    # A 206 means the file is there; report it like the 200 the rest of the scanner expects
+    return FetchResult(
+        200,
+        bytes_read=len(first_bytes),
+        truncated=not resp.content.at_eof(),
+        method=method,
+        content_type=resp.headers.get("Content-Type", ""),
+        content_length=_total_length(resp),
+        first_bytes=first_bytes,
+        etag=resp.headers.get("ETag", ""),
+        last_modified=resp.headers.get("Last-Modified", ""),
+    )
+
+
+async def _probe_file(transport, url: str, headers: Optional[dict], max_bytes: int, scorer=None, timer=None,
+                      trace=None, file_probe: str = "range") -> FetchResult:
+    """HEAD or Range probe for downloadable files; falls back to a capped GET if the server rejects it"""
+    if file_probe == "head" or max_bytes <= 0:
+        method, request = "HEAD", transport.request("HEAD", url, headers, trace)
+    else:
+        range_headers = dict(headers or {}, Range=f"bytes=0-{max_bytes - 1}")
+        method, request = "RANGE", transport.request("GET", url, range_headers, trace)
+    async with request as resp:
+        if resp.status in (200, 206):
+            # A 200 to a Range request means it was ignored; the read still stops at the cap
+            return await _file_evidence(resp, method if resp.status == 206 or method == "HEAD" else "GET", max_bytes)
+        if resp.status not in PROBE_REJECTED_STATUSES:
+            await _drain_small_body(resp)
+            return FetchResult(resp.status, retry_after=_retry_after(resp), method=method)
+        await _drain_small_body(resp)
+    async with transport.request("GET", url, headers, trace) as resp:
+        if resp.status != 200:
+            await _drain_small_body(resp)
+            return FetchResult(resp.status, retry_after=_retry_after(resp))
+        return await _file_evidence(resp, "GET", max_bytes)
+
+
+# Async streaming fetch with per-probe body cap (robust for binary content) and localhost http fallback.
+# The User-Agent and timeouts are set on the transport; `extra_headers` are only this request's own.
+async def fetch(transport, url, probe: str = "page", scorer: Optional[KeywordStream] = None,
+                extra_headers: Optional[dict] = None, body_caps: Optional[dict] = None,
+                file_probe: str = "range", timer: Optional[StageTimer] = None,
+                trace: Optional[RequestTiming] = None, digest_bytes: int = 0) -> FetchResult:
+    headers = extra_headers or None
+    body_caps = body_caps or BODY_CAPS
+    max_bytes = body_caps.get(probe, body_caps["page"])
+    if probe == "file":
+        reader = functools.partial(_probe_file, file_probe=file_probe)
+    else:
+        reader = functools.partial(_get, digest_bytes=digest_bytes)
+    try:
+        return await reader(transport, url, headers, max_bytes, scorer, timer, trace)
+    except Exception as e:
+        error = e
+        # If HTTPS to localhost/127.0.0.1 fails, retry with HTTP
+        try:
+            if url.startswith("https://localhost") or url.startswith("https://127.0.0.1"):
+                http_url = "http://" + url.split("://", 1)[1]
+                return await reader(transport, http_url, headers, max_bytes, scorer, timer, trace)
+        except Exception as fallback_error:
+            error = fallback_error
+        return FetchResult(None, error=classify_error(error))
+
+
+def _format_size(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def describe_file_evidence(result: FetchResult) -> str:
+    """Short evidence string for a file probe, e.g. 'application/zip, 48.0 MB, starts 504b0304'"""
+    parts = []
+    if result.content_type:
+        parts.append(result.content_type.split(";")[0].strip())
+    if result.content_length is not None:
+        parts.append(_format_size(result.content_length))
+    if result.first_bytes:
+        parts.append(f"starts {result.first_bytes[:8].hex()}")
+    return ", ".join(parts)
+
+
+# Common CDN libraries to skip (unlikely to contain sensitive data)
+CDN_LIBRARIES = [
+    "bootstrap", "jquery", "react", "vue", "angular", "lodash", "moment", "axios",
+    "fontawesome", "googleapis", "gstatic", "cloudflare", "jsdelivr", "unpkg",
+    "cdnjs", "bootcdn", "staticfile", "cdn.bootcss", "cdn.jsdelivr.net",
+    "code.jquery.com", "cdn.jsdelivr.net", "unpkg.com", "cdnjs.cloudflare.com"
+]
+
+
+def should_skip_js_file(js_path: str) -> bool:
+    """Check if JS file should be skipped (CDN library)"""
+    js_path_lower = js_path.lower()
+    return any(lib in js_path_lower for lib in CDN_LIBRARIES)
+
+
+# Per-target scan state, so several targets can share one event loop, session and scanner
+class ScanSession:
+    def __init__(self, company_name: str, target_url: str, include_full_log: bool = True, label: str = ""):
+        self.scan_details = {
+            "company_name": company_name,
+            "target_url": target_url,
+            # Scan date (UK format)
+            "scan_date": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
+            "include_full_log": include_full_log,
+        }
+        self.base_url = ensure_trailing_slash(target_url)
+        # Request metrics are kept per host
+        self.host = urlparse(self.base_url).netloc
+        self.counters = {"files": 0, "directories": 0}
+        # Probe results and findings are streamed to a JSONL file (see result_sink.py)
+        self.report_base = ""
+        self.results_path = ""
+        self.sink = None
+        # Called with every record written to the results file (Scanner.scan() yields them)
+        self.on_record = None
+        # Report paths, once the scan has finished
+        self.reports = []
+        self.finding_count = 0
+        self.vuln_count = 0
+        # MinHash sketch of the site's not-found page (see fingerprint.py)
+        self.soft_404_fingerprint = None
+        # Futures for this target's findings still waiting on AI triage
+        self.pending_triage = []
+        # Prefix for console lines; used to tell targets apart in batch mode
+        self.tag = f"{Colors.BLUE}[{label}]{Colors.END} " if label else ""
+        # Adaptive per-host pacing and failure breaker, created when the scan starts
+        self.rate = None
+        self.breaker = None
+        self.scheduler = None
+        # Paths dropped from the queue when the target was aborted
+        self.paths_aborted = 0
+        self.paths_scanned = 0
+        # Set when the scan was stopped with Scanner.interrupt(); the report is partial
+        self.interrupted = False
+        # Position in the checkpoint; on resume, the keys of paths finished in an earlier run
+        self.target_id = 0
+        self.completed = None
+        self.baseline_checked = False
+        # Responses stored by earlier scans of this target, by URL, and how many were reused
+        self.previous_responses = {}
+        self.carried_over = 0
+        # Children queued beneath confirmed directories with recursion enabled
+        self.frontier = None
+
+    def write(self, record: dict):
+        self.sink.write(record)
+        if self.on_record is not None:
+            self.on_record(record)
+
+
+def already_scanned(scan: ScanSession, key: str) -> bool:
+    return scan.completed is not None and key in scan.completed
+
+
+# Reports and the results file share a name built from the company name, host tag and start time
+def report_basename(scan: ScanSession, output_dir: str = "", filename_tag: str = "") -> str:
+    company_safe = "".join(c for c in scan.scan_details['company_name'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    tag_safe = "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in filename_tag)
+    tag_part = f"_{tag_safe}" if tag_safe else ""
+    filename = f"security_scan_{company_safe}{tag_part}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        filename = os.path.join(output_dir, filename)
+    return filename
+
+
+# Verdicts worth keeping: not errors, not "skipped" placeholders
+def _is_cacheable_verdict(verdict: str) -> bool:
+    return bool(verdict) and not verdict.startswith(("AI analysis failed", "AI analysis skipped"))
+
+
+async def _copy_verdict(source: asyncio.Future, finding: dict):
+    try:
+        finding["notes"] = await asyncio.shield(source)
+    except Exception as e:
+        finding["notes"] = f"AI analysis failed: {e}"
+
+
+class Scanner:
+    def __init__(self, speed: str = "slow", wordlist: Optional[Wordlist] = None, keyword_tiers: Optional[dict] = None, *,
+                 rate: Optional[dict] = None, resilience: Optional[dict] = None, results: Optional[dict] = None,
+                 reports: Optional[dict] = None, recursion: Optional[dict] = None, analysis: Optional[dict] = None,
+                 ai_triage: Optional[dict] = None, ai_cache: Optional[dict] = None, body_caps: Optional[dict] = None,
+                 file_probe: str = "range", global_limit: int = 0, parallel_targets: int = 0,
+                 checkpoint=None, response_store=None, ai_client=None, ai_model: str = "gpt-4o-mini",
+                 ai_disabled_reason: str = "", quiet: bool = False, timer: Optional[StageTimer] = None,
+                 metrics: Optional[dict] = None, transport: Optional[dict] = None):
+        """Settings dicts override the module defaults of the same name (RATE_SETTINGS, ...).
+        `global_limit` 0 = the per-host ceiling of `speed`; `parallel_targets` 0 = no limit.
+        The checkpoint and response store are opened and closed by the caller; `ai_client` is an
+        AsyncOpenAI-compatible client, or None to skip AI triage (`ai_disabled_reason` says why)."""
+        self.speed = speed
+        self.wordlist = wordlist if wordlist is not None else Wordlist()
+        self.keyword_matcher = KeywordMatcher(keyword_tiers) if keyword_tiers else keyword_matcher
+        self.rate_settings = dict(RATE_SETTINGS, **(rate or {}))
+        self.resilience_settings = dict(RESILIENCE_SETTINGS, **(resilience or {}))
+        self.result_settings = dict(RESULT_SETTINGS, **(results or {}))
+        self.report_settings = dict(REPORT_SETTINGS, **(reports or {}))
+        self.recursion_settings = dict(RECURSION_SETTINGS, **(recursion or {}))
+        self.analysis_settings = dict(ANALYSIS_SETTINGS, **(analysis or {}))
+        self.ai_triage_settings = dict(AI_TRIAGE_SETTINGS, **(ai_triage or {}))
+        self.ai_cache_settings = dict(AI_CACHE_SETTINGS, **(ai_cache or {}))
+        self.metrics_settings = dict(METRICS_SETTINGS, **(metrics or {}))
+        self.transport_settings = dict(TRANSPORT_SETTINGS, **(transport or {}))
+        self.body_caps = dict(BODY_CAPS, **(body_caps or {}))
+        self.file_probe = file_probe
+        self.per_host_limit = self.host_rate_controller().max_concurrency
+        self.global_limit = global_limit or self.per_host_limit
+        self.parallel_targets = parallel_targets
+        self.checkpoint = checkpoint
+        self.response_store = response_store
+        self.ai_client = ai_client
+        self.ai_model = ai_model
+        self.ai_disabled_reason = "" if ai_client is not None else ai_disabled_reason or "AI disabled"
+        self.quiet = quiet
+        # Wall/CPU seconds per stage and every request's latency (see timing.py)
+        self.timer = timer if timer is not None else StageTimer()
+        # Phases of every request per host and probe type (see metrics.py)
+        self.metrics = ScanMetrics(self.metrics_settings["slowest"])
+        self.metrics_exporter = None
+        # Created by start(), released by close()
+        self.transport = None
+        self.request_semaphore = None
+        self.target_slots = None
+        self.triage_pipeline = None
+        self.verdict_cache = None
+        self.analysis_pool = None
+        # Verdicts for excerpts currently being triaged, so identical bodies share one model call
+        self.inflight_triage = {}
+        # Set by interrupt(): running targets finish their in-flight requests and report what they have
+        self.interrupted = False
+        self.active_schedulers = set()
+
+    @property
+    def ai_enabled(self) -> bool:
+        return self.ai_client is not None
+
+    def log(self, message: str = ""):
+        if not self.quiet:
+            print(message)
+
+    def describe_pacing(self) -> str:
+        mode = f"adaptive, up to {self.per_host_limit} in flight" if self.rate_settings["adaptive"] else "fixed"
+        return f"{self.speed} ({mode})"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Open the HTTP transport and start the AI triage workers and analysis pool"""
+        if self.transport is not None:
+            return
+        self.request_semaphore = asyncio.Semaphore(self.global_limit)
+        if self.parallel_targets:
+            self.target_slots = asyncio.Semaphore(self.parallel_targets)
+        settings = dict(self.transport_settings, pool_size=self.transport_settings["pool_size"] or self.global_limit)
+        self.transport = open_transport(per_host=self.per_host_limit, headers={"User-Agent": USER_AGENT},
+                                        trace_configs=[self.metrics.trace_config()], **settings)
+        self.log(f"{Colors.CYAN}🔌 Transport: {self.transport.describe()}{Colors.END}")
+        settings = self.metrics_settings
+        if settings["json"] or settings["prometheus"] or settings["port"]:
+            self.metrics_exporter = MetricsExporter(self.metrics, settings["json"], settings["prometheus"],
+                                                    settings["port"], settings["interval"])
+            await self.metrics_exporter.start()
+            if settings["port"]:
+                self.log(f"{Colors.CYAN}📈 Metrics: http://127.0.0.1:{settings['port']}/metrics{Colors.END}")
+        self.start_triage_pipeline()
+        self.analysis_pool = AnalysisPool(**self.analysis_settings)
+        self.log(f"{Colors.CYAN}🧮 Analysis: {self.analysis_pool.describe()}{Colors.END}")
+
+    async def close(self):
+        try:
+            await self.stop_triage_pipeline()
+        finally:
+            if self.analysis_pool is not None:
+                # Shutting the pool down waits for its workers; keep the loop running meanwhile
+                pool, self.analysis_pool = self.analysis_pool, None
+                await asyncio.to_thread(pool.close)
+            if self.transport is not None:
+                versions = self.transport.describe_versions()
+                if versions:
+                    self.log(f"{Colors.CYAN}🔌 Responses by HTTP version: {versions}{Colors.END}")
+                await self.transport.close()
+                self.transport = None
+            if self.metrics_exporter is not None:
+                await self.metrics_exporter.close()
+                self.metrics_exporter = None
+
+    def interrupt(self):
+        """Stop every running target after its in-flight requests; targets not started yet are skipped"""
+        self.interrupted = True
+        for scheduler in self.active_schedulers:
+            scheduler.stop()
+
+    async def scan(self, target, company_name: str = "", output_dir: str = "", filename_tag: str = ""):
+        """Scan one target (a URL or a ScanSession) and yield its result records as they are written.
+        The scan stops if the iteration is abandoned; its report paths end up in `session.reports`."""
+        if isinstance(target, ScanSession):
+            scan = target
+        else:
+            url = normalize_target_url(target)
+            scan = ScanSession(company_name or urlparse(url).netloc, url)
+        records = asyncio.Queue()
+        scan.on_record = records.put_nowait
+        task = asyncio.ensure_future(self.run(scan, output_dir, filename_tag))
+        task.add_done_callback(lambda _task: records.put_nowait(None))
+        try:
+            while True:
+                record = await records.get()
+                if record is None:
+                    break
+                yield record
+            await task
+        finally:
+            scan.on_record = None
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    # Scan one target; returns the report paths (an empty list if the scanner was interrupted first)
+    async def run(self, scan: ScanSession, output_dir: str = "", filename_tag: str = "") -> list:
+        await self.start()
+        if self.target_slots is None:
+            return await self._run(scan, output_dir, filename_tag)
+        async with self.target_slots:
+            return await self._run(scan, output_dir, filename_tag)
+
+    async def _run(self, scan: ScanSession, output_dir: str, filename_tag: str) -> list:
+        if self.interrupted:
+            return []
+        scan.rate = self.host_rate_controller()
+        scan.breaker = self.host_circuit_breaker()
+        if self.recursion_settings["enabled"]:
+            scan.frontier = Frontier(self.wordlist.names, path_classifier.classify, self.recursion_settings["max_depth"],
+                                     self.recursion_settings["budget"], skip=lambda key: already_scanned(scan, key))
+        if self.response_store is not None:
+            scan.previous_responses = self.response_store.load(scan.base_url)
+        if scan.completed is not None:
+            self.restore_result_sink(scan)
+        else:
+            self.open_result_sink(scan, output_dir, filename_tag)
+            if self.checkpoint is not None:
+                self.checkpoint.set_output(scan.target_id, scan.report_base, scan.results_path)
+        self.log(f"{scan.tag}{Colors.CYAN}📝 Results: {scan.results_path}{Colors.END}")
+        try:
+            await self.run_target_probes(scan)
+        finally:
+            self.close_result_sink(scan)
+            if self.response_store is not None:
+                self.response_store.flush(scan.base_url)
+        if scan.carried_over:
+            self.log(f"{scan.tag}{Colors.CYAN}♻️ {scan.carried_over} responses unchanged since the last scan; "
+                     f"their verdicts were reused{Colors.END}")
+        if self.checkpoint is not None and not scan.interrupted and not scan.breaker.aborted:
+            self.checkpoint.set_phase(scan.target_id, "done")
+
+        # Rendering is CPU-bound; keep it off the loop so other targets keep scanning
+        scan.reports = await asyncio.to_thread(write_reports, scan.results_path, scan.report_base,
+                                               self.report_settings["formats"], self.report_settings, self.timer)
+        return scan.reports
+
+    async def run_target_probes(self, scan: ScanSession):
+        if self.checkpoint is not None:
+            self.checkpoint.set_phase(scan.target_id, "paths")
+
+        # The homepage and its JS bundles are analyzed alongside the path scan, not after it
+        async def analyze_js():
+            with self.timer.stage("js"):
+                await self.analyze_js(scan)
+
+        js_task = asyncio.create_task(analyze_js())
+        try:
+            await self.run_path_probes(scan)
+        except BaseException:
+            js_task.cancel()
+            raise
+        if not scan.breaker.aborted and not self.interrupted and self.checkpoint is not None:
+            self.checkpoint.set_phase(scan.target_id, "js")
+        await js_task
+        # Bundles not fetched yet when the scanner was interrupted are left for a resume
+        if self.interrupted and not scan.breaker.aborted:
+            scan.interrupted = True
+
+        # The summary record closes the results file; it needs every AI verdict for this target
+        if scan.pending_triage:
+            self.log(f"{scan.tag}{Colors.CYAN}⏳ Waiting for {len(scan.pending_triage)} AI triage results...{Colors.END}")
+            await asyncio.gather(*scan.pending_triage, return_exceptions=True)
+
+    async def run_path_probes(self, scan: ScanSession):
+        # Initialize soft-404 baseline for this target
+        with self.timer.stage("baseline"):
+            await self.init_soft_404_baseline(scan)
+
+        # A fixed pool of workers drains a bounded queue fed from the (lazy) wordlist,
+        # so only the queued and in-flight paths are in memory, however long the list is
+        async def probe(info: PathInfo):
+            await self.analyze_path(scan, info)
+
+        # Enough workers for the controller's ceiling; it decides how many are actually sending
+        scheduler = Scheduler(probe, workers=scan.rate.max_concurrency, priority=path_priority)
+        scan.scheduler = scheduler
+        self.active_schedulers.add(scheduler)
+        if self.interrupted:
+            scheduler.stop()
+        try:
+            # Paths finished before a resume are skipped; they are already in the results file
+            # With recursion, every wordlist path is registered with the frontier so children never repeat one
+            with self.timer.stage("paths"):
+                scan.paths_scanned += await scheduler.run(
+                    (path_classifier.classify(p) for p in self.wordlist
+                     if (scan.frontier is None or scan.frontier.admit(p)) and not already_scanned(scan, normalize_path_key(p))),
+                    follow_ups=scan.frontier)
+        finally:
+            self.active_schedulers.discard(scheduler)
+
+        frontier = scan.frontier
+        if frontier is not None and frontier.expanded:
+            self.log(f"{scan.tag}{Colors.CYAN}🔎 Recursive discovery: {frontier.expanded} directories expanded, "
+                     f"{frontier.released} child paths queued (budget {frontier.budget}){Colors.END}")
+            if frontier.exhausted and frontier.unexplored:
+                self.log(f"{scan.tag}{Colors.YELLOW}⚠️ Recursion budget spent; {frontier.unexplored} directories "
+                         f"not fully explored (raise --recursion-budget){Colors.END}")
+
+        if scan.breaker.aborted:
+            scan.paths_aborted = scheduler.cancelled
+
+    # Results file: opened per target, every record also passed to the checkpoint and any listener
+
+    def open_result_sink(self, scan: ScanSession, output_dir: str = "", filename_tag: str = ""):
+        scan.report_base = report_basename(scan, output_dir, filename_tag)
+        scan.results_path = scan.report_base + (".jsonl.gz" if self.result_settings["compress"] else ".jsonl")
+        scan.sink = ResultSink(scan.results_path, self.result_settings["flush_interval"])
+        scan.write(dict(scan.scan_details, kind="scan"))
+
+    # Resume: rewrite the results file from the checkpoint and restore the target's progress
+    def restore_result_sink(self, scan: ScanSession):
+        scan.sink = ResultSink(scan.results_path, self.result_settings["flush_interval"])
+        scan.write(dict(scan.scan_details, kind="scan"))
+        for key, record in self.checkpoint.replay(scan.target_id):
+            scan.write(record)
+            if record.get("kind") != "probe":
+                continue
+            scan.completed.add(key)
+            if scan.frontier is not None and not key.startswith("js:"):
+                # Directories confirmed before the interruption get their remaining children queued again
+                scan.frontier.admit(record.get("path", ""))
+                self.discover_children(scan, path_classifier.classify(record.get("path", "")), record,
+                                       record.get("depth", 0), announce=False)
+            if record.get("vulnerability") in ("high", "medium"):
+                scan.vuln_count += 1
+            if record.get("vulnerability") == "skipped":
+                continue
+            if key.startswith("js:"):
+                # analyze_js() counts every fetched bundle as a file; only paths count as scanned paths
+                scan.counters["files"] += 1
+            else:
+                scan.counters["directories" if record.get("type") == "directory" else "files"] += 1
+                scan.paths_scanned += 1
+        scan.finding_count = self.checkpoint.last_finding_id(scan.target_id)
+        self.log(f"{scan.tag}{Colors.CYAN}↩️ Resuming after {scan.completed.count} completed paths{Colors.END}")
+
+    def close_result_sink(self, scan: ScanSession):
+        scan.write({
+            "kind": "summary",
+            "counters": scan.counters,
+            "paths_scanned": scan.paths_scanned,
+            "findings": scan.finding_count,
+            "vulnerabilities": scan.vuln_count,
+            "interrupted": scan.interrupted,
+            "aborted": bool(scan.breaker and scan.breaker.aborted),
+            "paths_aborted": scan.paths_aborted,
+            "connection_failures": scan.breaker.failures if scan.breaker else {},
+        })
+        scan.sink.close()
+
+    def emit_result(self, scan: ScanSession, record: dict, key: Optional[str] = None):
+        scan.write(record)
+        if self.checkpoint is not None:
+            self.checkpoint.add(scan.target_id, record, key)
+
+    # `key` identifies the probed path in the checkpoint, so a resumed scan can skip it
+    def record_probe(self, scan: ScanSession, scan_result: dict, key: Optional[str] = None):
+        self.emit_result(scan, dict(scan_result, kind="probe"), key)
+
+    # Write a finding to the results file; a pending AI verdict is appended as a "notes" record when it lands
+    def record_finding(self, scan: ScanSession, finding: dict, pending: Optional[asyncio.Future] = None):
+        scan.finding_count += 1
+        finding["id"] = scan.finding_count
+        if self.response_store is not None:
+            # New or changed since the last scan (carried-over findings come in already marked)
+            if "change" not in finding:
+                previous = scan.previous_responses.get(finding["url"])
+                finding["change"] = "changed" if previous is not None and previous.finding is not None else "new"
+            self.response_store.remember(scan.base_url, finding["url"], finding=finding)
+        self.emit_result(scan, dict(finding, kind="finding"))
+        if pending is not None:
+            scan.pending_triage.append(asyncio.ensure_future(self._record_verdict(scan, finding, pending)))
+
+    async def _record_verdict(self, scan: ScanSession, finding: dict, pending: asyncio.Future):
+        try:
+            await pending
+        except (Exception, asyncio.CancelledError):
+            pass
+        self.emit_result(scan, {"kind": "notes", "id": finding["id"], "notes": finding.get("notes", "")})
+        if self.response_store is not None:
+            # Its entry may have gone out in an earlier batch, without the verdict
+            self.response_store.remember(scan.base_url, finding["url"], finding=finding)
+
+    # AI triage: medium findings are handed to background workers, verdicts cached across scans
+
+    def start_triage_pipeline(self):
+        if not self.ai_enabled:
+            return
+        settings = self.ai_cache_settings
+        if settings["path"] and self.verdict_cache is None:
+            try:
+                self.verdict_cache = VerdictCache(settings["path"], settings["ttl_seconds"], settings["max_entries"])
+            except Exception as e:
+                self.log(f"{Colors.YELLOW}⚠️ AI verdict cache unavailable ({e}); continuing without it{Colors.END}")
+                self.verdict_cache = None
+        self.triage_pipeline = TriagePipeline(self.ai_analyze_content_cached, **self.ai_triage_settings)
+        self.triage_pipeline.start()
+
+    async def stop_triage_pipeline(self):
+        if self.triage_pipeline is not None:
+            await self.triage_pipeline.close()
+            self.triage_pipeline = None
+        if self.verdict_cache is not None:
+            self.log(f"{Colors.CYAN}🧠 AI verdict cache: {self.verdict_cache.hits} hits, "
+                     f"{self.verdict_cache.misses} misses{Colors.END}")
+            self.verdict_cache.close()
+            self.verdict_cache = None
+
+    # AI analysis for uncertain content
+    async def ai_analyze_content(self, url: str, content: str, context_type="general") -> str:
+        if not self.ai_enabled:
+            return f"AI analysis skipped: {self.ai_disabled_reason}"
+        prompt = (
+            f"You are an AI security auditor. Analyze the following {context_type} content from {url} "
+            f"and determine if it poses a security risk. Respond concisely with your confidence and explanation.\n\n"
+            f"Content:\n{content[:1500]}"
+        )
+        # Wall time only: the call waits on the API, its little CPU time is the event loop's
+        started = time.perf_counter()
+        try:
+            response = await self.ai_client.chat.completions.create(
+                model=self.ai_model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                max_tokens=250,
+            )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            return f"AI analysis failed: {e}"
+        finally:
+            self.timer.add("ai_triage", time.perf_counter() - started)
+
+    # AI analysis that records successful verdicts in the on-disk cache
+    async def ai_analyze_content_cached(self, url: str, content: str, context_type="general") -> str:
+        verdict = await self.ai_analyze_content(url, content, context_type)
+        if self.verdict_cache is not None and _is_cacheable_verdict(verdict):
+            self.verdict_cache.put(VerdictCache.make_key(content, context_type, self.ai_model), verdict)
+        return verdict
+
+    # Hand a medium finding to the triage workers; scanning continues while the verdict is pending
+    # Returns a future for the verdict, or None when the notes are already final (skipped or cached)
+    async def queue_ai_triage(self, scan: ScanSession, finding: dict, url: str, content: str,
+                              context_type: str = "general") -> Optional[asyncio.Future]:
+        if self.triage_pipeline is None:
+            finding["notes"] = f"AI analysis skipped: {self.ai_disabled_reason}"
+            return None
+        key = VerdictCache.make_key(content, context_type, self.ai_model)
+        if self.verdict_cache is not None:
+            cached = self.verdict_cache.get(key)
+            if cached is not None:
+                finding["notes"] = cached
+                return None
+        finding["notes"] = "AI analysis pending"
+        pending = self.inflight_triage.get(key)
+        if pending is not None and not pending.done():
+            # Same excerpt is already with a worker; reuse its verdict
+            return asyncio.ensure_future(_copy_verdict(pending, finding))
+        future = await self.triage_pipeline.submit(finding, url, content, context_type)
+        self.inflight_triage[key] = future
+        future.add_done_callback(lambda _f, key=key: self.inflight_triage.pop(key, None))
+        return future
+
+    async def run_analysis(self, fn, *args, size: int = 0):
+        """`fn(*args)` on the analysis pool (inline when there is none); `size` is the body length in chars"""
+        pool = self.analysis_pool
+        if pool is None or pool.inline(size):
+            return self.timer.call("soft_404", fn, *args)
+        # Off the loop: only the wait is measured here, the CPU time is spent in the pool
+        started = time.perf_counter()
+        try:
+            return await pool.run(fn, *args, size=size)
+        finally:
+            self.timer.add("soft_404", time.perf_counter() - started)
+
+    # Pacing and failure handling, one controller and breaker per target
+
+    def host_rate_controller(self) -> RateController:
+        return make_controller(self.speed, **self.rate_settings)
+
+    def host_circuit_breaker(self) -> CircuitBreaker:
+        settings = dict(self.resilience_settings)
+        settings.pop("retries")
+        return CircuitBreaker(**settings)
+
+    # Give up on a target whose breaker has tripped for good: drop its queued paths
+    def abort_target(self, scan: ScanSession):
+        breaker = scan.breaker
+        self.log(f"{scan.tag}{Colors.RED}⛔ Aborting target after {breaker.threshold} consecutive failures "
+                 f"(last: {breaker.last_error}; {breaker.describe()}){Colors.END}")
+        if scan.scheduler is not None:
+            scan.scheduler.stop()
+        # Requests still waiting for a slot or their delay give up at once
+        scan.rate.close()
+
+    # Fetch under the target's per-host limit and the scanner's request limit
+    async def limited_fetch(self, scan: ScanSession, url: str, probe: str = "page",
+                            scorer: Optional[KeywordStream] = None, headers: Optional[dict] = None) -> FetchResult:
+        breaker = scan.breaker
+        throttle_retries = error_retries = 0
+        while True:
+            if breaker.aborted:
+                return FetchResult(None, error="aborted")
+            # Waits for a slot, any Retry-After/breaker pause and the pacing delay of this host
+            waiting = time.monotonic()
+            if not await scan.rate.acquire():
+                return FetchResult(None, error="aborted")
+            admitted = time.monotonic()
+            result = None
+            trace = RequestTiming()
+            try:
+                async with self.request_semaphore:
+                    # Latency is measured from here so waiting on the global limit doesn't count as congestion
+                    started = time.monotonic()
+                    result = await fetch(self.transport, url, probe, scorer, headers, self.body_caps, self.file_probe,
+                                         self.timer, trace, DIGEST_BYTES if self.response_store is not None else 0)
+            finally:
+                if result is None:
+                    scan.rate.release(0.0, completed=False)
+                else:
+                    finished = time.monotonic()
+                    result.elapsed = finished - started
+                    self.timer.record_request(result.elapsed, result.bytes_read)
+                    self.metrics.record(scan.host, probe, url, result.status, result.bytes_read, admitted - waiting,
+                                        started - admitted, trace, finished, started)
+                    scan.rate.release(started, result.status, result.retry_after)
+
+            if result.status in THROTTLE_STATUSES:
+                if throttle_retries < THROTTLE_RETRIES:
+                    throttle_retries += 1
+                    continue
+                return result
+            if result.status is not None:
+                breaker.record_success()
+                return result
+
+            action = breaker.record_failure(result.error)
+            if action == "pause":
+                pause = breaker.pause_seconds()
+                self.log(f"{scan.tag}{Colors.YELLOW}⏸️ {breaker.threshold} consecutive failures ({result.error}); "
+                         f"pausing host for {pause:.0f}s{Colors.END}")
+                scan.rate.pause(pause)
+            elif action == "abort":
+                self.abort_target(scan)
+            if (breaker.aborted or result.error not in TRANSIENT_ERRORS
+                    or error_retries >= self.resilience_settings["retries"]):
+                return result
+            await asyncio.sleep(backoff_delay(error_retries))
+            error_retries += 1
+            if scorer is not None:
+                # The failed attempt may have streamed part of the body already
+                scorer.reset()
+
+    async def init_soft_404_baseline(self, scan: ScanSession):
+        if scan.baseline_checked:
+            return
+        random_slug = f"__scanner_missing__{random.randint(100000, 999999)}/"  # no leading slash
+        test_url = urljoin(scan.base_url, random_slug)
+        result = await self.limited_fetch(scan, test_url, probe="baseline")
+        if result.status == 200 and result.text:
+            scan.soft_404_fingerprint = await self.run_analysis(page_fingerprint, result.text, size=len(result.text))
+        # Only a real answer counts; otherwise a resumed scan measures it again
+        if result.status is not None and self.checkpoint is not None:
+            self.checkpoint.set_baseline(scan.target_id, scan.soft_404_fingerprint)
+
+    # Conditional re-scans (see response_store.py)
+
+    # Hash of what was read of a response; an unchanged hash means an unchanged verdict
+    def response_digest(self, result: FetchResult) -> str:
+        if self.response_store is None or result.status != 200:
+            return ""
+        # Streamed bodies carry a chunking-independent prefix hash; file probes hash their evidence
+        return content_hash(result.body_digest, result.first_bytes, result.content_type, result.content_length)
+
+    # Record the stored probe (and finding) again when the response has not changed since the last scan
+    def reuse_previous_response(self, scan: ScanSession, previous, result: FetchResult, digest: str, key: str,
+                                label: str) -> bool:
+        if previous is None or not is_unchanged(previous, result.status, digest):
+            return False
+        if previous.finding is not None:
+            scan.vuln_count += 1
+            self.record_finding(scan, dict(previous.finding, change="carried-over"))
+        verdict = (previous.probe.get("vulnerability") or "clean").upper()
+        self.log(f"{scan.tag}{Colors.GREEN}♻️{Colors.END} {Colors.WHITE}[UNCHANGED]{Colors.END} {label} ({verdict}, as last scan)")
+        self.record_probe(scan, dict(previous.probe, carried_over=True), key)
+        scan.carried_over += 1
+        return True
+
+    def remember_response(self, scan: ScanSession, url: str, result: FetchResult, digest: str, scan_result: dict):
+        store = self.response_store
+        # Throttled or unanswered requests say nothing about the resource; keep what was stored
+        if store is None or result.status is None or result.status in THROTTLE_STATUSES:
+            return
+        if result.status == 200 or url in store.pending or url in scan.previous_responses:
+            store.remember(scan.base_url, url, probe=scan_result, etag=result.etag,
+                           last_modified=result.last_modified, content_hash=digest)
+
+    # Analyze a file or directory path
+    async def analyze_path(self, scan: ScanSession, info: PathInfo):
+        counters = scan.counters
+        path = info.path
+        # Always treat paths as relative to base (info.rel_path has no leading slash)
+        full_url = urljoin(scan.base_url, info.rel_path)
+
+        # Print scanning status
+        self.log(f"{scan.tag}{Colors.CYAN}[SCANNING]{Colors.END} {path}")
+
+        is_dir = info.is_dir
+        depth = scan.frontier.depth(path) if scan.frontier is not None else 0
+        previous = scan.previous_responses.get(full_url)
+        if not is_dir and info.suspicious:
+            # Only the headers and first bytes matter for these; never download the archive/dump itself
+            result = await self.limited_fetch(scan, full_url, probe="file", headers=conditional_headers(previous))
+            scorer = None
+        else:
+            scorer = self.keyword_matcher.stream(min_chars=SOFT_404_MIN_CHARS)
+            result = await self.limited_fetch(scan, full_url, probe="page", scorer=scorer,
+                                              headers=conditional_headers(previous))
+        status, content = result.status, result.text
+
+        # The target was given up on before this path got a response
+        if result.error == "aborted":
+            aborted = {"url": full_url, "path": path, "status": None, "has_content": False,
+                       "vulnerability": "aborted", "type": "directory" if is_dir else "file"}
+            if depth:
+                aborted["depth"] = depth
+            self.record_probe(scan, aborted, normalize_path_key(path))
+            self.log(f"{scan.tag}{Colors.RED}⛔ [ABORTED]{Colors.END} {path}")
+            return
+
+        if is_dir:
+            counters["directories"] += 1
+        else:
+            counters["files"] += 1
+
+        digest = self.response_digest(result)
+        if self.reuse_previous_response(scan, previous, result, digest, normalize_path_key(path), path):
+            self.discover_children(scan, info, previous.probe, depth)
+            return
+
+        # Log the URL scan
+        scan_result = {
+            "url": full_url,
+            "path": path,
+            "status": status,
+            # Consider 200 as has_content even if response is binary (content may be empty string after decode)
+            "has_content": bool(status == 200),
+            "vulnerability": None,
+            "type": "directory" if is_dir else "file"
+        }
+        if depth:
+            scan_result["depth"] = depth
+
+        if status == 200:
+            # The soft-404 check is CPU-bound; it runs on the analysis pool while other probes keep fetching
+            soft_404 = False
+            if is_dir or not info.suspicious:
+                soft_404 = await self.run_analysis(looks_like_soft_404, status, content, scan.soft_404_fingerprint,
+                                                   size=len(content))
+            # If a suspicious downloadable file is publicly accessible, flag immediately
+            if not is_dir and info.suspicious:
+                scan.vuln_count += 1
+                scan_result["vulnerability"] = "high"
+                evidence = describe_file_evidence(result)
+                scan_result["evidence"] = {
+                    "method": result.method,
+                    "content_type": result.content_type,
+                    "content_length": result.content_length,
+                    "first_bytes": result.first_bytes.hex(),
+                }
+                notes = f"Publicly downloadable sensitive file ({evidence})" if evidence else "Publicly downloadable sensitive file"
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.RED}[HIGH]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {notes}")
+                self.record_finding(scan, {"level": "high", "url": full_url, "notes": notes, "type": "file"})
+            # Soft-404 guard: treat as clean if body matches site's not-found template
+            elif soft_404:
+                scan_result["vulnerability"] = "clean"
+                scan_result["soft_404"] = True
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} {path} (soft 404)")
+            # Check if this is a sensitive directory that shouldn't be publicly accessible
+            elif info.sensitive:
+                scan.vuln_count += 1
+                scan_result["vulnerability"] = "high"
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.RED}[HIGH]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {Colors.YELLOW}Vulns: {scan.vuln_count}{Colors.END}")
+                self.record_finding(scan, {"level": "high", "url": full_url, "notes": "Sensitive directory publicly accessible", "type": "directory" if is_dir else "file"})
+            elif content.strip():
+                # Check content sensitivity for files or directories with content
+                # Already scored chunk by chunk while the body streamed in
+                score = scorer.score
+                typ = "directory" if is_dir else "file"
+                if scorer.found:
+                    scan_result["keywords"] = keyword_evidence(scorer.matches)
+
+                if score == "high":
+                    scan.vuln_count += 1
+                    scan_result["vulnerability"] = "high"
+                    self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.RED}[HIGH]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {Colors.YELLOW}Vulns: {scan.vuln_count}{Colors.END}")
+                    notes = f"Auto-detected sensitive content ({describe_keywords(scorer.matches, 'high')})"
+                    self.record_finding(scan, {"level": "high", "url": full_url, "notes": notes, "type": typ})
+                elif score == "medium":
+                    scan.vuln_count += 1
+                    scan_result["vulnerability"] = "medium"
+                    self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.YELLOW}[MEDIUM]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {Colors.YELLOW}Vulns: {scan.vuln_count}{Colors.END}")
+                    finding = {"level": "medium", "url": full_url, "notes": "", "type": typ}
+                    pending = await self.queue_ai_triage(scan, finding, full_url, content)
+                    self.record_finding(scan, finding, pending)
+                else:
+                    scan_result["vulnerability"] = "clean"
+                    self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} {path}")
+            else:
+                scan_result["vulnerability"] = "clean"
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} {path}")
+        else:
+            # No response at all (DNS, connect, TLS, timeout, reset): unknown, not clean
+            if status is None:
+                scan_result["vulnerability"] = "unreached"
+                scan_result["error"] = result.error
+                self.log(f"{scan.tag}{Colors.YELLOW}⚠️ [UNREACHED]{Colors.END} {path} ({result.error})")
+            # Still throttled after the retries: the path was never really checked
+            elif status in THROTTLE_STATUSES:
+                scan_result["vulnerability"] = "rate-limited"
+                self.log(f"{scan.tag}{Colors.YELLOW}⚠️ [RATE LIMITED]{Colors.END} {path} ({status})")
+            # Treat 401/403 on sensitive paths as medium (exists but restricted)
+            elif status in (401, 403) and info.sensitive:
+                scan.vuln_count += 1
+                scan_result["vulnerability"] = "medium"
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.YELLOW}[MEDIUM]{Colors.END} {Colors.BOLD}{path}{Colors.END} - {Colors.YELLOW}Vulns: {scan.vuln_count}{Colors.END}")
+                self.record_finding(scan, {"level": "medium", "url": full_url, "notes": f"Restricted access ({status}) on sensitive path", "type": "directory" if is_dir else "file"})
+            else:
+                scan_result["vulnerability"] = "clean"
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} {path}")
+
+        self.record_probe(scan, scan_result, normalize_path_key(path))
+        self.remember_response(scan, full_url, result, digest, scan_result)
+        self.discover_children(scan, info, scan_result, depth)
+
+    # Recursive mode: a directory that exists (200 that is not a soft 404, or 401/403) gets its children queued
+    def discover_children(self, scan: ScanSession, info: PathInfo, probe: dict, depth: int, announce: bool = True):
+        if scan.frontier is None or not info.is_dir:
+            return
+        status = probe.get("status")
+        if not (status in (401, 403) or (status == 200 and not probe.get("soft_404"))):
+            return
+        if scan.frontier.expand(info, status, depth) and announce:
+            self.log(f"{scan.tag}{Colors.CYAN}🔎 [RECURSE]{Colors.END} {info.path} (depth {depth + 1})")
+
+    # Analyze JS files found in main page
+    async def analyze_js(self, scan: ScanSession):
+        """Fetch the homepage and analyze its script bundles, each as its own task; runs alongside the path scan"""
+        counters = scan.counters
+        self.log(f"{scan.tag}{Colors.CYAN}[SCANNING]{Colors.END} Main page for JS files")
+
+        base = scan.base_url
+        result = await self.limited_fetch(scan, base, probe="page")
+        status, content = result.status, result.text
+        if result.error == "aborted":
+            return
+        counters["files"] += 1  # counting homepage as scanned file
+
+        if status != 200:
+            self.log(f"{scan.tag}{Colors.RED}[ERROR]{Colors.END} Could not access main page (status={status})")
+            return
+
+        scripts = self.timer.call("script_extract", script_srcs, content)
+
+        if not scripts:
+            self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} No external JS files found")
+            return
+
+        # The same bundle can be included more than once; it is fetched once
+        bundles = {}
+        for src in scripts:
+            bundles.setdefault(urljoin(base, src), src)
+        # Every fetch still waits for a slot under the host's rate controller and the global limit
+        started = time.monotonic()
+        timings = await asyncio.gather(*(self.analyze_js_file(scan, js_url, js_path)
+                                         for js_url, js_path in bundles.items()))
+        timings = [t for t in timings if t is not None]
+        if timings:
+            slowest, slowest_path = max(timings)
+            self.log(f"{scan.tag}{Colors.CYAN}⏱️ JS: {len(timings)} bundle{'s' if len(timings) != 1 else ''} analyzed in {time.monotonic() - started:.2f}s "
+                     f"(slowest: {slowest_path}, {slowest:.2f}s){Colors.END}")
+
+    # One script bundle; returns (fetch seconds, path) when it was fetched
+    async def analyze_js_file(self, scan: ScanSession, js_url: str, js_path: str):
+        counters = scan.counters
+        if already_scanned(scan, "js:" + js_url):
+            return None
+
+        # Skip CDN libraries
+        if should_skip_js_file(js_path):
+            self.log(f"{scan.tag}{Colors.PURPLE}⏭️{Colors.END} {Colors.WHITE}[SKIPPED]{Colors.END} CDN library: {js_path}")
+            # Log skipped files too
+            scan_result = {
+                "url": js_url,
+                "path": js_path,
+                "status": "skipped",
+                "has_content": False,
+                "vulnerability": "skipped",
+                "type": "file"
+            }
+            self.record_probe(scan, scan_result, "js:" + js_url)
+            return None
+
+        # Interrupted while the bundles were queued: leave the rest for a resume
+        if self.interrupted:
+            return None
+
+        self.log(f"{scan.tag}{Colors.CYAN}[SCANNING]{Colors.END} JS: {js_path}")
+
+        scorer = self.keyword_matcher.stream()
+        previous = scan.previous_responses.get(js_url)
+        result = await self.limited_fetch(scan, js_url, probe="js", scorer=scorer,
+                                          headers=conditional_headers(previous))
+        status, js_content = result.status, result.text
+        if result.error == "aborted":
+            self.record_probe(scan, {"url": js_url, "path": js_path, "status": None, "has_content": False,
+                                     "vulnerability": "aborted", "type": "file"}, "js:" + js_url)
+            self.log(f"{scan.tag}{Colors.RED}⛔ [ABORTED]{Colors.END} JS: {js_path}")
+            return None
+        counters["files"] += 1
+        digest = self.response_digest(result)
+        if self.reuse_previous_response(scan, previous, result, digest, "js:" + js_url, f"JS: {js_path}"):
+            return result.elapsed, js_path
+
+        # Log the JS file scan
+        scan_result = {
+            "url": js_url,
+            "path": js_path,
+            "status": status,
+            "has_content": bool(status == 200 and js_content.strip()),
+            "vulnerability": None,
+            "type": "file",
+            "elapsed": round(result.elapsed, 3),
+        }
+        # Fetch time and bytes read (bundles are streamed and capped like every other probe)
+        timing = f"{result.elapsed:.2f}s, {_format_size(result.bytes_read)}" + (", truncated" if result.truncated else "")
+
+        if status == 200 and js_content.strip():
+            score = scorer.score
+            if scorer.found:
+                scan_result["keywords"] = keyword_evidence(scorer.matches)
+            if score == "high":
+                scan.vuln_count += 1
+                scan_result["vulnerability"] = "high"
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.RED}[HIGH]{Colors.END} {Colors.BOLD}JS: {js_path}{Colors.END} ({timing}) - {Colors.YELLOW}Vulns: {scan.vuln_count}{Colors.END}")
+                notes = f"Sensitive key/secret in JS ({describe_keywords(scorer.matches, 'high')})"
+                self.record_finding(scan, {"level": "high", "url": js_url, "notes": notes, "type": "file"})
+            elif score == "medium":
+                scan.vuln_count += 1
+                scan_result["vulnerability"] = "medium"
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.YELLOW}[MEDIUM]{Colors.END} {Colors.BOLD}JS: {js_path}{Colors.END} ({timing}) - {Colors.YELLOW}Vulns: {scan.vuln_count}{Colors.END}")
+                finding = {"level": "medium", "url": js_url, "notes": "", "type": "file"}
+                pending = await self.queue_ai_triage(scan, finding, js_url, js_content, context_type="js")
+                self.record_finding(scan, finding, pending)
+            else:
+                scan_result["vulnerability"] = "clean"
+                self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} JS: {js_path} ({timing})")
+        else:
+            scan_result["vulnerability"] = "clean"
+            self.log(f"{scan.tag}{Colors.GREEN}✅{Colors.END} {Colors.WHITE}[CLEAN]{Colors.END} JS: {js_path} (no content, {timing})")
+
+        self.record_probe(scan, scan_result, "js:" + js_url)
+        self.remember_response(scan, js_url, result, digest, scan_result)
+        return result.elapsed, js_path
@@ -0,0 +1,141 @@
+# Bounded work scheduler for path probes.
+#
+# A producer feeds items from a (possibly huge, lazy) iterable into a bounded
+# priority queue, and a fixed pool of worker tasks drains it. Only the queue
+# and the in-flight items are ever in memory. Queued items are ordered by a
+# priority function (lower first, FIFO among equals), can be cancelled before
+# they start, and stop() ends the run gracefully: nothing new is queued or
+# started, and the items already in flight are allowed to finish.
+#
+# Items discovered while the run goes (recursive discovery, see frontier.py)
+# come from an optional follow-up source; they are queued ahead of the next
+# input item, and the run only ends once the source is empty and nothing is
+# queued or in flight that could add to it.
+import asyncio
+import itertools
+import signal
+
+
+class Scheduler:
+    def __init__(self, handler, workers: int, queue_size: int = 0, priority=None):
+        """`handler` is a coroutine function called with each item; `priority(item)` returns a sort key"""
+        self.handler = handler
+        self.worker_count = max(1, workers)
+        # Enough look-ahead for priorities to matter, without buffering the whole wordlist
+        self.queue_size = queue_size or self.worker_count * 4
+        self.priority = priority or (lambda item: 0)
+        self.queue = None
+        self.pending = {}
+        self.stopping = False
+        self.completed = 0
+        self.cancelled = 0
+        self.active = 0
+        self._progress = asyncio.Event()
+        self._sequence = itertools.count()
+
+    async def run(self, items, follow_ups=None) -> int:
+        """Process every item (unless stopped); returns the number of items handled.
+        `follow_ups.pop()` returns the next item discovered by the handler so far, or None.
+        An exception from the handler cancels the rest of the run and is raised here."""
+        self.queue = asyncio.PriorityQueue(maxsize=self.queue_size)
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        tasks = [asyncio.create_task(self._produce(items, follow_ups)), *workers]
+        try:
+            # A failing handler ends the run: without its worker the producer could block on a full queue
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self.completed
+
+    async def _produce(self, items, follow_ups):
+        for item in items:
+            if self.stopping:
+                break
+            if follow_ups is not None:
+                await self._put_follow_ups(follow_ups)
+            await self._put(item)
+        while follow_ups is not None and not self.stopping:
+            if await self._put_follow_ups(follow_ups):
+                continue
+            if not self.active and self.queue.empty():
+                break
+            # Wait for a handler to finish; it may have discovered more
+            self._progress.clear()
+            await self._progress.wait()
+        for _ in range(self.worker_count):
+            # Sentinels sort after every real priority
+            await self.queue.put([float("inf"), next(self._sequence), None])
+
+    async def _put(self, item):
+        # Entries are [priority, sequence, item]; a cancelled entry has its item set to None
+        entry = [self.priority(item), next(self._sequence), item]
+        self.pending[entry[1]] = entry
+        await self.queue.put(entry)
+
+    async def _put_follow_ups(self, follow_ups) -> int:
+        count = 0
+        item = follow_ups.pop()
+        while item is not None:
+            await self._put(item)
+            count += 1
+            if self.stopping:
+                break
+            item = follow_ups.pop()
+        return count
+
+    async def _worker(self):
+        while True:
+            priority, sequence, item = await self.queue.get()
+            if priority == float("inf"):
+                return
+            self.pending.pop(sequence, None)
+            if item is None:
+                self._progress.set()
+                continue
+            self.active += 1
+            try:
+                await self.handler(item)
+            finally:
+                self.active -= 1
+                self._progress.set()
+            self.completed += 1
+
+    def cancel(self, predicate=None) -> int:
+        """Drop queued (not yet started) items matching `predicate`, or all of them; returns how many"""
+        count = 0
+        for entry in list(self.pending.values()):
+            if entry[2] is not None and (predicate is None or predicate(entry[2])):
+                entry[2] = None
+                count += 1
+        self.cancelled += count
+        return count
+
+    def stop(self):
+        """Stop feeding and drop queued items; in-flight items finish normally"""
+        self.stopping = True
+        self.cancel()
+        self._progress.set()
+
+
+def install_interrupt_handler(on_interrupt):
+    """Call `on_interrupt()` on the first Ctrl-C instead of raising KeyboardInterrupt;
+    a second Ctrl-C interrupts immediately. Must be called from the running loop.
+    Returns a function that restores the previous handler."""
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGINT)
+
+    def restore():
+        signal.signal(signal.SIGINT, previous)
+
+    def handle(signum, frame):
+        restore()
+        loop.call_soon_threadsafe(on_interrupt)
+
+    # signal.signal works on every platform (loop.add_signal_handler does not exist on Windows)
+    signal.signal(signal.SIGINT, handle)
+    return restore
@@ -0,0 +1,75 @@
+import asyncio
+
+from keyword_matcher import KeywordStream
+from response_store import ResponseStore
+from scanner import DIGEST_BYTES, _read_capped, keyword_matcher
+
+
+def test_entries_are_written_in_batches(tmp_path):
+    store = ResponseStore(str(tmp_path / "store.sqlite"), batch_size=2, interval=3600)
+    for i in range(5):
+        store.remember("http://t/", f"http://t/{i}", probe={"status": 200}, content_hash=str(i))
+    # Two full batches written, the fifth entry still pending
+    assert len(store.pending) == 1
+    assert len(store.load("http://t/")) == 4
+    store.flush("http://t/")
+    assert not store.pending
+    assert len(store.load("http://t/")) == 5
+    store.close()
+
+
+def test_finding_waits_for_its_probe_and_late_verdict_is_saved(tmp_path):
+    store = ResponseStore(str(tmp_path / "store.sqlite"), batch_size=1, interval=3600)
+    finding = {"id": 1, "url": "http://t/a", "notes": "AI analysis pending"}
+    store.remember("http://t/", "http://t/a", finding=finding)
+    # A finding alone is not written mid-scan: its probe comes right after
+    assert "http://t/a" in store.pending
+    store.remember("http://t/", "http://t/a", probe={"status": 403})
+    assert not store.pending
+    finding["notes"] = "verdict"
+    store.remember("http://t/", "http://t/a", finding=finding)
+    store.flush("http://t/")
+    stored = store.load("http://t/")["http://t/a"]
+    assert stored.probe == {"status": 403}
+    assert stored.finding == {"url": "http://t/a", "notes": "verdict"}
+    store.close()
+
+
+class ChunkedContent:
+    """Stands in for a response stream that arrives in fixed-size chunks"""
+
+    def __init__(self, body: bytes, chunk_size: int):
+        self.chunks = iter([body[i:i + chunk_size] for i in range(0, len(body), chunk_size)])
+        self.done = False
+
+    async def iter_chunked(self, n):
+        for chunk in self.chunks:
+            yield chunk
+        self.done = True
+
+    def at_eof(self):
+        return self.done
+
+
+class ChunkedResponse:
+    def __init__(self, body: bytes, chunk_size: int):
+        self.status = 200
+        self.headers = {"Content-Length": str(len(body))}
+        self.content = ChunkedContent(body, chunk_size)
+
+
+def test_digest_does_not_depend_on_chunking():
+    # The scorer stops at the first chunk with "password", so each chunking reads a different amount
+    body = b"password=hunter2\n" + b"x" * (3 * DIGEST_BYTES)
+
+    async def digest(body, chunk_size):
+        scorer = KeywordStream(keyword_matcher)
+        result = await _read_capped(ChunkedResponse(body, chunk_size), 4 * DIGEST_BYTES, scorer,
+                                    digest_bytes=DIGEST_BYTES)
+        assert result.truncated
+        return result.body_digest
+
+    digests = {asyncio.run(digest(body, size)) for size in (1000, 7000, DIGEST_BYTES, 2 * DIGEST_BYTES)}
+    assert len(digests) == 1 and "" not in digests
+    changed = body[:DIGEST_BYTES - 1] + b"y" + body[DIGEST_BYTES:]
+    assert asyncio.run(digest(changed, 1000)) not in digests
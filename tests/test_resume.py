@@ -0,0 +1,63 @@
+import asyncio
+
+from app import resume_targets
+from benchmarks.target_server import build_parser, start_server
+from checkpoint import Checkpoint, new_scan_id
+from scanner import Scanner, ScanSession
+from wordlists import Wordlist
+
+
+def make_scanner(wordlist, checkpoint=None) -> Scanner:
+    return Scanner("fast", Wordlist([str(wordlist)]), quiet=True, reports={"formats": ["json"]},
+                   analysis={"mode": "inline"}, checkpoint=checkpoint)
+
+
+async def scan_totals(scanner: Scanner, scan: ScanSession, output_dir) -> dict:
+    async with scanner:
+        await scanner.run(scan, str(output_dir))
+    return {"counters": dict(scan.counters), "paths_scanned": scan.paths_scanned}
+
+
+def test_resumed_scan_counts_like_an_uninterrupted_one(tmp_path):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("\n".join(f"admin{i}" for i in range(60)), encoding="utf-8")
+
+    async def main():
+        runner = await start_server(build_parser().parse_args(["--port", "0", "--hit-rate", "0.3", "--drip-every", "0",
+                                                                "--scripts", "60", "--bundle-kb", "4",
+                                                                "--latency", "fixed:50"]))
+        host, port = runner.addresses[0][:2]
+        url = f"http://{host}:{port}/"
+        try:
+            expected = await scan_totals(make_scanner(wordlist), ScanSession("Full", url), tmp_path / "full")
+
+            # Kill the scan once a few JS bundles are done, then resume it from the checkpoint
+            db = str(tmp_path / "checkpoint.sqlite")
+            checkpoint = Checkpoint(db, new_scan_id())
+            scan = ScanSession("Resumed", url)
+            checkpoint.start([], [scan.scan_details])
+            bundles = []
+            killed = asyncio.Event()
+
+            def on_record(record):
+                if record.get("kind") == "probe" and "/static/js/" in record.get("url", ""):
+                    bundles.append(record)
+                    if len(bundles) == 3:
+                        killed.set()
+
+            scan.on_record = on_record
+            task = asyncio.create_task(scan_totals(make_scanner(wordlist, checkpoint), scan, tmp_path / "resumed"))
+            await killed.wait()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            checkpoint.close()
+
+            checkpoint = Checkpoint(db, checkpoint.scan_id)
+            [scan] = resume_targets(checkpoint, batch=False)
+            resumed = await scan_totals(make_scanner(wordlist, checkpoint), scan, tmp_path / "resumed")
+            checkpoint.close()
+        finally:
+            await runner.cleanup()
+        assert resumed == expected
+
+    asyncio.run(main())
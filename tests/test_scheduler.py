@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from scheduler import Scheduler
+
+
+class Boom(Exception):
+    pass
+
+
+def test_run_handles_every_item():
+    seen = []
+
+    async def handler(item):
+        seen.append(item)
+
+    scheduler = Scheduler(handler, workers=3, queue_size=2)
+    assert asyncio.run(scheduler.run(range(50))) == 50
+    assert sorted(seen) == list(range(50))
+
+
+def test_handler_error_is_raised_instead_of_hanging():
+    async def handler(item):
+        raise Boom(item)
+
+    async def main():
+        # More items than the queue and workers can hold: the producer would block on a full queue
+        scheduler = Scheduler(handler, workers=2, queue_size=2)
+        await asyncio.wait_for(scheduler.run(range(100)), timeout=5)
+
+    with pytest.raises(Boom):
+        asyncio.run(main())
+
+
+def test_handler_error_with_follow_ups():
+    class FollowUps:
+        def pop(self):
+            return None
+
+    async def handler(item):
+        if item == 3:
+            raise Boom(item)
+        await asyncio.sleep(0)
+
+    async def main():
+        scheduler = Scheduler(handler, workers=1, queue_size=1)
+        await asyncio.wait_for(scheduler.run(range(10), FollowUps()), timeout=5)
+
+    with pytest.raises(Boom):
+        asyncio.run(main())
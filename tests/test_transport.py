@@ -0,0 +1,98 @@
+import asyncio
+import functools
+import ssl
+
+import pytest
+
+import transport
+from benchmarks.bench_transport import H2Server
+from metrics import RequestTiming
+
+httpx = pytest.importorskip("httpx")
+
+
+def settings(**overrides):
+    values = dict(pool_size=8, keepalive=15, timeout=5, connect_timeout=5, read_timeout=5,
+                  headers={"User-Agent": "test"})
+    values.update(overrides)
+    return values
+
+
+async def read_body(response) -> bytes:
+    body = b""
+    async for chunk in response.content.iter_chunked(1024):
+        body += chunk
+    return body
+
+
+@pytest.fixture
+def h2_server(monkeypatch):
+    """(https base URL, running loop) of a local HTTP/2 server the httpx transport trusts"""
+    pytest.importorskip("h2")
+    trustme = pytest.importorskip("trustme")
+    ca = trustme.CA()
+    server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ca.issue_cert("127.0.0.1").configure_cert(server_context)
+    server_context.set_alpn_protocols(["h2"])
+    client_context = ssl.create_default_context()
+    ca.configure_trust(client_context)
+    monkeypatch.setattr(transport.httpx, "AsyncClient", functools.partial(httpx.AsyncClient, verify=client_context))
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(loop.create_server(H2Server, "127.0.0.1", 0, ssl=server_context))
+    port = server.sockets[0].getsockname()[1]
+    yield f"https://127.0.0.1:{port}", loop
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+
+
+def test_httpx_speaks_http2_where_offered(h2_server):
+    base_url, loop = h2_server
+
+    async def main():
+        client = transport.open_transport("httpx", **settings())
+        assert client.http2
+        timing = RequestTiming()
+        try:
+            # Concurrent requests share the one multiplexed connection
+            async def fetch(path):
+                async with client.request("GET", base_url + path, trace=timing) as response:
+                    return response.status, response.version, await read_body(response)
+
+            results = await asyncio.gather(*(fetch(f"/p{i}") for i in range(20)))
+        finally:
+            await client.close()
+        assert results[3] == (200, "HTTP/2", b"h2 /p3")
+        assert {version for _status, version, _body in results} == {"HTTP/2"}
+        assert client.describe_versions() == "HTTP/2 20"
+        # httpcore's http2 trace events feed the phases
+        assert timing.ttfb > 0 and timing.connect > 0
+
+    loop.run_until_complete(main())
+
+
+def test_httpx_timeout_does_not_leave_the_task_cancelled():
+    async def silent(reader, writer):
+        await reader.read()
+
+    async def main():
+        server = await asyncio.start_server(silent, "127.0.0.1", 0)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+        client = transport.open_transport("httpx", **settings(timeout=0.2))
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                async with client.request("GET", url):
+                    pass
+            task = asyncio.current_task()
+            if hasattr(task, "cancelling"):
+                assert task.cancelling() == 0
+            # The task can still wait, and an outer timeout still fires as a timeout
+            await asyncio.sleep(0.01)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.sleep(1), 0.05)
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+# Low-overhead stage timing for scans and benchmarks.
+#
+# A StageTimer adds up wall-clock and CPU seconds per named stage and counts
+# the latency of every request a scan sends. Synchronous stages (soft-404
+# checks, keyword scoring, script extraction, reading the results file and
+# rendering each report format) are measured with the CPU clock of the thread
+# that runs them, so their CPU time is their own. Asynchronous stages
+# (baseline, path probing, JS analysis) overlap each other and the
+# synchronous ones; their CPU time is what the event loop thread spent while
+# they were running. AI triage calls are wall time only (they wait on the
+# API, several at once). Latencies go into a fixed-bucket histogram (see
+# metrics.py), so memory does not grow with the number of requests; the
+# percentiles are interpolated within a bucket.
+import time
+from contextlib import contextmanager
+
+from metrics import Histogram
+
+
+class StageTimer:
+    def __init__(self):
+        # name -> [calls, wall seconds, cpu seconds]
+        self.stages = {}
+        self.latency = Histogram()
+        self.bytes_read = 0
+
+    @contextmanager
+    def stage(self, name: str):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def call(self, name: str, fn, *args):
+        """`fn(*args)`, timed as one call of the stage"""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            return fn(*args)
+        finally:
+            self.add(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def add(self, name: str, wall: float, cpu: float = 0.0):
+        totals = self.stages.get(name)
+        if totals is None:
+            totals = self.stages[name] = [0, 0.0, 0.0]
+        totals[0] += 1
+        totals[1] += wall
+        totals[2] += cpu
+
+    def record_request(self, elapsed: float, bytes_read: int = 0):
+        self.latency.observe(elapsed)
+        self.bytes_read += bytes_read
+
+    def latency_percentiles(self, quantiles=(50, 95, 99)) -> dict:
+        return {f"p{q}": self.latency.quantile(q / 100) for q in quantiles}
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.latency.count,
+            "bytes_read": self.bytes_read,
+            "latency": {k: round(v, 6) for k, v in self.latency_percentiles().items()},
+            "stages": {name: {"calls": calls, "wall": round(wall, 6), "cpu": round(cpu, 6)}
+                       for name, (calls, wall, cpu) in self.stages.items()},
+        }
@@ -0,0 +1,224 @@
+# HTTP transports: the connection pool every probe goes through.
+#
+#   aiohttp   the default; HTTP/1.1 with keep-alive and a DNS cache, traced
+#             with an aiohttp.TraceConfig (see metrics.py)
+#   httpx     optional (pip install "httpx[http2]"); negotiates HTTP/2 over
+#             TLS where the server offers it, so many small probes share one
+#             multiplexed connection instead of a pool of them. Without the
+#             h2 package it speaks HTTP/1.1.
+#             Several times aiohttp's CPU per request either way
+#             (benchmarks/bench_transport.py).
+#
+# Both are configured the same way: pool size, keep-alive expiry, DNS cache
+# TTL (aiohttp only; httpx resolves per new connection), a connect timeout,
+# a read timeout (longest gap between two reads) and a timeout for the whole
+# request. Default headers (the User-Agent) are set once on the client rather
+# than built for every request. TLS handshakes are saved by keeping
+# connections alive (asyncio offers no TLS session resumption across
+# connections); each client builds its SSL context once.
+#
+# request() returns an async context manager for the response. Responses of
+# either backend offer what the scanner's readers use: `status`, `headers`,
+# `content.iter_chunked(n)` and `content.at_eof()`. The httpx backend maps its
+# errors to the ones resilience.classify_error() knows.
+import asyncio
+import importlib.util
+import socket
+import ssl
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+BACKENDS = ("aiohttp", "httpx")
+
+
+def http2_available() -> bool:
+    return httpx is not None and importlib.util.find_spec("h2") is not None
+
+
+def backend_unavailable(backend: str) -> str:
+    """Why `backend` cannot be used here, or "" """
+    if backend not in BACKENDS:
+        return f"unknown transport '{backend}' (expected {', '.join(BACKENDS)})"
+    if backend == "httpx" and httpx is None:
+        return 'the httpx transport needs the httpx package (pip install "httpx[http2]")'
+    return ""
+
+
+class AiohttpTransport:
+    name = "aiohttp"
+
+    def __init__(self, pool_size: int, per_host: int, keepalive: float, dns_ttl: float, timeout: float,
+                 connect_timeout: float, read_timeout: float, headers: dict, trace_configs=None, **_unused):
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.dns_ttl = dns_ttl
+        connector = aiohttp.TCPConnector(limit=pool_size, limit_per_host=per_host, keepalive_timeout=keepalive,
+                                         use_dns_cache=dns_ttl > 0, ttl_dns_cache=dns_ttl or None)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout or None, sock_connect=connect_timeout or None,
+                                          sock_read=read_timeout or None),
+            trace_configs=trace_configs,
+        )
+
+    def request(self, method: str, url: str, headers: dict = None, trace=None, allow_redirects: bool = True):
+        return self.session.request(method, url, headers=headers, allow_redirects=allow_redirects,
+                                    trace_request_ctx=trace)
+
+    def describe(self) -> str:
+        dns = f"DNS cache {self.dns_ttl:g}s" if self.dns_ttl else "no DNS cache"
+        return f"aiohttp, HTTP/1.1, pool {self.pool_size}, keep-alive {self.keepalive:g}s, {dns}"
+
+    def describe_versions(self) -> str:
+        # Always HTTP/1.1; nothing worth reporting
+        return ""
+
+    async def close(self):
+        await self.session.close()
+
+
+class _HttpxContent:
+    def __init__(self, response):
+        self._response = response
+        self._chunks = None
+        self._finished = False
+
+    async def iter_chunked(self, size: int):
+        # Readers may stop early and pick the same body up again; they share one iterator
+        if self._chunks is None:
+            self._chunks = self._response.aiter_bytes(size)
+        async for chunk in self._chunks:
+            yield chunk
+        self._finished = True
+
+    def at_eof(self) -> bool:
+        if self._finished:
+            return True
+        length = self._response.headers.get("Content-Length", "")
+        return length.isdigit() and self._response.num_bytes_downloaded >= int(length)
+
+
+class _HttpxResponse:
+    __slots__ = ("status", "headers", "content", "version")
+
+    def __init__(self, response):
+        self.status = response.status_code
+        self.headers = response.headers
+        self.content = _HttpxContent(response)
+        self.version = response.http_version
+
+
+def _translate_httpx_error(exc):
+    """The builtin (or ssl/socket) error classify_error() expects for an httpx error"""
+    if isinstance(exc, httpx.TimeoutException):
+        return asyncio.TimeoutError(str(exc))
+    cause = exc.__cause__ or exc.__context__
+    if isinstance(cause, (ssl.SSLError, socket.gaierror)):
+        return cause
+    if isinstance(exc, httpx.ConnectError):
+        text = str(exc)
+        # httpcore does not always chain the resolver error
+        if "Name or service not known" in text or "nodename nor servname" in text or "getaddrinfo" in text:
+            return socket.gaierror(text)
+        return ConnectionRefusedError(text)
+    if isinstance(exc, (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError)):
+        return ConnectionResetError(str(exc))
+    return exc
+
+
+@asynccontextmanager
+async def _timeout(seconds):
+    """asyncio.timeout() for Python < 3.11, where a task does not count its cancellations"""
+    task = asyncio.current_task()
+    expired = []
+
+    def expire():
+        expired.append(True)
+        task.cancel()
+
+    deadline = asyncio.get_running_loop().call_later(seconds, expire) if seconds else None
+    try:
+        yield
+    except asyncio.CancelledError:
+        if expired:
+            raise asyncio.TimeoutError() from None
+        raise
+    finally:
+        if deadline is not None:
+            deadline.cancel()
+
+
+# Cancels the request at the deadline and raises TimeoutError, undoing its own cancellation
+_deadline = getattr(asyncio, "timeout", _timeout)
+
+
+class HttpxTransport:
+    name = "httpx"
+
+    def __init__(self, pool_size: int, keepalive: float, timeout: float, connect_timeout: float, read_timeout: float,
+                 headers: dict, http2: bool = True, **_unused):
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.timeout = timeout or None
+        self.http2 = http2 and http2_available()
+        self.http2_missing = http2 and not self.http2
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            headers=headers,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                                keepalive_expiry=keepalive),
+            timeout=httpx.Timeout(None, connect=connect_timeout or None, read=read_timeout or None,
+                                  write=read_timeout or None),
+        )
+        # Responses by HTTP version, to tell whether a target actually spoke HTTP/2
+        self.versions = {}
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, headers: dict = None, trace=None, allow_redirects: bool = True):
+        extensions = None
+        if trace is not None:
+            extensions = {"trace": trace.httpcore_trace}
+            trace.begin("pool")
+        try:
+            # httpx has no overall request timeout; cancel the request at the deadline, like aiohttp's `total`
+            async with _deadline(self.timeout):
+                async with self.client.stream(method, url, headers=headers, follow_redirects=allow_redirects,
+                                              extensions=extensions) as response:
+                    self.versions[response.http_version] = self.versions.get(response.http_version, 0) + 1
+                    yield _HttpxResponse(response)
+        except httpx.HTTPError as e:
+            raise _translate_httpx_error(e) from e
+
+    def describe(self) -> str:
+        if self.http2:
+            protocol = "HTTP/2 where offered"
+        elif self.http2_missing:
+            protocol = 'HTTP/1.1 (HTTP/2 needs the h2 package: pip install "httpx[http2]")'
+        else:
+            protocol = "HTTP/1.1"
+        return f"httpx, {protocol}, pool {self.pool_size}, keep-alive {self.keepalive:g}s"
+
+    def describe_versions(self) -> str:
+        return ", ".join(f"{version} {n}" for version, n in sorted(self.versions.items()))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def open_transport(backend: str = "aiohttp", **settings):
+    """A transport for `backend`; settings as in scanner.TRANSPORT_SETTINGS, plus `per_host`,
+    `headers` and aiohttp `trace_configs`. Call inside the event loop; close() when done."""
+    reason = backend_unavailable(backend)
+    if reason:
+        raise RuntimeError(reason)
+    if backend == "httpx":
+        return HttpxTransport(**settings)
+    return AiohttpTransport(**settings)
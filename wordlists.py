@@ -0,0 +1,170 @@
+# Streaming wordlist sources.
+#
+# Paths are read lazily from the built-in list and/or plain-text or gzip
+# wordlist files, one line at a time, so a SecLists-sized list never has to be
+# loaded before the first request goes out. Entries are deduplicated on a
+# 64-bit hash of their normalized key (a compact table instead of a set of
+# strings) and can be filtered by category tag.
+#
+# Wordlist file format: one path per line, blank lines and "#" comments are
+# ignored, and a "# category: <name>" line tags the entries that follow it.
+# Entries before the first directive are tagged with the file's base name
+# (e.g. "raft-large-directories" for raft-large-directories.txt.gz).
+import gzip
+import os
+from array import array
+
+from paths_to_scan import paths_by_category
+
+BUILTIN = "builtin"
+
+# Initial slots in the dedup table; it doubles as the wordlist grows
+DEDUP_INITIAL_CAPACITY = 65536
+
+
+def normalize_path_key(path: str) -> str:
+    # /backup and /backup/ are the same probe
+    return path.strip("/")
+
+
+class SeenKeys:
+    """Set of 64-bit hashes of normalized keys, stored in one flat array (open addressing).
+    Costs 11-21 bytes per unique path instead of a Python set of strings (~100 bytes each);
+    two different paths are only confused on a full 64-bit hash collision."""
+
+    def __init__(self, capacity: int = DEDUP_INITIAL_CAPACITY):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.slots = array("Q", bytes(8 * size))
+        self.mask = size - 1
+        self.count = 0
+
+    def add(self, key: str) -> bool:
+        """Record `key`; returns False if it was seen before"""
+        # hash() is stable within a process, which is all one wordlist pass needs; 0 marks an empty slot
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF or 1
+        if not self._insert(h):
+            return False
+        self.count += 1
+        if self.count * 4 > len(self.slots) * 3:
+            self._grow()
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF or 1
+        slots, mask = self.slots, self.mask
+        i = h & mask
+        while slots[i]:
+            if slots[i] == h:
+                return True
+            i = (i + 1) & mask
+        return False
+
+    def _insert(self, h: int) -> bool:
+        slots, mask = self.slots, self.mask
+        i = h & mask
+        while True:
+            current = slots[i]
+            if current == 0:
+                slots[i] = h
+                return True
+            if current == h:
+                return False
+            i = (i + 1) & mask
+
+    def _grow(self):
+        old = self.slots
+        self.slots = array("Q", bytes(16 * len(old)))
+        self.mask = len(self.slots) - 1
+        for h in old:
+            if h:
+                self._insert(h)
+
+
+def _open_wordlist(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def read_wordlist_file(path: str):
+    """Yield (path, category) for each entry of a plain-text or gzip wordlist file"""
+    name = os.path.basename(path)
+    for suffix in (".gz", ".txt", ".lst"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    category = name
+    with _open_wordlist(path) as f:
+        for line in f:
+            entry = line.strip()
+            if not entry:
+                continue
+            if entry.startswith("#"):
+                key, sep, value = entry[1:].partition(":")
+                if sep and key.strip().lower() == "category" and value.strip():
+                    category = value.strip()
+                continue
+            yield entry, category
+
+
+def read_builtin():
+    for category, paths in paths_by_category.items():
+        for path in paths:
+            yield path, category
+
+
+class Wordlist:
+    """Re-iterable, deduplicated and category-filtered stream of wordlist paths"""
+
+    def __init__(self, sources=(), include=(), exclude=()):
+        # Sources are wordlist file paths or BUILTIN; the built-in list is the default
+        self.sources = list(sources) or [BUILTIN]
+        self.include = frozenset(include)
+        self.exclude = frozenset(exclude)
+        # Unique paths yielded by the most recent complete pass
+        self.count = None
+
+    def describe(self) -> str:
+        names = ["built-in list" if s == BUILTIN else s for s in self.sources]
+        text = ", ".join(names)
+        if self.include:
+            text += f" (only: {', '.join(sorted(self.include))})"
+        if self.exclude:
+            text += f" (excluding: {', '.join(sorted(self.exclude))})"
+        return text
+
+    def entries(self):
+        """Raw (path, category) pairs from all sources, in order"""
+        for source in self.sources:
+            if source == BUILTIN:
+                yield from read_builtin()
+            else:
+                yield from read_wordlist_file(source)
+
+    def selected(self):
+        """Entries that pass the category filters, in order, duplicates included"""
+        for path, category in self.entries():
+            if self.include and category not in self.include:
+                continue
+            if category in self.exclude:
+                continue
+            yield path
+
+    def names(self):
+        """Single-segment entries (no inner slash): the children probed beneath a discovered directory"""
+        for path in self.selected():
+            name = path.strip("/")
+            if name and "/" not in name:
+                yield path.lstrip("/")
+
+    def __iter__(self):
+        seen = SeenKeys()
+        count = 0
+        for path in self.selected():
+            key = normalize_path_key(path)
+            if not key or not seen.add(key):
+                continue
+            count += 1
+            yield path
+        self.count = count